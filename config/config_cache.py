@@ -0,0 +1,84 @@
+"""
+配置快照缓存模块
+将解析后的YAML以msgpack快照保存，按文件内容哈希判断是否失效
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from typing import Dict, Any, Optional
+
+try:
+    import msgpack
+except ImportError:  # 未安装msgpack时直接解析YAML
+    msgpack = None
+
+# 快照文件头：blake2b(32字节)的十六进制摘要
+_HASH_LEN = 64
+
+def _content_hash(data: bytes) -> bytes:
+    """计算配置文件内容哈希"""
+    return hashlib.blake2b(data, digest_size=32).hexdigest().encode('ascii')
+
+def _parse_yaml(data: bytes) -> Dict[str, Any]:
+    """解析YAML内容，优先使用libyaml的C解析器"""
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(data, Loader=loader)
+
+def _read_snapshot(cache_path: str, digest: bytes) -> Optional[Dict[str, Any]]:
+    """读取与内容哈希匹配的快照，不存在或已失效时返回None"""
+    try:
+        with open(cache_path, 'rb') as f:
+            blob = f.read()
+    except OSError:
+        return None
+    if blob[:_HASH_LEN] != digest:
+        return None
+    try:
+        return msgpack.unpackb(blob[_HASH_LEN:], raw=False)
+    except Exception:
+        return None
+
+def _write_snapshot(cache_path: str, digest: bytes, config: Dict[str, Any]) -> None:
+    """原子写入快照文件，目录不可写等情况下静默跳过"""
+    try:
+        payload = msgpack.packb(config, use_bin_type=True)
+    except Exception:
+        # 含msgpack无法表示的类型（如日期）时不生成快照
+        return
+
+    cache_dir = os.path.dirname(cache_path) or '.'
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix='.snapshot-')
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(digest)
+            f.write(payload)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+def load_yaml_or_cache(path: str) -> Dict[str, Any]:
+    """加载YAML配置，内容未变化时直接读取 `<path>.cache` 快照"""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if msgpack is None:
+        return _parse_yaml(data)
+
+    cache_path = path + '.cache'
+    digest = _content_hash(data)
+    config = _read_snapshot(cache_path, digest)
+    if config is not None:
+        return config
+
+    config = _parse_yaml(data)
+    _write_snapshot(cache_path, digest, config)
+    return config
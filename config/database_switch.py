@@ -2,27 +2,59 @@
 数据库切换配置模块
 支持 SQLite -> MySQL 无缝切换
 """
+from __future__ import annotations
+
+import asyncio
+import logging
 import os
-from typing import Dict, Any
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-import yaml
+from functools import partial
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from config.config_cache import load_yaml_or_cache
+
+# yaml / sqlalchemy 均在函数内按需导入，避免CLI等轻量路径的启动开销
+
+logger = logging.getLogger(__name__)
+
+# 已解析YAML缓存: path -> (mtime, 配置)
+_yaml_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+def _read_yaml_cached(path: str) -> Dict[str, Any]:
+    """读取YAML文件，按文件mtime缓存解析结果"""
+    mtime = os.stat(path).st_mtime
+    cached = _yaml_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    data = load_yaml_or_cache(path)
+    _yaml_cache[path] = (mtime, data)
+    return data
 
 def load_config() -> Dict[str, Any]:
     """加载配置文件"""
     config_path = os.path.join(os.path.dirname(__file__), "settings.yaml")
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    return _read_yaml_cached(config_path)
+
+# 数据库URL缓存: id(config) -> (config, url)
+_url_cache: Dict[int, Tuple[Dict[str, Any], str]] = {}
 
 def get_database_url(config: Dict[str, Any]) -> str:
-    """根据配置生成数据库URL"""
+    """根据配置生成数据库URL（按配置对象缓存）"""
+    cached = _url_cache.get(id(config))
+    if cached is not None and cached[0] is config:
+        return cached[1]
+    
+    url = _build_database_url(config)
+    _url_cache[id(config)] = (config, url)
+    return url
+
+def _build_database_url(config: Dict[str, Any]) -> str:
+    """根据配置拼接数据库URL"""
     db_config = config['database']
     db_type = db_config['type']
     
     if db_type == 'sqlite':
         db_path = db_config['sqlite']['path']
-        # 确保目录存在
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
         return f"sqlite:///{db_path}"
     
     elif db_type == 'mysql':
@@ -47,36 +79,131 @@ def get_database_url(config: Dict[str, Any]) -> str:
     else:
         raise ValueError(f"Unsupported database type: {db_type}")
 
+def _ensure_sqlite_dir(db_config: Dict[str, Any]) -> None:
+    """创建SQLite数据库文件所在目录"""
+    db_dir = os.path.dirname(db_config['sqlite']['path'])
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+
+# SQLite连接级参数：WAL允许写入时并发读，mmap减少read()系统调用
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+def _set_sqlite_pragmas(dbapi_conn, _connection_record) -> None:
+    """新建SQLite连接时设置PRAGMA"""
+    cursor = dbapi_conn.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+def _pool_kwargs(server_config: Dict[str, Any]) -> Dict[str, Any]:
+    """MySQL/PostgreSQL 连接池参数（可在对应数据库配置段中覆盖）"""
+    return {
+        'pool_size': server_config.get('pool_size', 10),
+        'max_overflow': server_config.get('max_overflow', 20),
+        'pool_timeout': server_config.get('pool_timeout', 30),
+        'pool_recycle': server_config.get('pool_recycle', 3600),
+        'pool_pre_ping': True,
+        # 后进先出：优先复用最近归还的连接，空闲连接自然过期回收
+        'pool_use_lifo': server_config.get('pool_use_lifo', True),
+        # 扩大编译语句缓存，避免ORM查询重复编译
+        'query_cache_size': 1200
+    }
+
 def create_database_engine(config: Dict[str, Any]):
     """创建数据库引擎"""
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    
     database_url = get_database_url(config)
     db_config = config['database']
     
     engine_kwargs = {}
     
     if db_config['type'] == 'sqlite':
+        # 确保目录存在（仅在创建引擎时检查一次）
+        _ensure_sqlite_dir(db_config)
         engine_kwargs.update({
             'echo': db_config['sqlite'].get('echo', False),
             'connect_args': {'check_same_thread': False}
         })
-    elif db_config['type'] == 'mysql':
-        mysql_config = db_config['mysql']
-        engine_kwargs.update({
-            'pool_size': mysql_config.get('pool_size', 10),
-            'max_overflow': mysql_config.get('max_overflow', 20),
-            'pool_pre_ping': True,
-            'pool_recycle': 3600
-        })
+    elif db_config['type'] in ('mysql', 'postgresql'):
+        engine_kwargs.update(_pool_kwargs(db_config.get(db_config['type'], {})))
     
     engine = create_engine(database_url, **engine_kwargs)
+    if db_config['type'] == 'sqlite':
+        event.listen(engine, "connect", _set_sqlite_pragmas)
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     
     return engine, SessionLocal
 
+# 同步驱动 -> 异步驱动
+_ASYNC_DRIVERS = {
+    'sqlite': ('sqlite://', 'sqlite+aiosqlite://'),
+    'mysql': ('mysql+pymysql://', 'mysql+asyncmy://'),
+    'postgresql': ('postgresql://', 'postgresql+asyncpg://'),
+}
+
+def _async_database_url(config: Dict[str, Any]) -> str:
+    """同步连接URL替换为对应的异步驱动"""
+    sync_prefix, async_prefix = _ASYNC_DRIVERS[config['database']['type']]
+    return async_prefix + get_database_url(config)[len(sync_prefix):]
+
+def create_async_database_engine(config: Dict[str, Any]):
+    """创建异步数据库引擎（供FastAPI异步处理函数使用）"""
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    
+    db_config = config['database']
+    database_url = _async_database_url(config)
+    
+    engine_kwargs = {}
+    
+    if db_config['type'] == 'sqlite':
+        _ensure_sqlite_dir(db_config)
+        engine_kwargs['echo'] = db_config['sqlite'].get('echo', False)
+    elif db_config['type'] in ('mysql', 'postgresql'):
+        engine_kwargs.update(_pool_kwargs(db_config.get(db_config['type'], {})))
+    
+    engine = create_async_engine(database_url, **engine_kwargs)
+    if db_config['type'] == 'sqlite':
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    AsyncSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    
+    return engine, AsyncSessionLocal
+
+# 健康检查连接池：单连接且不溢出，等待超时即视为不健康，不占用业务连接池
+HEALTH_POOL_TIMEOUT = 2.0  # 秒
+
+def create_health_database_engine(config: Dict[str, Any]):
+    """创建健康检查专用异步引擎"""
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    
+    if config['database']['type'] == 'sqlite':
+        _ensure_sqlite_dir(config['database'])
+    engine = create_async_engine(
+        _async_database_url(config),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=HEALTH_POOL_TIMEOUT,
+        pool_recycle=3600
+    )
+    return engine, async_sessionmaker(engine)
+
 # 全局配置实例
 _config = None
 _engine = None
 _session_local = None
+_scoped_session = None
+_async_engine = None
+_async_session_local = None
+_health_engine = None
+_health_session_local = None
 
 def get_config():
     """获取全局配置"""
@@ -85,23 +212,210 @@ def get_config():
         _config = load_config()
     return _config
 
-def get_database():
-    """获取数据库会话"""
+def get_engine():
+    """获取处理请求所用的数据库引擎（首次使用时创建）"""
     global _engine, _session_local
-    if _engine is None or _session_local is None:
-        config = get_config()
-        _engine, _session_local = create_database_engine(config)
-    
-    db = _session_local()
+    if _engine is None:
+        _engine, _session_local = create_database_engine(get_config())
+    return _engine
+
+def _get_scoped_session():
+    """获取按asyncio任务隔离的会话注册表"""
+    global _scoped_session
+    if _scoped_session is None:
+        from sqlalchemy.orm import scoped_session
+        get_engine()
+        # 同一请求（任务）内的多个依赖共享一个会话
+        _scoped_session = scoped_session(
+            _session_local, scopefunc=lambda: id(asyncio.current_task())
+        )
+    return _scoped_session
+
+async def get_database():
+    """获取数据库会话"""
+    registry = _get_scoped_session()
+    db = registry()
     try:
         yield db
     finally:
-        db.close()
+        registry.remove()
+
+def _get_async_session_local():
+    """获取异步会话工厂（首次使用时创建异步引擎）"""
+    global _async_engine, _async_session_local
+    if _async_session_local is None:
+        _async_engine, _async_session_local = create_async_database_engine(get_config())
+    return _async_session_local
+
+async def get_async_database():
+    """获取异步数据库会话"""
+    async with _get_async_session_local()() as session:
+        yield session
+
+async def get_health_database():
+    """获取健康检查专用的异步数据库会话（首次使用时创建单连接引擎）"""
+    global _health_engine, _health_session_local
+    if _health_session_local is None:
+        _health_engine, _health_session_local = create_health_database_engine(get_config())
+    async with _health_session_local() as session:
+        yield session
 
 def init_database():
-    """初始化数据库表"""
+    """初始化数据库表，返回处理请求所用的共享引擎（不另建引擎）"""
     from packages.schemas.models import Base  # 导入所有模型
-    config = get_config()
-    engine, _ = create_database_engine(config)
+    engine = get_engine()
     Base.metadata.create_all(bind=engine)
-    return engine
\ No newline at end of file
+    return engine
+
+# 审计日志异步批量写入
+AUDIT_QUEUE_MAXSIZE = 10000
+AUDIT_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 0.1  # 秒
+
+_audit_queue: Optional[asyncio.Queue] = None
+_audit_writer: Optional[asyncio.Task] = None
+
+def _get_audit_queue() -> asyncio.Queue:
+    """获取审计队列（首次使用时创建，绑定当前事件循环）"""
+    global _audit_queue
+    if _audit_queue is None:
+        _audit_queue = asyncio.Queue(maxsize=AUDIT_QUEUE_MAXSIZE)
+    return _audit_queue
+
+def enqueue_audit(record: Dict[str, Any]) -> bool:
+    """将审计记录放入队列，不阻塞请求；队列已满时丢弃并返回False
+
+    须在事件循环中调用；首次调用时才启动后台批量写入任务
+    """
+    global _audit_writer
+    if _audit_writer is None:
+        _audit_writer = asyncio.get_running_loop().create_task(start_audit_writer(get_engine()))
+    try:
+        _get_audit_queue().put_nowait(record)
+        return True
+    except asyncio.QueueFull:
+        return False
+
+def _flush_audit_batch(engine, batch: List[Dict[str, Any]]) -> None:
+    """单条多行INSERT写入一批审计记录"""
+    from packages.schemas.models import AuditLog
+    with engine.begin() as conn:
+        conn.execute(AuditLog.__table__.insert(), batch)
+
+async def _run_batch_writer(
+    queue: asyncio.Queue,
+    flush: Callable[[List[Dict[str, Any]]], None],
+    batch_size: int,
+    flush_interval: float,
+    after_flush: Optional[Callable[[], None]] = None
+) -> None:
+    """从队列攒批：每flush_interval秒或累计batch_size条时调用flush写库，
+    after_flush 在事件循环线程中于每批写完后调用"""
+    loop = asyncio.get_running_loop()
+    batch: List[Dict[str, Any]] = []
+    
+    try:
+        while True:
+            batch.append(await queue.get())
+            deadline = loop.time() + flush_interval
+            while len(batch) < batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # 写库放到线程中执行，shield保证取消时当前批次仍能写完
+            pending, batch = batch, []
+            await asyncio.shield(asyncio.to_thread(flush, pending))
+            if after_flush is not None:
+                after_flush()
+    except asyncio.CancelledError:
+        # 关闭时写出尚未落库的记录
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        if batch:
+            flush(batch)
+            if after_flush is not None:
+                after_flush()
+        raise
+
+async def start_audit_writer(engine) -> None:
+    """后台任务：每AUDIT_FLUSH_INTERVAL秒或累计AUDIT_BATCH_SIZE条时批量落库"""
+    await _run_batch_writer(
+        _get_audit_queue(),
+        partial(_flush_audit_batch, engine),
+        AUDIT_BATCH_SIZE,
+        AUDIT_FLUSH_INTERVAL
+    )
+
+async def stop_audit_writer() -> None:
+    """停止审计写入任务并写出排队中的记录（任务未启动时不做任何事）"""
+    global _audit_writer
+    writer, _audit_writer = _audit_writer, None
+    if writer is None:
+        return
+    writer.cancel()
+    try:
+        await writer
+    except asyncio.CancelledError:
+        pass
+    # 任务尚未开始运行即被取消时不会执行退出时的写出，剩余记录在此写出
+    queue = _get_audit_queue()
+    batch = [queue.get_nowait() for _ in range(queue.qsize())]
+    if batch:
+        _flush_audit_batch(get_engine(), batch)
+
+# 效果记录延迟写入（business.outcomes.write_behind 开启时使用）
+OUTCOME_QUEUE_MAXSIZE = 10000
+OUTCOME_BATCH_SIZE = 100
+OUTCOME_FLUSH_INTERVAL = 0.05  # 秒
+
+_outcome_queue: Optional[asyncio.Queue] = None
+
+def outcome_write_behind_enabled() -> bool:
+    """是否启用效果记录延迟写入"""
+    business = get_config().get('business') or {}
+    return bool((business.get('outcomes') or {}).get('write_behind', False))
+
+def _get_outcome_queue() -> asyncio.Queue:
+    """获取效果记录写入队列（首次使用时创建，绑定当前事件循环）"""
+    global _outcome_queue
+    if _outcome_queue is None:
+        _outcome_queue = asyncio.Queue(maxsize=OUTCOME_QUEUE_MAXSIZE)
+    return _outcome_queue
+
+def enqueue_outcome(record: Dict[str, Any]) -> bool:
+    """将效果记录放入写入队列；队列已满时返回False，由调用方同步写入"""
+    try:
+        _get_outcome_queue().put_nowait(record)
+        return True
+    except asyncio.QueueFull:
+        return False
+
+def _flush_outcome_batch(engine, batch: List[Dict[str, Any]]) -> None:
+    """单条多行INSERT写入一批效果记录；整批失败时逐条重试，只丢弃出错的记录"""
+    from packages.schemas.models import Outcome
+    table = Outcome.__table__
+    try:
+        with engine.begin() as conn:
+            conn.execute(table.insert(), batch)
+    except Exception:
+        for record in batch:
+            try:
+                with engine.begin() as conn:
+                    conn.execute(table.insert(), record)
+            except Exception:
+                logger.exception("Failed to write outcome %s", record.get('outcome_id'))
+
+async def start_outcome_writer(engine, on_flush: Optional[Callable[[], None]] = None) -> None:
+    """后台任务：批量写入排队的效果记录，每批写完后调用on_flush"""
+    await _run_batch_writer(
+        _get_outcome_queue(),
+        partial(_flush_outcome_batch, engine),
+        OUTCOME_BATCH_SIZE,
+        OUTCOME_FLUSH_INTERVAL,
+        on_flush
+    )
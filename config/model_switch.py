@@ -2,13 +2,70 @@
 AI模型切换配置模块
 支持 API调用 -> 本地模型 无缝切换
 """
+from __future__ import annotations
+
 import os
-import json
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, Iterable, List, Optional, Tuple
 from abc import ABC, abstractmethod
-import httpx
-import yaml
+
+import orjson
+
+if TYPE_CHECKING:
+    import httpx
+
+try:
+    import ahocorasick
+except ImportError:  # 未安装pyahocorasick时使用纯Python字典树
+    ahocorasick = None
+
+from config.database_switch import _read_yaml_cached
+
+# 关键词缓存: path -> (mtime, 关键词表, 多模式匹配自动机)
+_keywords_cache: Dict[str, Tuple[float, Dict[str, List[str]], Any]] = {}
+
+class _KeywordTrie:
+    """纯Python关键词字典树，接口与ahocorasick.Automaton.iter保持一致"""
+    
+    _END = "$"
+    
+    def __init__(self):
+        self._root: Dict[str, Any] = {}
+    
+    def add_word(self, word: str, value: Any) -> None:
+        node = self._root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[self._END] = value
+    
+    def iter(self, text: str):
+        """逐位置沿字典树匹配，产出 (结束下标, value)"""
+        root = self._root
+        end_key = self._END
+        for i in range(len(text)):
+            node = root
+            for j in range(i, len(text)):
+                node = node.get(text[j])
+                if node is None:
+                    break
+                if end_key in node:
+                    yield j, node[end_key]
+
+def build_keyword_automaton(words: Iterable[Tuple[str, Any]]):
+    """构建多模式匹配自动机，iter(text) 产出 (结束下标, values)
+
+    同一关键词可对应多个值（如出现在多个类别中），values 按加入顺序保存全部值
+    """
+    grouped: Dict[str, List[Any]] = {}
+    for word, value in words:
+        grouped.setdefault(word, []).append(value)
+    
+    automaton = ahocorasick.Automaton() if ahocorasick else _KeywordTrie()
+    for word, values in grouped.items():
+        automaton.add_word(word, tuple(values))
+    if ahocorasick:
+        automaton.make_automaton()
+    return automaton
 
 class BaseModelProvider(ABC):
     """模型提供者基类"""
@@ -29,25 +86,45 @@ class APIModelProvider(BaseModelProvider):
     def __init__(self, config: Dict[str, Any]):
         self.nlp_config = config['ai_models']['nlp']['api']
         self.asr_config = config['ai_models']['asr']['api']
-        self.client = httpx.AsyncClient()
+        self._fallback_enabled: bool = config['ai_models'].get('fallback_enabled', False)
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    @classmethod
+    def refresh(cls) -> None:
+        """重新读取配置，更新全局提供者缓存的fallback开关"""
+        provider = get_model_provider()
+        if isinstance(provider, cls):
+            config = load_model_config()
+            provider._fallback_enabled = config['ai_models'].get('fallback_enabled', False)
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """延迟创建的HTTP客户端（HTTP/2 + 连接池复用）"""
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                timeout=self.nlp_config['timeout']
+            )
+        return self._client
     
     async def process_text(self, text: str, task: str = "ner") -> Dict[str, Any]:
         """调用NLP API处理文本"""
         try:
             response = await self.client.post(
                 f"{self.nlp_config['endpoint']}/process",
-                json={
+                content=orjson.dumps({
                     "text": text,
                     "task": task
-                },
+                }),
                 headers={
                     "Authorization": f"Bearer {self.nlp_config['api_key']}",
                     "Content-Type": "application/json"
-                },
-                timeout=self.nlp_config['timeout']
+                }
             )
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             # 如果启用了fallback，返回简化结果
             if self._is_fallback_enabled():
@@ -67,33 +144,31 @@ class APIModelProvider(BaseModelProvider):
                 timeout=self.asr_config['timeout']
             )
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             if self._is_fallback_enabled():
                 return self._fallback_asr_result()
             raise e
     
     def _is_fallback_enabled(self) -> bool:
-        """检查是否启用fallback"""
-        config = load_model_config()
-        return config['ai_models'].get('fallback_enabled', False)
+        """检查是否启用fallback（构造时读取，refresh()可刷新）"""
+        return self._fallback_enabled
     
     def _fallback_nlp_result(self, text: str) -> Dict[str, Any]:
         """NLP fallback结果"""
-        # 简单的关键词匹配作为fallback
-        keywords = self._load_keywords()
+        # 简单的关键词匹配作为fallback：单次扫描文本匹配全部关键词
+        automaton = self._load_keyword_automaton()
         entities = []
         
-        for category, terms in keywords.items():
-            for term in terms:
-                if term in text:
-                    entities.append({
-                        "text": term,
-                        "label": category,
-                        "confidence": 0.5,
-                        "start": text.find(term),
-                        "end": text.find(term) + len(term)
-                    })
+        for end, matches in automaton.iter(text):
+            for label, term in matches:
+                entities.append({
+                    "text": term,
+                    "label": label,
+                    "confidence": 0.5,
+                    "start": end - len(term) + 1,
+                    "end": end + 1
+                })
         
         return {
             "entities": entities,
@@ -111,9 +186,32 @@ class APIModelProvider(BaseModelProvider):
     
     def _load_keywords(self) -> Dict[str, List[str]]:
         """加载关键词列表"""
+        return self._load_keyword_index()[1]
+    
+    def _load_keyword_automaton(self):
+        """获取关键词匹配自动机（Aho-Corasick或字典树）"""
+        return self._load_keyword_index()[2]
+    
+    def _load_keyword_index(self) -> Tuple[float, Dict[str, List[str]], Any]:
+        """加载关键词并构建自动机，按文件mtime缓存"""
         keywords_path = os.path.join(os.path.dirname(__file__), "asr_keywords.json")
-        with open(keywords_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        mtime = os.stat(keywords_path).st_mtime
+        cached = _keywords_cache.get(keywords_path)
+        if cached is not None and cached[0] == mtime:
+            return cached
+        
+        with open(keywords_path, 'rb') as f:
+            keywords = orjson.loads(f.read())
+        
+        automaton = build_keyword_automaton(
+            (term, (category, term))
+            for category, terms in keywords.items()
+            for term in terms
+        )
+        
+        entry = (mtime, keywords, automaton)
+        _keywords_cache[keywords_path] = entry
+        return entry
 
 class LocalModelProvider(BaseModelProvider):
     """本地模型提供者（预留接口）"""
@@ -167,8 +265,7 @@ class LocalModelProvider(BaseModelProvider):
 def load_model_config() -> Dict[str, Any]:
     """加载模型配置"""
     config_path = os.path.join(os.path.dirname(__file__), "settings.yaml")
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    return _read_yaml_cached(config_path)
 
 def create_model_provider(config: Dict[str, Any] = None) -> BaseModelProvider:
     """创建模型提供者"""
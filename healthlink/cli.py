@@ -2,7 +2,9 @@
 HealthLink CLI 工具
 用于管理和操作HealthLink系统
 """
+import functools
 import os
+import re
 import sys
 import click
 from rich.console import Console
@@ -15,6 +17,9 @@ from config.database_switch import init_database, get_config
 
 console = Console()
 
+# 需要隐藏的配置项
+_SENSITIVE_RE = re.compile(r'password|secret|key', re.IGNORECASE)
+
 @click.group()
 def main():
     """HealthLink CLI - AI-driven Comorbidity Management Platform"""
@@ -48,7 +53,7 @@ def check_config():
             if isinstance(values, dict):
                 for key, value in values.items():
                     # 隐藏敏感信息
-                    if any(sensitive in key.lower() for sensitive in ['password', 'key', 'secret']):
+                    if _SENSITIVE_RE.search(key):
                         value = "***"
                     table.add_row(section, key, str(value))
             else:
@@ -124,12 +129,6 @@ def create_sample_data():
             }
         ]
         
-        for patient_data in sample_patients:
-            existing = db.query(Patient).filter(Patient.patient_id == patient_data["patient_id"]).first()
-            if not existing:
-                patient = Patient(**patient_data)
-                db.add(patient)
-        
         # 创建示例ICER策略
         sample_policy = {
             "policy_id": "ICER_2025",
@@ -154,16 +153,25 @@ def create_sample_data():
             "is_default": True
         }
         
-        existing_policy = db.query(ICERPolicy).filter(
-            ICERPolicy.policy_id == sample_policy["policy_id"],
-            ICERPolicy.version == sample_policy["version"]
-        ).first()
-        
-        if not existing_policy:
-            policy = ICERPolicy(**sample_policy)
-            db.add(policy)
+        # 单次查询已存在的记录，缺失的记录批量插入，并在同一事务中提交
+        with db.begin():
+            patient_ids = [p["patient_id"] for p in sample_patients]
+            existing_ids = {
+                row[0] for row in db.query(Patient.patient_id).filter(
+                    Patient.patient_id.in_(patient_ids)
+                )
+            }
+            new_patients = [p for p in sample_patients if p["patient_id"] not in existing_ids]
+            if new_patients:
+                db.bulk_insert_mappings(Patient, new_patients)
+            
+            existing_policy = db.query(ICERPolicy.id).filter(
+                ICERPolicy.policy_id == sample_policy["policy_id"],
+                ICERPolicy.version == sample_policy["version"]
+            ).first()
+            if not existing_policy:
+                db.bulk_insert_mappings(ICERPolicy, [sample_policy])
         
-        db.commit()
         db.close()
         
         console.print("✅ Sample data created successfully!", style="green")
@@ -174,6 +182,12 @@ def create_sample_data():
         console.print(f"❌ Failed to create sample data: {str(e)}", style="red")
         sys.exit(1)
 
+@functools.lru_cache(maxsize=None)
+def _ping_statement():
+    """数据库探活语句（首次使用时构建，--help 等命令不导入sqlalchemy）"""
+    from sqlalchemy import text
+    return text("SELECT 1")
+
 @main.command()
 def health_check():
     """健康检查"""
@@ -181,15 +195,13 @@ def health_check():
         console.print("🏥 Performing health check...", style="blue")
         
         # 检查数据库连接
-        from sqlalchemy.orm import sessionmaker
         from config.database_switch import create_database_engine
         
         config = get_config()
-        engine, SessionLocal = create_database_engine(config)
-        db = SessionLocal()
+        engine, _ = create_database_engine(config)
         
-        db.execute("SELECT 1")
-        db.close()
+        with engine.connect() as conn:
+            conn.execute(_ping_statement())
         
         console.print("✅ Database connection: OK", style="green")
         console.print("✅ Configuration: OK", style="green")
@@ -0,0 +1,274 @@
+"""
+HealthLink 高频响应结构
+msgspec.Struct 版本的列表响应，字段与 responses.py 中同名 pydantic 模型一致，
+用于绕过 pydantic 的逐条校验与序列化
+"""
+from datetime import datetime, date
+from typing import Optional, List, Dict, Any, Annotated, Union
+
+import msgspec
+from fastapi.responses import Response
+
+from .responses import current_time
+
+NonNegativeInt = Annotated[int, msgspec.Meta(ge=0)]
+
+class Struct(msgspec.Struct, gc=False):
+    """响应结构基类（字段均为JSON标量/容器，无循环引用，关闭GC跟踪）"""
+
+    @classmethod
+    def from_orm(cls, obj: Any):
+        """从ORM对象构建（数据库读出的行视为可信数据，直接构造不做类型校验）"""
+        return cls(**{name: getattr(obj, name) for name in cls.__struct_fields__})
+
+# 患者
+class PatientSummaryResponse(Struct, kw_only=True):
+    """患者列表项"""
+    id: int
+    patient_id: str
+    name: str
+    gender: Optional[str] = None
+    birth_date: Optional[date] = None
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    medical_record_number: Optional[str] = None
+    primary_doctor_id: Optional[str] = None
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_orm(cls, obj: Any) -> "PatientSummaryResponse":
+        """从ORM对象构建（出生日期列为DateTime，截取日期部分）"""
+        data = {name: getattr(obj, name) for name in cls.__struct_fields__}
+        if isinstance(data['birth_date'], datetime):
+            data['birth_date'] = data['birth_date'].date()
+        return cls(**data)
+
+# ICER策略
+class ICERPolicySummaryResponse(Struct, kw_only=True):
+    """ICER策略列表项"""
+    id: int
+    policy_id: str
+    version: str
+    threshold_per_daly: float
+    description: Optional[str] = None
+    source: Optional[str] = None
+    effective_date: Optional[datetime] = None
+    expiry_date: Optional[datetime] = None
+    is_active: bool
+    is_default: bool
+    created_at: datetime
+    updated_at: datetime
+
+# 筛查
+class ScreeningResponse(Struct, kw_only=True):
+    """筛查响应"""
+    id: int
+    screening_id: str
+    patient_id: int
+
+    # 输入数据
+    input_text: Optional[str] = None
+    input_audio_path: Optional[str] = None
+    input_metadata: Optional[Dict[str, Any]] = None
+
+    # NLP结果
+    nlp_entities: Optional[List[Dict[str, Any]]] = None
+    nlp_confidence: Optional[float] = None
+    nlp_model_version: Optional[str] = None
+
+    # ASR结果
+    asr_transcript: Optional[str] = None
+    asr_confidence: Optional[float] = None
+    asr_keywords: Optional[List[str]] = None
+
+    # 筛查结果
+    triage_level: Optional[str] = None
+    triage_score: Optional[float] = None
+    risk_factors: Optional[List[str]] = None
+
+    # 状态
+    status: str
+    processed_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+# ICER评估
+class ICEREvaluationResponse(Struct, kw_only=True):
+    """ICER评估响应"""
+    id: int
+    evaluation_id: str
+    policy_id: int
+
+    # 输入参数
+    intervention_cost: float
+    intervention_effectiveness: float
+    population_size: Optional[int] = None
+    time_horizon: Optional[int] = None
+
+    # 计算结果
+    icer_value: float
+    threshold_used: float
+    decision: str
+
+    # 元数据
+    calculation_metadata: Optional[Dict[str, Any]] = None
+    cohort_id: Optional[str] = None
+    created_at: datetime
+
+# 干预
+class InterventionSummaryResponse(Struct, kw_only=True):
+    """干预列表项"""
+    id: int
+    intervention_id: str
+    patient_id: int
+    screening_id: Optional[int] = None
+    icer_evaluation_id: Optional[int] = None
+
+    # 干预内容
+    intervention_type: str
+    priority_level: Optional[str] = None
+
+    # 资源匹配
+    estimated_cost: Optional[float] = None
+
+    # 审批状态
+    approval_status: str
+    approved_by: Optional[str] = None
+    approved_at: Optional[datetime] = None
+    approval_notes: Optional[str] = None
+
+    # 执行状态
+    execution_status: str
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    created_at: datetime
+    updated_at: datetime
+
+# 效果追踪
+class OutcomeResponse(Struct, kw_only=True):
+    """效果响应"""
+    id: int
+    outcome_id: str
+    patient_id: int
+    intervention_id: Optional[int] = None
+
+    # 追踪时间点
+    followup_day: NonNegativeInt
+    measurement_date: datetime
+
+    # 依从性指标
+    adherence_score: Optional[float] = None
+    adherence_details: Optional[Dict[str, Any]] = None
+
+    # 临床指标
+    clinical_metrics: Optional[Dict[str, Any]] = None
+    emergency_visits: Optional[NonNegativeInt] = None
+    hospitalizations: Optional[NonNegativeInt] = None
+
+    # 经济指标
+    direct_cost: Optional[float] = None
+    indirect_cost: Optional[float] = None
+    qaly_score: Optional[float] = None
+
+    # 主观指标
+    patient_satisfaction: Optional[float] = None
+    quality_of_life: Optional[float] = None
+
+    # 元数据
+    data_source: Optional[str] = None
+    measurement_metadata: Optional[Dict[str, Any]] = None
+
+    created_at: datetime
+    updated_at: datetime
+
+# 错误
+class ErrorDetail(Struct, kw_only=True):
+    """错误详情"""
+    code: str
+    message: str
+    field: Optional[str] = None
+
+class ErrorResponse(Struct, kw_only=True):
+    """错误响应（输出结构与 responses.ErrorResponse 一致）"""
+    request_id: Optional[str] = None
+    timestamp: datetime = msgspec.field(default_factory=current_time)
+    error: ErrorDetail
+    trace_id: Optional[str] = None
+
+# 分页
+class PaginationMeta(Struct, kw_only=True):
+    """分页元数据（游标分页时不设置 page，编码时省略该字段）"""
+    page: Union[int, msgspec.UnsetType] = msgspec.UNSET
+    size: int
+    total: Optional[int]
+    pages: Optional[int]
+    has_next: bool
+    has_prev: bool
+    next_cursor: Optional[str] = None
+
+class ListHeader(Struct, kw_only=True):
+    """列表响应公共头部（流式输出时先行写出）"""
+    request_id: Optional[str] = None
+    timestamp: datetime = msgspec.field(default_factory=current_time)
+    success: bool = True
+
+class ListResponse(Struct, kw_only=True):
+    """分页列表响应（输出结构与 responses.PaginatedResponse 子类一致）"""
+    request_id: Optional[str] = None
+    timestamp: datetime = msgspec.field(default_factory=current_time)
+    success: bool = True
+    meta: PaginationMeta
+    data: List[Any]
+
+_encoder = msgspec.json.Encoder()
+encode = _encoder.encode
+
+class MsgspecJSONResponse(Response):
+    """使用msgspec编码的JSON响应"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return _encoder.encode(content)
+
+def error_response(
+    status_code: int,
+    code: str,
+    message: str,
+    *,
+    request_id: Optional[str] = None,
+    field: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> MsgspecJSONResponse:
+    """构建错误响应（内部构造的可信数据，不经pydantic校验）"""
+    return MsgspecJSONResponse(
+        ErrorResponse(
+            request_id=request_id,
+            error=ErrorDetail(code=code, message=message, field=field)
+        ),
+        status_code=status_code,
+        headers=headers
+    )
+
+# 固定内容的错误响应：error 与 trace_id 部分预先编码，每次只编码时间戳
+_ERROR_HEAD = b'{"request_id":null,"timestamp":'
+
+def error_tail(code: str, message: str, field: Optional[str] = None) -> bytes:
+    """预编码错误响应中 timestamp 之后的部分"""
+    body = encode(ErrorResponse(error=ErrorDetail(code=code, message=message, field=field)))
+    return body[body.index(b',"error":'):]
+
+def prebuilt_error_response(
+    status_code: int,
+    tail: bytes,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """用预编码部分拼接错误响应（输出与 error_response 一致）"""
+    return Response(
+        content=_ERROR_HEAD + encode(current_time()) + tail,
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json"
+    )
@@ -2,123 +2,152 @@
 HealthLink 数据模型定义
 SQLAlchemy ORM 模型，支持 SQLite/MySQL 切换
 """
-from datetime import datetime
-from typing import Optional, Dict, Any
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime, Float, Boolean, 
-    JSON, ForeignKey, Index, UniqueConstraint
+    Integer, String, Text, DateTime, Float, Boolean, 
+    JSON, ForeignKey, Index, UniqueConstraint, DDL, event
 )
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.mysql import JSON as MYSQL_JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
-Base = declarative_base()
+class Base(DeclarativeBase):
+    """ORM模型基类"""
+
+# JSON字段：PostgreSQL使用JSONB（可建GIN索引），MySQL使用原生JSON
+JSON_TYPE = JSON().with_variant(JSONB(), "postgresql").with_variant(MYSQL_JSON(), "mysql")
+
+def utc_now() -> datetime:
+    """当前UTC时间（不带时区，与SQLite的 CURRENT_TIMESTAMP 一致）"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 class TimestampMixin:
     """时间戳混入类"""
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    # server_default 让Core批量写入/直接SQL也由数据库填充时间；
+    # ORM侧默认值在Python中生成（UTC，与数据库默认值一致），flush后属性即有值，无需再查询回填
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utc_now, server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utc_now, server_default=func.now(), onupdate=utc_now, nullable=False)
 
 class Patient(Base, TimestampMixin):
     """患者模型"""
     __tablename__ = "patients"
     
-    id = Column(Integer, primary_key=True, index=True)
-    patient_id = Column(String(50), unique=True, index=True, nullable=False)  # 业务ID
-    name = Column(String(100), nullable=False)
-    gender = Column(String(10))  # M/F/Other
-    birth_date = Column(DateTime)
-    phone = Column(String(20))
-    email = Column(String(100))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    patient_id: Mapped[str] = mapped_column(String(50), unique=True, index=True, nullable=False)  # 业务ID
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    gender: Mapped[Optional[str]] = mapped_column(String(10))  # M/F/Other
+    birth_date: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    phone: Mapped[Optional[str]] = mapped_column(String(20))
+    email: Mapped[Optional[str]] = mapped_column(String(100))
     
     # 医疗信息
-    medical_record_number = Column(String(50), unique=True)
-    primary_doctor_id = Column(String(50))
+    medical_record_number: Mapped[Optional[str]] = mapped_column(String(50), unique=True)
+    primary_doctor_id: Mapped[Optional[str]] = mapped_column(String(50))
     
     # 元数据
-    metadata_json = Column(JSON, default=dict)  # 扩展字段
-    is_active = Column(Boolean, default=True)
+    metadata_json: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON_TYPE, default=dict)  # 扩展字段
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
     
     # 关系
-    screenings = relationship("Screening", back_populates="patient")
-    interventions = relationship("Intervention", back_populates="patient")
-    outcomes = relationship("Outcome", back_populates="patient")
+    screenings: Mapped[List["Screening"]] = relationship(back_populates="patient")
+    interventions: Mapped[List["Intervention"]] = relationship(back_populates="patient")
+    outcomes: Mapped[List["Outcome"]] = relationship(back_populates="patient")
     
     __table_args__ = (
         Index('idx_patient_active', 'is_active'),
-        Index('idx_patient_doctor', 'primary_doctor_id'),
+        Index('idx_patient_doctor_active_created', 'primary_doctor_id', 'is_active', 'created_at'),
+        # 列表默认排序与游标分页的 (created_at, id) 倒序扫描
+        Index('idx_patient_created', 'created_at', 'id'),
+        # 列表按患者ID/姓名做 ILIKE '%x%' 子串搜索，PostgreSQL 用三元组GIN索引避免全表扫描
+        Index('idx_patient_patient_id_trgm', 'patient_id', postgresql_using='gin',
+              postgresql_ops={'patient_id': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        Index('idx_patient_name_trgm', 'name', postgresql_using='gin',
+              postgresql_ops={'name': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
     )
 
+# 三元组索引依赖 pg_trgm 扩展，建表前确保已启用
+event.listen(
+    Patient.__table__,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
+
 class Screening(Base, TimestampMixin):
     """筛查记录模型"""
     __tablename__ = "screenings"
     
-    id = Column(Integer, primary_key=True, index=True)
-    screening_id = Column(String(50), unique=True, index=True, nullable=False)
-    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    screening_id: Mapped[str] = mapped_column(String(50), unique=True, index=True, nullable=False)
+    patient_id: Mapped[int] = mapped_column(Integer, ForeignKey("patients.id"), nullable=False)
     
     # 输入数据
-    input_text = Column(Text)  # NLP输入文本
-    input_audio_path = Column(String(500))  # ASR音频文件路径
-    input_metadata = Column(JSON, default=dict)
+    input_text: Mapped[Optional[str]] = mapped_column(Text)  # NLP输入文本
+    input_audio_path: Mapped[Optional[str]] = mapped_column(String(500))  # ASR音频文件路径
+    input_metadata: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON_TYPE, default=dict)
     
     # NLP结果
-    nlp_entities = Column(JSON, default=list)  # 提取的实体
-    nlp_confidence = Column(Float)
-    nlp_model_version = Column(String(50))
+    nlp_entities: Mapped[Optional[List[Any]]] = mapped_column(JSON_TYPE, default=list)  # 提取的实体
+    nlp_confidence: Mapped[Optional[float]] = mapped_column(Float)
+    nlp_model_version: Mapped[Optional[str]] = mapped_column(String(50))
     
     # ASR结果
-    asr_transcript = Column(Text)  # 转写文本
-    asr_confidence = Column(Float)
-    asr_keywords = Column(JSON, default=list)  # 识别的关键词
+    asr_transcript: Mapped[Optional[str]] = mapped_column(Text)  # 转写文本
+    asr_confidence: Mapped[Optional[float]] = mapped_column(Float)
+    asr_keywords: Mapped[Optional[List[Any]]] = mapped_column(JSON_TYPE, default=list)  # 识别的关键词
     
     # 筛查结果
-    triage_level = Column(String(20))  # low/medium/high
-    triage_score = Column(Float)
-    risk_factors = Column(JSON, default=list)
+    triage_level: Mapped[Optional[str]] = mapped_column(String(20))  # low/medium/high
+    triage_score: Mapped[Optional[float]] = mapped_column(Float)
+    risk_factors: Mapped[Optional[List[Any]]] = mapped_column(JSON_TYPE, default=list)
     
     # 状态
-    status = Column(String(20), default="pending")  # pending/completed/failed
-    processed_at = Column(DateTime)
+    status: Mapped[Optional[str]] = mapped_column(String(20), default="pending")  # pending/completed/failed
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
     
     # 关系
-    patient = relationship("Patient", back_populates="screenings")
-    interventions = relationship("Intervention", back_populates="screening")
+    patient: Mapped["Patient"] = relationship(back_populates="screenings")
+    interventions: Mapped[List["Intervention"]] = relationship(back_populates="screening")
     
     __table_args__ = (
-        Index('idx_screening_patient', 'patient_id'),
+        Index('idx_screening_patient_status_created', 'patient_id', 'status', 'created_at'),
         Index('idx_screening_status', 'status'),
         Index('idx_screening_triage', 'triage_level'),
+        {'mysql_engine': 'InnoDB', 'mysql_row_format': 'DYNAMIC'},
     )
 
 class ICERPolicy(Base, TimestampMixin):
     """ICER策略模型"""
     __tablename__ = "icer_policies"
     
-    id = Column(Integer, primary_key=True, index=True)
-    policy_id = Column(String(50), unique=True, index=True, nullable=False)
-    version = Column(String(20), nullable=False)  # 如 "2025-08"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    policy_id: Mapped[str] = mapped_column(String(50), unique=True, index=True, nullable=False)
+    version: Mapped[str] = mapped_column(String(20), nullable=False)  # 如 "2025-08"
     
     # 策略内容
-    threshold_per_daly = Column(Float, nullable=False)  # 元/DALY阈值
-    policy_data = Column(JSON, nullable=False)  # 完整策略JSON
+    threshold_per_daly: Mapped[float] = mapped_column(Float, nullable=False)  # 元/DALY阈值
+    policy_data: Mapped[Dict[str, Any]] = mapped_column(JSON_TYPE, nullable=False)  # 完整策略JSON
     
     # 元数据
-    description = Column(Text)
-    source = Column(String(200))  # 策略来源
-    effective_date = Column(DateTime)
-    expiry_date = Column(DateTime)
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    source: Mapped[Optional[str]] = mapped_column(String(200))  # 策略来源
+    effective_date: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    expiry_date: Mapped[Optional[datetime]] = mapped_column(DateTime)
     
     # 状态
-    is_active = Column(Boolean, default=True)
-    is_default = Column(Boolean, default=False)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    is_default: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
     
     # 关系
-    evaluations = relationship("ICEREvaluation", back_populates="policy")
+    evaluations: Mapped[List["ICEREvaluation"]] = relationship(back_populates="policy")
     
     __table_args__ = (
         Index('idx_icer_policy_active', 'is_active'),
-        Index('idx_icer_policy_version', 'version'),
+        Index('idx_icer_policy_version_active_default', 'version', 'is_active', 'is_default'),
+        Index('idx_policy_data_gin', 'policy_data', postgresql_using='gin').ddl_if(dialect='postgresql'),
         UniqueConstraint('version', 'is_default', name='uq_default_policy_per_version'),
     )
 
@@ -126,28 +155,28 @@ class ICEREvaluation(Base, TimestampMixin):
     """ICER评估记录模型"""
     __tablename__ = "icer_evaluations"
     
-    id = Column(Integer, primary_key=True, index=True)
-    evaluation_id = Column(String(50), unique=True, index=True, nullable=False)
-    policy_id = Column(Integer, ForeignKey("icer_policies.id"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    evaluation_id: Mapped[str] = mapped_column(String(50), unique=True, index=True, nullable=False)
+    policy_id: Mapped[int] = mapped_column(Integer, ForeignKey("icer_policies.id"), nullable=False)
     
     # 输入参数
-    intervention_cost = Column(Float, nullable=False)
-    intervention_effectiveness = Column(Float, nullable=False)  # DALY saved
-    population_size = Column(Integer)
-    time_horizon = Column(Integer)  # 年
+    intervention_cost: Mapped[float] = mapped_column(Float, nullable=False)
+    intervention_effectiveness: Mapped[float] = mapped_column(Float, nullable=False)  # DALY saved
+    population_size: Mapped[Optional[int]] = mapped_column(Integer)
+    time_horizon: Mapped[Optional[int]] = mapped_column(Integer)  # 年
     
     # 计算结果
-    icer_value = Column(Float, nullable=False)  # 计算出的ICER值
-    threshold_used = Column(Float, nullable=False)  # 使用的阈值
-    decision = Column(String(20), nullable=False)  # cost_effective/not_cost_effective
+    icer_value: Mapped[float] = mapped_column(Float, nullable=False)  # 计算出的ICER值
+    threshold_used: Mapped[float] = mapped_column(Float, nullable=False)  # 使用的阈值
+    decision: Mapped[str] = mapped_column(String(20), nullable=False)  # cost_effective/not_cost_effective
     
     # 元数据
-    calculation_metadata = Column(JSON, default=dict)
-    cohort_id = Column(String(50))  # 人群标识
+    calculation_metadata: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON_TYPE, default=dict)
+    cohort_id: Mapped[Optional[str]] = mapped_column(String(50))  # 人群标识
     
     # 关系
-    policy = relationship("ICERPolicy", back_populates="evaluations")
-    interventions = relationship("Intervention", back_populates="icer_evaluation")
+    policy: Mapped["ICERPolicy"] = relationship(back_populates="evaluations")
+    interventions: Mapped[List["Intervention"]] = relationship(back_populates="icer_evaluation")
     
     __table_args__ = (
         Index('idx_icer_eval_policy', 'policy_id'),
@@ -159,122 +188,127 @@ class Intervention(Base, TimestampMixin):
     """干预记录模型"""
     __tablename__ = "interventions"
     
-    id = Column(Integer, primary_key=True, index=True)
-    intervention_id = Column(String(50), unique=True, index=True, nullable=False)
-    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
-    screening_id = Column(Integer, ForeignKey("screenings.id"))
-    icer_evaluation_id = Column(Integer, ForeignKey("icer_evaluations.id"))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    intervention_id: Mapped[str] = mapped_column(String(50), unique=True, index=True, nullable=False)
+    patient_id: Mapped[int] = mapped_column(Integer, ForeignKey("patients.id"), nullable=False)
+    screening_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("screenings.id"))
+    icer_evaluation_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("icer_evaluations.id"))
     
     # 干预内容
-    intervention_type = Column(String(50), nullable=False)  # medication/lifestyle/education
-    intervention_plan = Column(JSON, nullable=False)  # 具体干预计划
-    priority_level = Column(String(20))  # high/medium/low
+    intervention_type: Mapped[str] = mapped_column(String(50), nullable=False)  # medication/lifestyle/education
+    intervention_plan: Mapped[Dict[str, Any]] = mapped_column(JSON_TYPE, nullable=False)  # 具体干预计划
+    priority_level: Mapped[Optional[str]] = mapped_column(String(20))  # high/medium/low
     
     # 资源匹配
-    assigned_resources = Column(JSON, default=list)  # 分配的资源
-    estimated_cost = Column(Float)
-    expected_outcome = Column(String(200))
+    assigned_resources: Mapped[Optional[List[Any]]] = mapped_column(JSON_TYPE, default=list)  # 分配的资源
+    estimated_cost: Mapped[Optional[float]] = mapped_column(Float)
+    expected_outcome: Mapped[Optional[str]] = mapped_column(String(200))
     
     # 审批状态
-    approval_status = Column(String(20), default="pending")  # pending/approved/rejected/auto_approved
-    approved_by = Column(String(100))
-    approved_at = Column(DateTime)
-    approval_notes = Column(Text)
+    approval_status: Mapped[Optional[str]] = mapped_column(String(20), default="pending")  # pending/approved/rejected/auto_approved
+    approved_by: Mapped[Optional[str]] = mapped_column(String(100))
+    approved_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    approval_notes: Mapped[Optional[str]] = mapped_column(Text)
     
     # 执行状态
-    execution_status = Column(String(20), default="planned")  # planned/in_progress/completed/cancelled
-    started_at = Column(DateTime)
-    completed_at = Column(DateTime)
+    execution_status: Mapped[Optional[str]] = mapped_column(String(20), default="planned")  # planned/in_progress/completed/cancelled
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
     
     # 关系
-    patient = relationship("Patient", back_populates="interventions")
-    screening = relationship("Screening", back_populates="interventions")
-    icer_evaluation = relationship("ICEREvaluation", back_populates="interventions")
-    outcomes = relationship("Outcome", back_populates="intervention")
+    patient: Mapped["Patient"] = relationship(back_populates="interventions")
+    screening: Mapped[Optional["Screening"]] = relationship(back_populates="interventions")
+    icer_evaluation: Mapped[Optional["ICEREvaluation"]] = relationship(back_populates="interventions")
+    outcomes: Mapped[List["Outcome"]] = relationship(back_populates="intervention")
     
     __table_args__ = (
-        Index('idx_intervention_patient', 'patient_id'),
+        Index('idx_intervention_patient_exec', 'patient_id', 'execution_status'),
         Index('idx_intervention_status', 'approval_status', 'execution_status'),
         Index('idx_intervention_type', 'intervention_type'),
+        Index('idx_intervention_patient_created', 'patient_id', 'created_at'),
+        Index('idx_intervention_approval_created', 'approval_status', 'created_at'),
+        Index('idx_intervention_created', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB', 'mysql_row_format': 'DYNAMIC'},
     )
 
 class Outcome(Base, TimestampMixin):
     """效果追踪模型"""
     __tablename__ = "outcomes"
     
-    id = Column(Integer, primary_key=True, index=True)
-    outcome_id = Column(String(50), unique=True, index=True, nullable=False)
-    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
-    intervention_id = Column(Integer, ForeignKey("interventions.id"))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    outcome_id: Mapped[str] = mapped_column(String(50), unique=True, index=True, nullable=False)
+    patient_id: Mapped[int] = mapped_column(Integer, ForeignKey("patients.id"), nullable=False)
+    intervention_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("interventions.id"))
     
     # 追踪时间点
-    followup_day = Column(Integer, nullable=False)  # 干预后第几天
-    measurement_date = Column(DateTime, nullable=False)
+    followup_day: Mapped[int] = mapped_column(Integer, nullable=False)  # 干预后第几天
+    measurement_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     
     # 依从性指标
-    adherence_score = Column(Float)  # 0-1
-    adherence_details = Column(JSON, default=dict)
+    adherence_score: Mapped[Optional[float]] = mapped_column(Float)  # 0-1
+    adherence_details: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON_TYPE, default=dict)
     
     # 临床指标
-    clinical_metrics = Column(JSON, default=dict)  # 血压、血糖等
-    emergency_visits = Column(Integer, default=0)
-    hospitalizations = Column(Integer, default=0)
+    clinical_metrics: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON_TYPE, default=dict)  # 血压、血糖等
+    emergency_visits: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    hospitalizations: Mapped[Optional[int]] = mapped_column(Integer, default=0)
     
     # 经济指标
-    direct_cost = Column(Float)  # 直接医疗成本
-    indirect_cost = Column(Float)  # 间接成本
-    qaly_score = Column(Float)  # 质量调整生命年
+    direct_cost: Mapped[Optional[float]] = mapped_column(Float)  # 直接医疗成本
+    indirect_cost: Mapped[Optional[float]] = mapped_column(Float)  # 间接成本
+    qaly_score: Mapped[Optional[float]] = mapped_column(Float)  # 质量调整生命年
     
     # 主观指标
-    patient_satisfaction = Column(Float)  # 1-5分
-    quality_of_life = Column(Float)  # 生活质量评分
+    patient_satisfaction: Mapped[Optional[float]] = mapped_column(Float)  # 1-5分
+    quality_of_life: Mapped[Optional[float]] = mapped_column(Float)  # 生活质量评分
     
     # 元数据
-    data_source = Column(String(50))  # manual/ehr/survey/device
-    measurement_metadata = Column(JSON, default=dict)
+    data_source: Mapped[Optional[str]] = mapped_column(String(50))  # manual/ehr/survey/device
+    measurement_metadata: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON_TYPE, default=dict)
     
     # 关系
-    patient = relationship("Patient", back_populates="outcomes")
-    intervention = relationship("Intervention", back_populates="outcomes")
+    patient: Mapped["Patient"] = relationship(back_populates="outcomes")
+    intervention: Mapped[Optional["Intervention"]] = relationship(back_populates="outcomes")
     
     __table_args__ = (
-        Index('idx_outcome_patient', 'patient_id'),
+        Index('idx_outcome_patient_followup', 'patient_id', 'followup_day'),
         Index('idx_outcome_intervention', 'intervention_id'),
         Index('idx_outcome_followup', 'followup_day'),
         Index('idx_outcome_date', 'measurement_date'),
+        {'mysql_engine': 'InnoDB', 'mysql_row_format': 'DYNAMIC'},
     )
 
 class AuditLog(Base, TimestampMixin):
     """审计日志模型"""
     __tablename__ = "audit_logs"
     
-    id = Column(Integer, primary_key=True, index=True)
-    request_id = Column(String(50), index=True, nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    request_id: Mapped[str] = mapped_column(String(50), index=True, nullable=False)
     
     # 操作信息
-    action = Column(String(50), nullable=False)  # create/read/update/delete
-    resource_type = Column(String(50), nullable=False)  # patient/screening/intervention
-    resource_id = Column(String(50))
+    action: Mapped[str] = mapped_column(String(50), nullable=False)  # create/read/update/delete
+    resource_type: Mapped[str] = mapped_column(String(50), nullable=False)  # patient/screening/intervention
+    resource_id: Mapped[Optional[str]] = mapped_column(String(50))
     
     # 用户信息
-    user_id = Column(String(50))
-    user_role = Column(String(50))
-    organization_id = Column(String(50))
+    user_id: Mapped[Optional[str]] = mapped_column(String(50))
+    user_role: Mapped[Optional[str]] = mapped_column(String(50))
+    organization_id: Mapped[Optional[str]] = mapped_column(String(50))
     
     # 请求信息
-    ip_address = Column(String(45))  # IPv6支持
-    user_agent = Column(String(500))
-    endpoint = Column(String(200))
-    method = Column(String(10))
+    ip_address: Mapped[Optional[str]] = mapped_column(String(45))  # IPv6支持
+    user_agent: Mapped[Optional[str]] = mapped_column(String(500))
+    endpoint: Mapped[Optional[str]] = mapped_column(String(200))
+    method: Mapped[Optional[str]] = mapped_column(String(10))
     
     # 结果信息
-    status_code = Column(Integer)
-    response_time_ms = Column(Integer)
-    error_message = Column(Text)
+    status_code: Mapped[Optional[int]] = mapped_column(Integer)
+    response_time_ms: Mapped[Optional[int]] = mapped_column(Integer)
+    error_message: Mapped[Optional[str]] = mapped_column(Text)
     
     # 数据变更
-    old_values = Column(JSON)
-    new_values = Column(JSON)
+    old_values: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON_TYPE)
+    new_values: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON_TYPE)
     
     __table_args__ = (
         Index('idx_audit_request', 'request_id'),
@@ -3,70 +3,74 @@ HealthLink API 请求模型
 Pydantic 模型用于API请求验证
 """
 from datetime import datetime, date
-from typing import Optional, List, Dict, Any, Union
-from pydantic import BaseModel, Field, validator
-from enum import Enum
-
-# 枚举类型定义
-class GenderEnum(str, Enum):
-    MALE = "M"
-    FEMALE = "F"
-    OTHER = "Other"
-
-class TriageLevelEnum(str, Enum):
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-
-class ApprovalStatusEnum(str, Enum):
-    PENDING = "pending"
-    APPROVED = "approved"
-    REJECTED = "rejected"
-    AUTO_APPROVED = "auto_approved"
-
-class ExecutionStatusEnum(str, Enum):
-    PLANNED = "planned"
-    IN_PROGRESS = "in_progress"
-    COMPLETED = "completed"
-    CANCELLED = "cancelled"
-
-class InterventionTypeEnum(str, Enum):
-    MEDICATION = "medication"
-    LIFESTYLE = "lifestyle"
-    EDUCATION = "education"
-    MONITORING = "monitoring"
+from typing import Optional, List, Dict, Any, Union, Annotated, Literal
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, model_validator
+
+# 邮箱格式校验交给pydantic-core完成，不经过Python层validator
+EMAIL_PATTERN = r'^[^@\s]+@[^@\s]+\.[^@\s]+$'
+EmailText = Annotated[str, StringConstraints(max_length=100, pattern=EMAIL_PATTERN)]
+
+# 枚举类型定义（Literal由pydantic-core直接做字符串比较，校验结果为普通str）
+Gender = Literal["M", "F", "Other"]
+TriageLevel = Literal["low", "medium", "high"]
+ApprovalStatus = Literal["pending", "approved", "rejected", "auto_approved"]
+ExecutionStatus = Literal["planned", "in_progress", "completed", "cancelled"]
+InterventionType = Literal["medication", "lifestyle", "education", "monitoring"]
+
+# 兼容旧名称
+GenderEnum = Gender
+TriageLevelEnum = TriageLevel
+ApprovalStatusEnum = ApprovalStatus
+ExecutionStatusEnum = ExecutionStatus
+InterventionTypeEnum = InterventionType
 
 # 基础请求模型
 class BaseRequest(BaseModel):
     """基础请求模型"""
+    # 延迟构建校验器，首次使用时才生成
+    model_config = ConfigDict(defer_build=True)
+    
     request_id: Optional[str] = Field(None, description="请求ID，用于幂等性")
 
 # 患者相关请求
 class PatientCreateRequest(BaseRequest):
     """创建患者请求"""
+    # 每个请求路径都会用到，导入时即构建
+    model_config = ConfigDict(defer_build=False)
+    
     patient_id: str = Field(..., min_length=1, max_length=50, description="患者业务ID")
     name: str = Field(..., min_length=1, max_length=100, description="患者姓名")
-    gender: Optional[GenderEnum] = Field(None, description="性别")
+    gender: Optional[Gender] = Field(None, description="性别")
     birth_date: Optional[date] = Field(None, description="出生日期")
     phone: Optional[str] = Field(None, max_length=20, description="电话号码")
-    email: Optional[str] = Field(None, max_length=100, description="邮箱地址")
+    email: Optional[EmailText] = Field(None, description="邮箱地址")
     medical_record_number: Optional[str] = Field(None, max_length=50, description="病历号")
     primary_doctor_id: Optional[str] = Field(None, max_length=50, description="主治医生ID")
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="扩展元数据")
 
-    @validator('email')
-    def validate_email(cls, v):
-        if v and '@' not in v:
-            raise ValueError('Invalid email format')
-        return v
+# 批量创建患者单次最多条数
+PATIENT_BATCH_MAX_SIZE = 1000
+
+class PatientBatchCreateRequest(BaseRequest):
+    """批量创建患者请求"""
+    patients: List[PatientCreateRequest] = Field(
+        ..., min_length=1, max_length=PATIENT_BATCH_MAX_SIZE, description="患者列表"
+    )
+
+    @model_validator(mode='after')
+    def validate_unique_ids(self):
+        # 同一批次内患者ID不能重复
+        if len({p.patient_id for p in self.patients}) != len(self.patients):
+            raise ValueError('Duplicate patient_id in batch')
+        return self
 
 class PatientUpdateRequest(BaseModel):
     """更新患者请求"""
     name: Optional[str] = Field(None, min_length=1, max_length=100)
-    gender: Optional[GenderEnum] = None
+    gender: Optional[Gender] = None
     birth_date: Optional[date] = None
     phone: Optional[str] = Field(None, max_length=20)
-    email: Optional[str] = Field(None, max_length=100)
+    email: Optional[EmailText] = None
     primary_doctor_id: Optional[str] = Field(None, max_length=50)
     metadata: Optional[Dict[str, Any]] = None
     is_active: Optional[bool] = None
@@ -74,22 +78,24 @@ class PatientUpdateRequest(BaseModel):
 # 筛查相关请求
 class ScreeningCreateRequest(BaseRequest):
     """创建筛查请求"""
+    model_config = ConfigDict(defer_build=False)
+    
     patient_id: str = Field(..., description="患者ID")
     input_text: Optional[str] = Field(None, description="NLP输入文本")
     input_audio_base64: Optional[str] = Field(None, description="ASR音频数据(base64编码)")
     input_metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="输入元数据")
 
-    @validator('input_text', 'input_audio_base64')
-    def validate_input(cls, v, values):
+    @model_validator(mode='after')
+    def validate_input(self):
         # 至少需要提供文本或音频输入之一
-        if not v and not values.get('input_text') and not values.get('input_audio_base64'):
+        if not self.input_text and not self.input_audio_base64:
             raise ValueError('Must provide either input_text or input_audio_base64')
-        return v
+        return self
 
 class ScreeningTriageRequest(BaseModel):
     """筛查分诊请求"""
     force_retriage: Optional[bool] = Field(False, description="是否强制重新分诊")
-    triage_override: Optional[TriageLevelEnum] = Field(None, description="手动覆盖分诊级别")
+    triage_override: Optional[TriageLevel] = Field(None, description="手动覆盖分诊级别")
     notes: Optional[str] = Field(None, max_length=1000, description="分诊备注")
 
 # ICER相关请求
@@ -115,12 +121,32 @@ class ICEREvaluationRequest(BaseRequest):
     cohort_id: Optional[str] = Field(None, max_length=50, description="人群标识")
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="计算元数据")
 
+# 批量评估单次最多候选数
+ICER_BATCH_MAX_SIZE = 10000
+
+class ICERBatchEvaluationRequest(BaseRequest):
+    """批量ICER评估请求（按列传入成本与效果，第i项为同一候选方案）"""
+    intervention_costs: List[Annotated[float, Field(ge=0)]] = Field(
+        ..., min_length=1, max_length=ICER_BATCH_MAX_SIZE, description="干预成本(元)列表"
+    )
+    intervention_effectiveness: List[Annotated[float, Field(gt=0)]] = Field(
+        ..., min_length=1, max_length=ICER_BATCH_MAX_SIZE, description="干预效果(DALY saved)列表"
+    )
+    policy_version: Optional[str] = Field(None, description="指定策略版本")
+
+    @model_validator(mode='after')
+    def validate_lengths(self):
+        # 成本与效果逐项对应
+        if len(self.intervention_costs) != len(self.intervention_effectiveness):
+            raise ValueError('intervention_costs and intervention_effectiveness must have the same length')
+        return self
+
 # 干预相关请求
 class InterventionCreateRequest(BaseRequest):
     """创建干预请求"""
     patient_id: str = Field(..., description="患者ID")
     screening_id: Optional[str] = Field(None, description="关联筛查ID")
-    intervention_type: InterventionTypeEnum = Field(..., description="干预类型")
+    intervention_type: InterventionType = Field(..., description="干预类型")
     intervention_plan: Dict[str, Any] = Field(..., description="干预计划详情")
     priority_level: Optional[str] = Field("medium", description="优先级")
     assigned_resources: Optional[List[str]] = Field(default_factory=list, description="分配资源")
@@ -130,14 +156,14 @@ class InterventionCreateRequest(BaseRequest):
 
 class InterventionApprovalRequest(BaseModel):
     """干预审批请求"""
-    approval_status: ApprovalStatusEnum = Field(..., description="审批状态")
+    approval_status: ApprovalStatus = Field(..., description="审批状态")
     approved_by: str = Field(..., min_length=1, max_length=100, description="审批人")
     approval_notes: Optional[str] = Field(None, description="审批备注")
     modified_plan: Optional[Dict[str, Any]] = Field(None, description="修改后的计划")
 
 class InterventionExecutionRequest(BaseModel):
     """干预执行状态更新请求"""
-    execution_status: ExecutionStatusEnum = Field(..., description="执行状态")
+    execution_status: ExecutionStatus = Field(..., description="执行状态")
     execution_notes: Optional[str] = Field(None, description="执行备注")
     actual_cost: Optional[float] = Field(None, ge=0, description="实际成本")
 
@@ -174,6 +200,8 @@ class OutcomeCreateRequest(BaseRequest):
 # 查询请求
 class PaginationRequest(BaseModel):
     """分页请求"""
+    model_config = ConfigDict(defer_build=True)
+    
     page: int = Field(1, ge=1, description="页码")
     size: int = Field(20, ge=1, le=100, description="每页大小")
     sort_by: Optional[str] = Field(None, description="排序字段")
@@ -191,7 +219,7 @@ class PatientQueryRequest(PaginationRequest):
 class ScreeningQueryRequest(PaginationRequest):
     """筛查查询请求"""
     patient_id: Optional[str] = Field(None, description="患者ID筛选")
-    triage_level: Optional[TriageLevelEnum] = Field(None, description="分诊级别筛选")
+    triage_level: Optional[TriageLevel] = Field(None, description="分诊级别筛选")
     status: Optional[str] = Field(None, description="状态筛选")
     created_after: Optional[datetime] = Field(None, description="创建时间起始")
     created_before: Optional[datetime] = Field(None, description="创建时间结束")
@@ -199,9 +227,9 @@ class ScreeningQueryRequest(PaginationRequest):
 class InterventionQueryRequest(PaginationRequest):
     """干预查询请求"""
     patient_id: Optional[str] = Field(None, description="患者ID筛选")
-    intervention_type: Optional[InterventionTypeEnum] = Field(None, description="干预类型筛选")
-    approval_status: Optional[ApprovalStatusEnum] = Field(None, description="审批状态筛选")
-    execution_status: Optional[ExecutionStatusEnum] = Field(None, description="执行状态筛选")
+    intervention_type: Optional[InterventionType] = Field(None, description="干预类型筛选")
+    approval_status: Optional[ApprovalStatus] = Field(None, description="审批状态筛选")
+    execution_status: Optional[ExecutionStatus] = Field(None, description="执行状态筛选")
     created_after: Optional[datetime] = Field(None, description="创建时间起始")
     created_before: Optional[datetime] = Field(None, description="创建时间结束")
 
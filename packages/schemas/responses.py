@@ -2,15 +2,40 @@
 HealthLink API 响应模型
 Pydantic 模型用于API响应序列化
 """
+from contextvars import ContextVar
 from datetime import datetime, date
 from typing import Optional, List, Dict, Any, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# 请求级时间戳，由网关中间件在请求入口设置；同一请求内的响应共用
+request_now: ContextVar[Optional[datetime]] = ContextVar('request_now', default=None)
+
+def current_time() -> datetime:
+    """当前请求的时间戳，不在请求上下文中时取当前时间"""
+    return request_now.get() or datetime.now()
+
+# 数据库读出的行视为可信数据，详情/写入类接口通过 from_row() 直接构造响应模型
+# 跳过逐字段校验（调用点见 services/gateway_api/routers/*.py）；
+# 列表接口使用 packages/schemas/_fast.py 中的 msgspec 结构
+class RowModelMixin:
+    """从ORM行无校验构造模型"""
+    
+    @classmethod
+    def from_row(cls, row: Any):
+        return cls.model_construct(**{name: getattr(row, name) for name in cls.model_fields})
 
 # 基础响应模型
 class BaseResponse(BaseModel):
     """基础响应模型"""
+    # 延迟构建校验器/序列化器，子类（含各列表响应）随之继承
+    model_config = ConfigDict(
+        defer_build=True,
+        ser_json_timedelta='iso8601',
+        ser_json_bytes='base64'
+    )
+    
     request_id: Optional[str] = Field(None, description="请求ID")
-    timestamp: datetime = Field(default_factory=datetime.now, description="响应时间")
+    timestamp: datetime = Field(default_factory=current_time, description="响应时间")
 
 class ErrorDetail(BaseModel):
     """错误详情"""
@@ -30,20 +55,23 @@ class SuccessResponse(BaseResponse):
 # 分页响应
 class PaginationMeta(BaseModel):
     """分页元数据"""
-    page: int = Field(..., description="当前页码")
+    page: Optional[int] = Field(None, description="当前页码（游标分页时不返回）")
     size: int = Field(..., description="每页大小")
-    total: int = Field(..., description="总记录数")
-    pages: int = Field(..., description="总页数")
+    total: Optional[int] = Field(..., description="总记录数（游标分页时不统计，为空）")
+    pages: Optional[int] = Field(..., description="总页数（游标分页时为空）")
     has_next: bool = Field(..., description="是否有下一页")
     has_prev: bool = Field(..., description="是否有上一页")
+    next_cursor: Optional[str] = Field(None, description="下一页游标（游标分页时返回）")
 
+# 列表接口直接返回 _fast 中 msgspec 结构编码的响应，各 *ListResponse 仅作为
+# 路由的 response_model 声明 OpenAPI 文档结构，字段须与对应结构保持一致
 class PaginatedResponse(SuccessResponse):
     """分页响应基类"""
     meta: PaginationMeta = Field(..., description="分页元数据")
 
 # 患者相关响应
-class PatientResponse(BaseModel):
-    """患者响应"""
+class PatientSummaryResponse(BaseModel):
+    """患者列表项（不含扩展元数据）"""
     id: int = Field(..., description="内部ID")
     patient_id: str = Field(..., description="患者业务ID")
     name: str = Field(..., description="患者姓名")
@@ -53,24 +81,43 @@ class PatientResponse(BaseModel):
     email: Optional[str] = Field(None, description="邮箱地址")
     medical_record_number: Optional[str] = Field(None, description="病历号")
     primary_doctor_id: Optional[str] = Field(None, description="主治医生ID")
-    metadata_json: Optional[Dict[str, Any]] = Field(None, description="扩展元数据")
     is_active: bool = Field(..., description="是否活跃")
     created_at: datetime = Field(..., description="创建时间")
     updated_at: datetime = Field(..., description="更新时间")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
+
+class PatientResponse(RowModelMixin, PatientSummaryResponse):
+    """患者响应"""
+    metadata_json: Optional[Dict[str, Any]] = Field(None, description="扩展元数据")
+
+    @classmethod
+    def from_row(cls, row: Any) -> "PatientResponse":
+        # 出生日期列为DateTime，截取日期部分（模型不可变，构造前处理）
+        values = {name: getattr(row, name) for name in cls.model_fields}
+        if isinstance(values['birth_date'], datetime):
+            values['birth_date'] = values['birth_date'].date()
+        return cls.model_construct(**values)
 
 class PatientCreateResponse(SuccessResponse):
     """创建患者响应"""
     data: PatientResponse = Field(..., description="患者数据")
 
+class PatientCreatedItem(BaseModel):
+    """批量创建结果项（仅返回ID）"""
+    id: int = Field(..., description="内部ID")
+    patient_id: str = Field(..., description="患者业务ID")
+
+class PatientBatchCreateResponse(SuccessResponse):
+    """批量创建患者响应"""
+    data: List[PatientCreatedItem] = Field(..., description="已创建的患者")
+
 class PatientListResponse(PaginatedResponse):
     """患者列表响应"""
-    data: List[PatientResponse] = Field(..., description="患者列表")
+    data: List[PatientSummaryResponse] = Field(..., description="患者列表")
 
 # 筛查相关响应
-class ScreeningResponse(BaseModel):
+class ScreeningResponse(RowModelMixin, BaseModel):
     """筛查响应"""
     id: int = Field(..., description="内部ID")
     screening_id: str = Field(..., description="筛查业务ID")
@@ -102,8 +149,7 @@ class ScreeningResponse(BaseModel):
     created_at: datetime = Field(..., description="创建时间")
     updated_at: datetime = Field(..., description="更新时间")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 class ScreeningCreateResponse(SuccessResponse):
     """创建筛查响应"""
@@ -118,13 +164,12 @@ class ScreeningTriageResponse(SuccessResponse):
     data: ScreeningResponse = Field(..., description="更新后的筛查数据")
 
 # ICER相关响应
-class ICERPolicyResponse(BaseModel):
-    """ICER策略响应"""
+class ICERPolicySummaryResponse(BaseModel):
+    """ICER策略列表项（不含完整策略数据）"""
     id: int = Field(..., description="内部ID")
     policy_id: str = Field(..., description="策略业务ID")
     version: str = Field(..., description="策略版本")
     threshold_per_daly: float = Field(..., description="DALY阈值")
-    policy_data: Dict[str, Any] = Field(..., description="策略数据")
     description: Optional[str] = Field(None, description="策略描述")
     source: Optional[str] = Field(None, description="策略来源")
     effective_date: Optional[datetime] = Field(None, description="生效日期")
@@ -134,8 +179,11 @@ class ICERPolicyResponse(BaseModel):
     created_at: datetime = Field(..., description="创建时间")
     updated_at: datetime = Field(..., description="更新时间")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
+
+class ICERPolicyResponse(RowModelMixin, ICERPolicySummaryResponse):
+    """ICER策略响应"""
+    policy_data: Dict[str, Any] = Field(..., description="策略数据")
 
 class ICERPolicyCreateResponse(SuccessResponse):
     """创建ICER策略响应"""
@@ -143,9 +191,9 @@ class ICERPolicyCreateResponse(SuccessResponse):
 
 class ICERPolicyListResponse(PaginatedResponse):
     """ICER策略列表响应"""
-    data: List[ICERPolicyResponse] = Field(..., description="策略列表")
+    data: List[ICERPolicySummaryResponse] = Field(..., description="策略列表")
 
-class ICEREvaluationResponse(BaseModel):
+class ICEREvaluationResponse(RowModelMixin, BaseModel):
     """ICER评估响应"""
     id: int = Field(..., description="内部ID")
     evaluation_id: str = Field(..., description="评估业务ID")
@@ -167,16 +215,26 @@ class ICEREvaluationResponse(BaseModel):
     cohort_id: Optional[str] = Field(None, description="人群标识")
     created_at: datetime = Field(..., description="创建时间")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 class ICEREvaluationCreateResponse(SuccessResponse):
     """创建ICER评估响应"""
     data: ICEREvaluationResponse = Field(..., description="评估数据")
 
+class ICERBatchEvaluationResult(BaseModel):
+    """批量ICER评估结果（与请求列表逐项对应）"""
+    policy_id: int = Field(..., description="策略内部ID")
+    threshold_used: float = Field(..., description="使用的阈值")
+    icer_values: List[float] = Field(..., description="ICER值列表")
+    decisions: List[str] = Field(..., description="决策结果列表")
+
+class ICERBatchEvaluationResponse(SuccessResponse):
+    """批量ICER评估响应"""
+    data: ICERBatchEvaluationResult = Field(..., description="评估结果")
+
 # 干预相关响应
-class InterventionResponse(BaseModel):
-    """干预响应"""
+class InterventionSummaryResponse(BaseModel):
+    """干预列表项（不含干预计划、分配资源与预期结果）"""
     id: int = Field(..., description="内部ID")
     intervention_id: str = Field(..., description="干预业务ID")
     patient_id: int = Field(..., description="患者内部ID")
@@ -185,13 +243,10 @@ class InterventionResponse(BaseModel):
     
     # 干预内容
     intervention_type: str = Field(..., description="干预类型")
-    intervention_plan: Dict[str, Any] = Field(..., description="干预计划")
     priority_level: Optional[str] = Field(None, description="优先级")
     
     # 资源匹配
-    assigned_resources: Optional[List[str]] = Field(None, description="分配资源")
     estimated_cost: Optional[float] = Field(None, description="预估成本")
-    expected_outcome: Optional[str] = Field(None, description="预期结果")
     
     # 审批状态
     approval_status: str = Field(..., description="审批状态")
@@ -207,8 +262,13 @@ class InterventionResponse(BaseModel):
     created_at: datetime = Field(..., description="创建时间")
     updated_at: datetime = Field(..., description="更新时间")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
+
+class InterventionResponse(RowModelMixin, InterventionSummaryResponse):
+    """干预响应"""
+    intervention_plan: Dict[str, Any] = Field(..., description="干预计划")
+    assigned_resources: Optional[List[str]] = Field(None, description="分配资源")
+    expected_outcome: Optional[str] = Field(None, description="预期结果")
 
 class InterventionCreateResponse(SuccessResponse):
     """创建干预响应"""
@@ -216,16 +276,16 @@ class InterventionCreateResponse(SuccessResponse):
 
 class InterventionListResponse(PaginatedResponse):
     """干预列表响应"""
-    data: List[InterventionResponse] = Field(..., description="干预列表")
+    data: List[InterventionSummaryResponse] = Field(..., description="干预列表")
 
 class InterventionApprovalResponse(SuccessResponse):
     """干预审批响应"""
     data: InterventionResponse = Field(..., description="更新后的干预数据")
 
 # 效果追踪相关响应
-class OutcomeResponse(BaseModel):
+class OutcomeResponse(RowModelMixin, BaseModel):
     """效果响应"""
-    id: int = Field(..., description="内部ID")
+    id: Optional[int] = Field(..., description="内部ID（延迟写入尚未落库时为空）")
     outcome_id: str = Field(..., description="效果业务ID")
     patient_id: int = Field(..., description="患者内部ID")
     intervention_id: Optional[int] = Field(None, description="干预内部ID")
@@ -259,8 +319,7 @@ class OutcomeResponse(BaseModel):
     created_at: datetime = Field(..., description="创建时间")
     updated_at: datetime = Field(..., description="更新时间")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 class OutcomeCreateResponse(SuccessResponse):
     """创建效果响应"""
@@ -274,7 +333,7 @@ class OutcomeListResponse(PaginatedResponse):
 class HealthCheckResponse(BaseModel):
     """健康检查响应"""
     status: str = Field(..., description="服务状态")
-    timestamp: datetime = Field(default_factory=datetime.now, description="检查时间")
+    timestamp: datetime = Field(default_factory=current_time, description="检查时间")
     version: str = Field(..., description="服务版本")
     database: str = Field(..., description="数据库状态")
     external_services: Dict[str, str] = Field(..., description="外部服务状态")
@@ -295,4 +354,4 @@ class StatsResponse(BaseModel):
     
     # 时间范围
     stats_period: str = Field(..., description="统计周期")
-    generated_at: datetime = Field(default_factory=datetime.now, description="生成时间")
\ No newline at end of file
+    generated_at: datetime = Field(default_factory=current_time, description="生成时间")
\ No newline at end of file
@@ -3,54 +3,124 @@
 HealthLink 质量检查脚本
 运行所有质量门禁检查
 """
+import asyncio
+import importlib.util
+import io
 import os
+import shlex
 import sys
-import subprocess
 import time
+from asyncio.subprocess import PIPE
+from contextlib import redirect_stdout, redirect_stderr
+from functools import partial
 from pathlib import Path
 
-def run_command(cmd, cwd=None, timeout=60):
-    """运行命令并返回结果"""
+import httpx
+
+async def run_command(cmd, cwd=None, timeout=60):
+    """运行命令并返回结果（不经过shell，直接创建子进程）"""
     try:
-        result = subprocess.run(
-            cmd, 
-            shell=True, 
-            cwd=cwd, 
-            capture_output=True, 
-            text=True, 
-            timeout=timeout
+        proc = await asyncio.create_subprocess_exec(
+            *shlex.split(cmd),
+            stdout=PIPE,
+            stderr=PIPE,
+            cwd=cwd
         )
-        return result.returncode == 0, result.stdout, result.stderr
-    except subprocess.TimeoutExpired:
-        return False, "", "Command timed out"
     except Exception as e:
         return False, "", str(e)
 
-def check_python_quality():
-    """检查Python代码质量"""
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return False, "", "Command timed out"
+
+    return (
+        proc.returncode == 0,
+        stdout.decode(errors="replace"),
+        stderr.decode(errors="replace")
+    )
+
+def report(name, success, stderr):
+    """输出单项检查结果"""
+    if success:
+        print(f"  ✅ {name}: PASSED")
+    else:
+        print(f"  ❌ {name}: FAILED")
+        if stderr:
+            print(f"     Error: {stderr.strip()}")
+
+def run_in_process(func, *args, **kwargs):
+    """在当前解释器内调用工具入口，捕获输出并按退出码返回结果
+
+    输出重定向作用于整个进程，调用方需保证同一时间只运行一个
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code = func(*args, **kwargs)
+    except SystemExit as e:
+        code = e.code
+    except Exception as e:
+        return False, stdout.getvalue(), str(e)
+    return not code, stdout.getvalue(), stderr.getvalue()
+
+async def lint_black():
+    """Black格式检查（多文件模式需在主线程自建事件循环，仍以子进程运行）"""
+    return await run_command("black --check .")
+
+async def lint_isort():
+    """isort导入排序检查"""
+    try:
+        from isort.main import main as isort_main
+    except ImportError:
+        return await run_command("isort --check-only .")
+    return await asyncio.to_thread(run_in_process, isort_main, ["--check-only", "."])
+
+async def lint_ruff():
+    """Ruff检查（Rust二进制，仍以子进程运行）"""
+    try:
+        from ruff.__main__ import find_ruff_bin
+        ruff_bin = shlex.quote(find_ruff_bin())
+    except (ImportError, FileNotFoundError):
+        ruff_bin = "ruff"
+    return await run_command(f"{ruff_bin} check .")
+
+async def lint_mypy():
+    """MyPy类型检查"""
+    try:
+        from mypy import api as mypy_api
+    except ImportError:
+        return await run_command("mypy services/icer_engine --ignore-missing-imports")
+    stdout, stderr, code = await asyncio.to_thread(
+        mypy_api.run, ["services/icer_engine", "--ignore-missing-imports"]
+    )
+    return code == 0, stdout, stderr
+
+async def check_python_quality():
+    """检查Python代码质量（子进程检查与进程内检查并行）"""
     print("🔍 Checking Python code quality...")
     
+    # 先启动子进程类检查，进程内工具在工作线程中依次运行
+    black_task = asyncio.create_task(lint_black())
+    ruff_task = asyncio.create_task(lint_ruff())
     checks = [
-        ("Black formatting", "black --check ."),
-        ("Import sorting", "isort --check-only ."),
-        ("Ruff linting", "ruff check ."),
-        ("MyPy type checking", "mypy services/icer_engine --ignore-missing-imports"),
+        ("Black formatting", lambda: black_task),
+        ("Import sorting", lint_isort),
+        ("Ruff linting", lambda: ruff_task),
+        ("MyPy type checking", lint_mypy),
     ]
     
     passed = 0
-    for name, cmd in checks:
-        success, stdout, stderr = run_command(cmd)
-        if success:
-            print(f"  ✅ {name}: PASSED")
-            passed += 1
-        else:
-            print(f"  ❌ {name}: FAILED")
-            if stderr:
-                print(f"     Error: {stderr.strip()}")
+    for name, lint in checks:
+        success, stdout, stderr = await lint()
+        report(name, success, stderr)
+        passed += success
     
     return passed, len(checks)
 
-def check_tests():
+async def check_tests():
     """运行测试"""
     print("\n🧪 Running tests...")
     
@@ -61,29 +131,24 @@ def check_tests():
     
     passed = 0
     for name, cmd, cwd in tests:
-        success, stdout, stderr = run_command(cmd, cwd=cwd)
-        if success:
-            print(f"  ✅ {name}: PASSED")
-            passed += 1
-        else:
-            print(f"  ❌ {name}: FAILED")
-            if stderr:
-                print(f"     Error: {stderr.strip()}")
+        success, stdout, stderr = await run_command(cmd, cwd=cwd)
+        report(name, success, stderr)
+        passed += success
     
     return passed, len(tests)
 
-def check_openapi():
+async def check_openapi():
     """检查OpenAPI规范"""
     print("\n📋 Checking OpenAPI specification...")
     
     # 检查spectral是否可用
-    spectral_available, _, _ = run_command("npx --version")
+    spectral_available, _, _ = await run_command("npx --version")
     
     if not spectral_available:
         print("  ⚠️  Spectral not available (npx not found), skipping OpenAPI lint")
         return 0, 1
     
-    success, stdout, stderr = run_command("npx -y @stoplight/spectral-cli lint docs/openapi.yaml")
+    success, stdout, stderr = await run_command("npx -y @stoplight/spectral-cli lint docs/openapi.yaml")
     
     if success:
         print("  ✅ OpenAPI specification: PASSED")
@@ -94,19 +159,19 @@ def check_openapi():
             print(f"     Error: {stderr.strip()}")
         return 0, 1
 
-def check_docker():
+async def check_docker():
     """检查Docker构建"""
     print("\n🐳 Checking Docker builds...")
     
     # 检查docker是否可用
-    docker_available, _, _ = run_command("docker --version")
+    docker_available, _, _ = await run_command("docker --version")
     
     if not docker_available:
         print("  ⚠️  Docker not available, skipping Docker checks")
         return 0, 1
     
     # 构建ICER Engine镜像
-    success, stdout, stderr = run_command(
+    success, stdout, stderr = await run_command(
         "docker build -t icer-engine-test .", 
         cwd="services/icer_engine",
         timeout=120
@@ -115,7 +180,7 @@ def check_docker():
     if success:
         print("  ✅ ICER Engine Docker build: PASSED")
         # 清理测试镜像
-        run_command("docker rmi icer-engine-test")
+        await run_command("docker rmi icer-engine-test")
         return 1, 1
     else:
         print("  ❌ ICER Engine Docker build: FAILED")
@@ -123,8 +188,16 @@ def check_docker():
             print(f"     Error: {stderr.strip()}")
         return 0, 1
 
-def check_service_health():
-    """检查服务健康状态"""
+async def probe(client, url):
+    """请求健康检查端点，状态码小于400视为运行中"""
+    try:
+        response = await client.get(url)
+    except httpx.HTTPError:
+        return False
+    return response.status_code < 400
+
+async def check_service_health(client):
+    """检查服务健康状态（复用同一HTTP客户端的连接）"""
     print("\n🏥 Checking service health...")
     
     # 检查是否有服务在运行
@@ -133,9 +206,10 @@ def check_service_health():
         ("ICER Engine", "http://localhost:8090/health"),
     ]
     
+    results = await asyncio.gather(*[probe(client, url) for _, url in services])
+
     passed = 0
-    for name, url in services:
-        success, stdout, stderr = run_command(f"curl -s -f {url}")
+    for (name, _), success in zip(services, results):
         if success:
             print(f"  ✅ {name}: RUNNING")
             passed += 1
@@ -144,55 +218,67 @@ def check_service_health():
     
     return passed, len(services)
 
-def install_dependencies():
-    """安装必要的依赖"""
+# 质量检查依赖：PyPI包名 -> 导入模块名
+QUALITY_DEPS = {
+    "black": "black",
+    "isort": "isort",
+    "ruff": "ruff",
+    "mypy": "mypy",
+    "pytest": "pytest",
+    "requests": "requests",
+}
+
+async def install_dependencies():
+    """安装必要的依赖（已可导入的包跳过，其余一次性安装）"""
     print("📦 Installing quality check dependencies...")
     
-    deps = [
-        "black",
-        "isort", 
-        "ruff",
-        "mypy",
-        "pytest",
-        "requests"
+    missing = [
+        dep for dep, module in QUALITY_DEPS.items()
+        if importlib.util.find_spec(module) is None
     ]
-    
-    for dep in deps:
-        print(f"  Installing {dep}...")
-        success, _, stderr = run_command(f"pip install {dep}")
-        if not success:
-            print(f"  ⚠️  Failed to install {dep}: {stderr}")
+    if not missing:
+        print("  All dependencies already installed")
+        return
 
-def main():
-    """主函数"""
+    print(f"  Installing {' '.join(missing)}...")
+    success, _, stderr = await run_command(
+        f"{shlex.quote(sys.executable)} -m pip install --disable-pip-version-check --no-input {' '.join(missing)}",
+        timeout=300
+    )
+    if not success:
+        print(f"  ⚠️  Failed to install {' '.join(missing)}: {stderr}")
+
+async def run_checks():
+    """运行所有检查"""
     print("=" * 60)
     print("🔍 HealthLink 质量检查")
     print("=" * 60)
     
     # 安装依赖
-    install_dependencies()
+    await install_dependencies()
     print()
     
     total_passed = 0
     total_checks = 0
     
-    # 运行各项检查
-    checks = [
-        check_python_quality,
-        check_tests,
-        check_openapi,
-        check_docker,
-        check_service_health,
-    ]
-    
-    for check_func in checks:
-        try:
-            passed, total = check_func()
-            total_passed += passed
-            total_checks += total
-        except Exception as e:
-            print(f"❌ Check failed with error: {e}")
-            total_checks += 1
+    async with httpx.AsyncClient(http2=True, timeout=2.0) as client:
+        # 运行各项检查
+        checks = [
+            check_python_quality,
+            check_tests,
+            check_openapi,
+            check_docker,
+            partial(check_service_health, client),
+        ]
+        
+        for check_func in checks:
+            try:
+                passed, total = await check_func()
+                total_passed += passed
+                total_checks += total
+            except Exception as e:
+                print(f"❌ Check failed with error: {e}")
+                total_checks += 1
     
     # 输出总结
     print("\n" + "=" * 60)
@@ -208,5 +294,9 @@ def main():
         print("❌ 多项检查失败，请修复问题后重试。")
         return 1
 
+def main():
+    """主函数"""
+    return asyncio.run(run_checks())
+
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
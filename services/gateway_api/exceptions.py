@@ -2,20 +2,57 @@
 HealthLink Gateway API 异常处理
 统一错误响应格式
 """
-import traceback
-from typing import Union
+from http import HTTPStatus
+from typing import Any, Dict, Final, Mapping, Optional
 
+import msgspec
+import orjson
 import structlog
 from fastapi import FastAPI, Request, HTTPException, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from pydantic import ValidationError
 from sqlalchemy.exc import SQLAlchemyError
 
-from packages.schemas.responses import ErrorResponse, ErrorDetail
+from packages.schemas._fast import ErrorResponse, ErrorDetail, error_response
+from packages.schemas.responses import current_time
+from .dependencies import resolve_request_id
 
 logger = structlog.get_logger()
 
+# 映射HTTP状态码到错误代码
+_ERROR_CODE_MAP: Final[Dict[int, str]] = {
+    400: "BAD_REQUEST",
+    401: "UNAUTHORIZED",
+    403: "FORBIDDEN",
+    404: "NOT_FOUND",
+    405: "METHOD_NOT_ALLOWED",
+    422: "UNPROCESSABLE_ENTITY",
+    429: "RATE_LIMIT_EXCEEDED",
+    500: "INTERNAL_SERVER_ERROR",
+    502: "BAD_GATEWAY",
+    503: "SERVICE_UNAVAILABLE"
+}
+
+# 占位符（序列化后带引号，替换为JSON编码后的值）
+_RID_PLACEHOLDER: Final = b'"__RID__"'
+_TS_PLACEHOLDER: Final = b'"__TS__"'
+
+def _error_template(status_code: int, error_code: str) -> bytes:
+    """预先序列化使用默认消息的错误响应，请求ID与时间戳留作占位符"""
+    content = msgspec.to_builtins(ErrorResponse(
+        request_id="__RID__",
+        error=ErrorDetail(code=error_code, message=HTTPStatus(status_code).phrase)
+    ))
+    content["timestamp"] = "__TS__"
+    return orjson.dumps(content)
+
+# 未自定义detail的HTTP异常直接使用预序列化的响应体
+_PRECOMPUTED_ERROR_BYTES: Final[Dict[int, bytes]] = {
+    code: _error_template(code, error_code)
+    for code, error_code in _ERROR_CODE_MAP.items()
+}
+
 class HealthLinkException(Exception):
     """HealthLink自定义异常基类"""
     
@@ -24,7 +61,7 @@ class HealthLinkException(Exception):
         message: str, 
         code: str = "INTERNAL_ERROR",
         status_code: int = status.HTTP_500_INTERNAL_SERVER_ERROR,
-        details: dict = None
+        details: Optional[Dict[str, Any]] = None
     ):
         self.message = message
         self.code = code
@@ -35,7 +72,7 @@ class HealthLinkException(Exception):
 class ValidationException(HealthLinkException):
     """数据验证异常"""
     
-    def __init__(self, message: str, field: str = None):
+    def __init__(self, message: str, field: Optional[str] = None):
         super().__init__(
             message=message,
             code="VALIDATION_ERROR",
@@ -57,7 +94,7 @@ class NotFoundException(HealthLinkException):
 class ConflictException(HealthLinkException):
     """资源冲突异常"""
     
-    def __init__(self, message: str, resource: str = None):
+    def __init__(self, message: str, resource: Optional[str] = None):
         super().__init__(
             message=message,
             code="RESOURCE_CONFLICT",
@@ -90,9 +127,9 @@ def setup_exception_handlers(app: FastAPI) -> None:
     """设置异常处理器"""
     
     @app.exception_handler(HealthLinkException)
-    async def healthlink_exception_handler(request: Request, exc: HealthLinkException):
+    async def healthlink_exception_handler(request: Request, exc: HealthLinkException) -> Response:
         """处理自定义异常"""
-        request_id = getattr(request.state, 'request_id', 'unknown')
+        request_id = resolve_request_id(request)
         
         logger.error(
             "HealthLink exception occurred",
@@ -103,24 +140,18 @@ def setup_exception_handlers(app: FastAPI) -> None:
             details=exc.details
         )
         
-        error_response = ErrorResponse(
+        return error_response(
+            exc.status_code,
+            exc.code,
+            exc.message,
             request_id=request_id,
-            error=ErrorDetail(
-                code=exc.code,
-                message=exc.message,
-                field=exc.details.get('field')
-            )
-        )
-        
-        return JSONResponse(
-            status_code=exc.status_code,
-            content=error_response.dict()
+            field=exc.details.get('field')
         )
     
     @app.exception_handler(HTTPException)
-    async def http_exception_handler(request: Request, exc: HTTPException):
+    async def http_exception_handler(request: Request, exc: HTTPException) -> Response:
         """处理HTTP异常"""
-        request_id = getattr(request.state, 'request_id', 'unknown')
+        request_id = resolve_request_id(request)
         
         logger.warning(
             "HTTP exception occurred",
@@ -129,42 +160,32 @@ def setup_exception_handlers(app: FastAPI) -> None:
             detail=exc.detail
         )
         
-        # 映射HTTP状态码到错误代码
-        error_code_map = {
-            400: "BAD_REQUEST",
-            401: "UNAUTHORIZED",
-            403: "FORBIDDEN",
-            404: "NOT_FOUND",
-            405: "METHOD_NOT_ALLOWED",
-            422: "UNPROCESSABLE_ENTITY",
-            429: "RATE_LIMIT_EXCEEDED",
-            500: "INTERNAL_SERVER_ERROR",
-            502: "BAD_GATEWAY",
-            503: "SERVICE_UNAVAILABLE"
-        }
-        
-        error_code = error_code_map.get(exc.status_code, "HTTP_ERROR")
-        
-        error_response = ErrorResponse(
-            request_id=request_id,
-            error=ErrorDetail(
-                code=error_code,
-                message=str(exc.detail)
+        template = _PRECOMPUTED_ERROR_BYTES.get(exc.status_code)
+        if template is not None and exc.detail == HTTPStatus(exc.status_code).phrase:
+            content = template.replace(_RID_PLACEHOLDER, orjson.dumps(request_id))
+            content = content.replace(_TS_PLACEHOLDER, orjson.dumps(current_time()))
+            return Response(
+                content=content,
+                status_code=exc.status_code,
+                media_type="application/json"
             )
-        )
         
-        return JSONResponse(
-            status_code=exc.status_code,
-            content=error_response.dict()
+        error_code = _ERROR_CODE_MAP.get(exc.status_code, "HTTP_ERROR")
+        
+        return error_response(
+            exc.status_code,
+            error_code,
+            str(exc.detail),
+            request_id=request_id
         )
     
     @app.exception_handler(RequestValidationError)
-    async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    async def validation_exception_handler(request: Request, exc: RequestValidationError) -> Response:
         """处理请求验证异常"""
-        request_id = getattr(request.state, 'request_id', 'unknown')
+        request_id = resolve_request_id(request)
         
         # 提取第一个验证错误
-        first_error = exc.errors()[0] if exc.errors() else {}
+        first_error: Mapping[str, Any] = exc.errors()[0] if exc.errors() else {}
         field = ".".join(str(loc) for loc in first_error.get('loc', []))
         message = first_error.get('msg', 'Validation error')
         
@@ -176,27 +197,21 @@ def setup_exception_handlers(app: FastAPI) -> None:
             errors=exc.errors()
         )
         
-        error_response = ErrorResponse(
+        return error_response(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            "VALIDATION_ERROR",
+            f"Validation failed for field '{field}': {message}",
             request_id=request_id,
-            error=ErrorDetail(
-                code="VALIDATION_ERROR",
-                message=f"Validation failed for field '{field}': {message}",
-                field=field
-            )
-        )
-        
-        return JSONResponse(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            content=error_response.dict()
+            field=field
         )
     
     @app.exception_handler(ValidationError)
-    async def pydantic_validation_exception_handler(request: Request, exc: ValidationError):
+    async def pydantic_validation_exception_handler(request: Request, exc: ValidationError) -> Response:
         """处理Pydantic验证异常"""
-        request_id = getattr(request.state, 'request_id', 'unknown')
+        request_id = resolve_request_id(request)
         
         # 提取第一个验证错误
-        first_error = exc.errors()[0] if exc.errors() else {}
+        first_error: Mapping[str, Any] = exc.errors()[0] if exc.errors() else {}
         field = ".".join(str(loc) for loc in first_error.get('loc', []))
         message = first_error.get('msg', 'Validation error')
         
@@ -208,24 +223,18 @@ def setup_exception_handlers(app: FastAPI) -> None:
             errors=exc.errors()
         )
         
-        error_response = ErrorResponse(
+        return error_response(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            "VALIDATION_ERROR",
+            f"Data validation failed for field '{field}': {message}",
             request_id=request_id,
-            error=ErrorDetail(
-                code="VALIDATION_ERROR",
-                message=f"Data validation failed for field '{field}': {message}",
-                field=field
-            )
-        )
-        
-        return JSONResponse(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            content=error_response.dict()
+            field=field
         )
     
     @app.exception_handler(SQLAlchemyError)
-    async def database_exception_handler(request: Request, exc: SQLAlchemyError):
+    async def database_exception_handler(request: Request, exc: SQLAlchemyError) -> Response:
         """处理数据库异常"""
-        request_id = getattr(request.state, 'request_id', 'unknown')
+        request_id = resolve_request_id(request)
         
         logger.error(
             "Database error occurred",
@@ -235,41 +244,30 @@ def setup_exception_handlers(app: FastAPI) -> None:
         )
         
         # 不暴露具体的数据库错误信息
-        error_response = ErrorResponse(
-            request_id=request_id,
-            error=ErrorDetail(
-                code="DATABASE_ERROR",
-                message="A database error occurred. Please try again later."
-            )
-        )
-        
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=error_response.dict()
+        return error_response(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            "DATABASE_ERROR",
+            "A database error occurred. Please try again later.",
+            request_id=request_id
         )
     
     @app.exception_handler(Exception)
-    async def general_exception_handler(request: Request, exc: Exception):
+    async def general_exception_handler(request: Request, exc: Exception) -> Response:
         """处理通用异常"""
-        request_id = getattr(request.state, 'request_id', 'unknown')
+        request_id = resolve_request_id(request)
         
+        # 异常堆栈由 format_exc_info 处理器格式化，日志级别被过滤时不会展开
         logger.error(
             "Unexpected error occurred",
             request_id=request_id,
             error=str(exc),
             error_type=type(exc).__name__,
-            traceback=traceback.format_exc()
-        )
-        
-        error_response = ErrorResponse(
-            request_id=request_id,
-            error=ErrorDetail(
-                code="INTERNAL_SERVER_ERROR",
-                message="An unexpected error occurred. Please try again later."
-            )
+            exc_info=exc
         )
         
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=error_response.dict()
+        return error_response(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            "INTERNAL_SERVER_ERROR",
+            "An unexpected error occurred. Please try again later.",
+            request_id=request_id
         )
\ No newline at end of file
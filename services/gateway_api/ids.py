@@ -0,0 +1,21 @@
+"""
+HealthLink Gateway API 业务ID格式校验
+筛查/干预/效果等ID由 uuid4 生成，格式不符的ID必然查不到，查询数据库前直接拒绝
+"""
+import re
+
+from .exceptions import ValidationException
+
+_UUID_RE = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE
+)
+
+def is_uuid(value: str) -> bool:
+    """是否为标准UUID文本格式"""
+    return len(value) == 36 and _UUID_RE.fullmatch(value) is not None
+
+def require_uuid(value: str, field: str) -> str:
+    """校验UUID格式，不符合时抛出验证异常"""
+    if not is_uuid(value):
+        raise ValidationException("invalid id format", field)
+    return value
@@ -0,0 +1,64 @@
+"""
+HealthLink Gateway API 日志输出
+日志记录先进入有界队列，由后台任务按批合并后一次写出
+"""
+import asyncio
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler
+from typing import List
+
+import orjson
+
+LOG_QUEUE_MAXSIZE = 10000
+LOG_BATCH_SIZE = 256
+LOG_FLUSH_INTERVAL = 0.05  # 秒
+
+class DroppingQueueHandler(QueueHandler):
+    """非阻塞日志入队，队列满时丢弃记录"""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+def orjson_dumps(obj, **kwargs) -> str:
+    """structlog JSONRenderer 的序列化函数"""
+    return orjson.dumps(obj, **kwargs).decode()
+
+def _drain(log_queue: queue.Queue, limit: int) -> List[bytes]:
+    """取出最多limit条已格式化的日志"""
+    lines = []
+    while len(lines) < limit:
+        try:
+            record = log_queue.get_nowait()
+        except queue.Empty:
+            break
+        lines.append(record.getMessage().encode())
+    return lines
+
+def _write_lines(fd: int, lines: List[bytes]) -> None:
+    """合并为一次write写出（管道可能部分写入，循环直到写完）"""
+    buf = memoryview(b"\n".join(lines) + b"\n")
+    while buf:
+        written = os.write(fd, buf)
+        buf = buf[written:]
+
+async def start_log_writer(log_queue: queue.Queue, fd: int = 1) -> None:
+    """定期批量写出队列中的日志；取消时写出剩余记录"""
+    try:
+        while True:
+            await asyncio.sleep(LOG_FLUSH_INTERVAL)
+            lines = _drain(log_queue, LOG_BATCH_SIZE)
+            while lines:
+                _write_lines(fd, lines)
+                # 积压较多时分批写出，批次间让出事件循环
+                await asyncio.sleep(0)
+                lines = _drain(log_queue, LOG_BATCH_SIZE)
+    except asyncio.CancelledError:
+        lines = _drain(log_queue, log_queue.maxsize or LOG_QUEUE_MAXSIZE)
+        if lines:
+            _write_lines(fd, lines)
+        raise
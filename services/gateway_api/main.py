@@ -2,10 +2,13 @@
 HealthLink Gateway API 主服务
 FastAPI 应用入口点
 """
+import asyncio
+import logging
 import os
+import queue
 import sys
-import uuid
 from contextlib import asynccontextmanager
+from functools import partial
 from typing import Dict, Any
 
 # 添加项目根目录到Python路径
@@ -14,11 +17,16 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
 from fastapi import FastAPI, Request, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
 import structlog
 import time
 
-from config.database_switch import init_database, get_config
+from config.database_switch import (
+    init_database, get_config, stop_audit_writer,
+    outcome_write_behind_enabled, start_outcome_writer
+)
 from packages.schemas.responses import ErrorResponse, ErrorDetail, HealthCheckResponse
 from .routers import patients, screenings, icer, interventions, outcomes, health
 from .middleware import (
@@ -28,6 +36,18 @@ from .middleware import (
     RateLimitMiddleware
 )
 from .exceptions import setup_exception_handlers
+from .tracing import add_otel_context, setup_tracing, instrument_engine
+from .response_cache import list_cache
+from .log_sink import (
+    LOG_QUEUE_MAXSIZE,
+    DroppingQueueHandler,
+    orjson_dumps,
+    start_log_writer
+)
+
+# 日志经队列交给后台任务批量输出，请求路径上只做入队
+log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_MAXSIZE)
+logging.getLogger().addHandler(DroppingQueueHandler(log_queue))
 
 # 配置结构化日志
 structlog.configure(
@@ -40,7 +60,8 @@ structlog.configure(
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
+        add_otel_context,
+        structlog.processors.JSONRenderer(serializer=orjson_dumps)
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
@@ -50,29 +71,75 @@ structlog.configure(
 
 logger = structlog.get_logger()
 
+def _ping_database(engine) -> None:
+    """取一个连接执行一次查询后归还连接池"""
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+async def warm_up(app: FastAPI, engine) -> None:
+    """预热首个请求才会触发的初始化，避免由首个请求承担"""
+    # OpenAPI文档在首次访问 /openapi.json 或 /docs 时才生成，生成后缓存在应用上
+    app.openapi()
+    # 经请求处理所用的线程池执行：加载线程池后端、启动工作线程，并预先建立数据库连接
+    await run_in_threadpool(_ping_database, engine)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
+    # 启动日志批量输出任务
+    log_writer = asyncio.create_task(start_log_writer(log_queue))
+    
     # 启动时初始化
     logger.info("Starting HealthLink Gateway API")
     
+    outcome_writer = None
     try:
         # 初始化数据库
-        init_database()
+        # 返回的即是处理请求的共享引擎，埋点、预热与后台写入都作用于该引擎
+        # （审计日志写入任务在首次 enqueue_audit 时启动）
+        engine = init_database()
+        instrument_engine(engine)
         logger.info("Database initialized successfully")
         
+        # 效果记录延迟写入：每批落库后使效果列表缓存失效
+        if outcome_write_behind_enabled():
+            outcome_writer = asyncio.create_task(
+                start_outcome_writer(engine, on_flush=partial(list_cache.invalidate, "outcomes"))
+            )
+        
         # 加载配置
         config = get_config()
         logger.info("Configuration loaded", config_keys=list(config.keys()))
         
+        # 预热失败不影响启动，对应开销仍由首个请求承担
+        try:
+            await warm_up(app, engine)
+            logger.info("Application warmed up")
+        except Exception as e:
+            logger.warning("Warm-up failed", error=str(e))
+        
         yield
         
     except Exception as e:
         logger.error("Failed to initialize application", error=str(e))
         raise
     finally:
-        # 关闭时清理
+        # 关闭时清理（写出排队中的效果记录与审计日志）
+        if outcome_writer is not None:
+            outcome_writer.cancel()
+            try:
+                await outcome_writer
+            except asyncio.CancelledError:
+                pass
+        await stop_audit_writer()
         logger.info("Shutting down HealthLink Gateway API")
+        
+        # 输出剩余日志并停止任务
+        log_writer.cancel()
+        try:
+            await log_writer
+        except asyncio.CancelledError:
+            pass
 
 # 创建FastAPI应用
 def create_app() -> FastAPI:
@@ -86,6 +153,7 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
+        default_response_class=ORJSONResponse,
         lifespan=lifespan
     )
     
@@ -98,6 +166,9 @@ def create_app() -> FastAPI:
     # 设置异常处理
     setup_exception_handlers(app)
     
+    # 链路追踪（需安装opentelemetry）
+    setup_tracing(app)
+    
     return app
 
 def setup_middleware(app: FastAPI, config: Dict[str, Any]) -> None:
@@ -121,7 +192,7 @@ def setup_middleware(app: FastAPI, config: Dict[str, Any]) -> None:
     
     # 自定义中间件
     app.add_middleware(RequestIDMiddleware)
-    app.add_middleware(LoggingMiddleware)
+    app.add_middleware(LoggingMiddleware, config=config)
     app.add_middleware(AuthMiddleware)
     app.add_middleware(RateLimitMiddleware, config=config)
 
@@ -2,33 +2,67 @@
 HealthLink Gateway API 中间件
 处理请求ID、日志、认证、限流等
 """
+import functools
+import hashlib
+import os
+import secrets
 import time
-import uuid
 import json
-from typing import Dict, Any, Optional
-from collections import defaultdict, deque
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from datetime import datetime
 
 import structlog
-from fastapi import Request, Response, HTTPException, status
+from fastapi import Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.types import ASGIApp
 from jose import JWTError, jwt
 
-from packages.schemas.responses import ErrorResponse, ErrorDetail
+try:
+    from redis import asyncio as redis_asyncio
+    from redis.asyncio.retry import Retry
+    from redis.backoff import NoBackoff
+except ImportError:  # 未安装redis时限流只在进程内计数
+    redis_asyncio = None  # type: ignore[assignment]
+
+from packages.schemas._fast import error_tail, prebuilt_error_response
+from packages.schemas.responses import request_now
+from .dependencies import request_id_var
 
 logger = structlog.get_logger()
 
+# 固定窗口计数：窗口内首次计数时设置过期时间，INCR与EXPIRE在同一脚本内原子执行
+_RATE_LIMIT_LUA = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+_RATE_LIMIT_WINDOW = 60  # 秒
+
+# 允许的JWT签名算法
+_JWT_ALGORITHMS = ("HS256",)
+
+@functools.lru_cache(maxsize=64)
+def _invalid_token_tail(reason: str) -> bytes:
+    """token校验失败的错误响应体（jose的错误消息种类有限，按消息缓存，容量有界防止被构造的token撑大）"""
+    return error_tail("AUTHENTICATION_FAILED", f"Invalid token: {reason}")
+
 class RequestIDMiddleware(BaseHTTPMiddleware):
     """请求ID中间件"""
     
-    async def dispatch(self, request: Request, call_next):
-        # 生成或获取请求ID
-        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        # 生成或获取请求ID（只用于关联日志与响应，不要求UUID格式）
+        request_id = request.headers.get("X-Request-ID") or secrets.token_hex(16)
         
         # 添加到请求状态
         request.state.request_id = request_id
+        request_id_var.set(request_id)
+        
+        # 记录请求时间戳，本请求内的响应模型共用
+        request_now.set(datetime.now())
         
         # 调用下一个中间件
         response = await call_next(request)
@@ -39,34 +73,38 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         return response
 
 class LoggingMiddleware(BaseHTTPMiddleware):
-    """日志中间件"""
+    """日志中间件（默认每个请求只记录完成/失败日志）"""
     
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
+    def __init__(self, app: ASGIApp, config: Optional[Dict[str, Any]] = None):
+        super().__init__(app)
+        # logging.verbose_requests 开启时额外记录请求开始日志
+        self.verbose = bool((config or {}).get('logging', {}).get('verbose_requests', False))
+    
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        start_ns = time.perf_counter_ns()
         
         # 获取请求信息
         request_id = getattr(request.state, 'request_id', 'unknown')
         method = request.method
         url = str(request.url)
-        client_ip = request.client.host if request.client else "unknown"
-        user_agent = request.headers.get("user-agent", "unknown")
         
         # 记录请求开始
-        logger.info(
-            "Request started",
-            request_id=request_id,
-            method=method,
-            url=url,
-            client_ip=client_ip,
-            user_agent=user_agent
-        )
+        if self.verbose:
+            logger.info(
+                "Request started",
+                request_id=request_id,
+                method=method,
+                url=url,
+                client_ip=request.client.host if request.client else "unknown",
+                user_agent=request.headers.get("user-agent", "unknown")
+            )
         
         try:
             # 处理请求
             response = await call_next(request)
             
-            # 计算处理时间
-            process_time = time.time() - start_time
+            # 计算处理时间（单调时钟，整数纳秒）
+            process_time_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
             
             # 记录请求完成
             logger.info(
@@ -75,17 +113,17 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 method=method,
                 url=url,
                 status_code=response.status_code,
-                process_time_ms=round(process_time * 1000, 2)
+                process_time_ms=process_time_ms
             )
             
             # 添加处理时间到响应头
-            response.headers["X-Process-Time"] = str(round(process_time * 1000, 2))
+            response.headers["X-Process-Time"] = f"{process_time_ms:.2f}"
             
             return response
             
         except Exception as e:
             # 计算处理时间
-            process_time = time.time() - start_time
+            process_time_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
             
             # 记录请求错误
             logger.error(
@@ -94,7 +132,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 method=method,
                 url=url,
                 error=str(e),
-                process_time_ms=round(process_time * 1000, 2)
+                process_time_ms=process_time_ms
             )
             
             # 重新抛出异常
@@ -103,31 +141,39 @@ class LoggingMiddleware(BaseHTTPMiddleware):
 class AuthMiddleware(BaseHTTPMiddleware):
     """认证中间件"""
     
-    # 不需要认证的路径
-    EXEMPT_PATHS = {
+    # 不需要认证的路径（/health 下的路径另按前缀判断）
+    EXEMPT_PATHS: FrozenSet[str] = frozenset({
         "/",
         "/docs",
         "/redoc",
-        "/openapi.json",
-        "/health",
-        "/health/",
-        "/health/ready",
-        "/health/live"
-    }
+        "/openapi.json"
+    })
+    
+    # 已验证token的缓存容量与最长缓存时间（秒，不超过token自身的exp）
+    TOKEN_CACHE_MAXSIZE = 10000
+    TOKEN_CACHE_TTL = 300.0
+    
+    # 固定消息的认证错误响应体
+    _MISSING_HEADER = error_tail("AUTHENTICATION_FAILED", "Missing authorization header")
+    _INVALID_SCHEME = error_tail("AUTHENTICATION_FAILED", "Invalid authorization scheme")
     
-    def __init__(self, app, secret_key: str = None):
+    def __init__(self, app: ASGIApp, secret_key: Optional[str] = None):
         super().__init__(app)
         self.secret_key = secret_key or "your-secret-key-here"  # 从配置获取
-        self.algorithm = "HS256"
+        # 预先编码为bytes，验签时不再逐次转换
+        self._secret_key_bytes = self.secret_key.encode()
+        self.development_mode = self._is_development_mode()
         self.security = HTTPBearer(auto_error=False)
+        # blake2b(token) -> (过期时间, 用户信息)
+        self._token_cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
     
-    async def dispatch(self, request: Request, call_next):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
         # 检查是否需要认证
         if self._is_exempt_path(request.url.path):
             return await call_next(request)
         
         # 开发模式跳过认证
-        if self._is_development_mode():
+        if self.development_mode:
             # 设置模拟用户信息
             request.state.user = {
                 "user_id": "dev_user",
@@ -139,70 +185,120 @@ class AuthMiddleware(BaseHTTPMiddleware):
         # 获取认证信息
         authorization = request.headers.get("Authorization")
         if not authorization:
-            return self._create_auth_error("Missing authorization header")
+            return prebuilt_error_response(status.HTTP_401_UNAUTHORIZED, self._MISSING_HEADER)
+        
+        if authorization[:7].lower() != "bearer ":
+            return prebuilt_error_response(status.HTTP_401_UNAUTHORIZED, self._INVALID_SCHEME)
         
         try:
             # 解析JWT token
-            scheme, token = authorization.split(" ", 1)
-            if scheme.lower() != "bearer":
-                return self._create_auth_error("Invalid authorization scheme")
-            
-            # 验证token
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            token = authorization[7:]
             
-            # 设置用户信息
-            request.state.user = {
-                "user_id": payload.get("sub"),
-                "role": payload.get("role", "user"),
-                "organization_id": payload.get("org"),
-                "permissions": payload.get("permissions", [])
-            }
+            # 设置用户信息（缓存返回副本，避免请求间共享可变对象）
+            request.state.user = dict(self._authenticate(token))
             
             return await call_next(request)
             
         except (ValueError, JWTError) as e:
-            return self._create_auth_error(f"Invalid token: {str(e)}")
+            return prebuilt_error_response(status.HTTP_401_UNAUTHORIZED, _invalid_token_tail(str(e)))
+    
+    def _authenticate(self, token: str) -> Dict[str, Any]:
+        """验证token并返回用户信息，已验证且未过期的token直接命中缓存"""
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        now = time.time()
+        cached = self._token_cache.get(key)
+        if cached is not None:
+            if cached[0] > now:
+                self._token_cache.move_to_end(key)
+                return cached[1]
+            del self._token_cache[key]
+        
+        # 验证token
+        payload = jwt.decode(token, self._secret_key_bytes, algorithms=_JWT_ALGORITHMS)
+        user = {
+            "user_id": payload.get("sub"),
+            "role": payload.get("role", "user"),
+            "organization_id": payload.get("org"),
+            "permissions": payload.get("permissions", [])
+        }
+        
+        expires_at = now + self.TOKEN_CACHE_TTL
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        self._token_cache[key] = (expires_at, user)
+        if len(self._token_cache) > self.TOKEN_CACHE_MAXSIZE:
+            self._token_cache.popitem(last=False)
+        return user
     
     def _is_exempt_path(self, path: str) -> bool:
         """检查路径是否免认证"""
-        return path in self.EXEMPT_PATHS or path.startswith("/health")
+        # 健康检查来自负载均衡器，请求量最大，先判断
+        return path.startswith("/health") or path in self.EXEMPT_PATHS
     
     def _is_development_mode(self) -> bool:
         """检查是否为开发模式"""
         # 这里应该从配置读取
         return True  # MVP阶段暂时返回True
-    
-    def _create_auth_error(self, message: str) -> JSONResponse:
-        """创建认证错误响应"""
-        error_response = ErrorResponse(
-            error=ErrorDetail(
-                code="AUTHENTICATION_FAILED",
-                message=message
-            )
-        )
-        return JSONResponse(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            content=error_response.dict()
-        )
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    """限流中间件"""
+    """限流中间件（令牌桶：容量为burst，按每分钟请求数匀速补充）"""
+    
+    # 空闲超过该时间的客户端桶已补满，可以清理（秒）
+    IDLE_TTL = 300.0
+    SWEEP_INTERVAL = 60.0
+    # Redis出错后改用进程内限流的时间（秒）
+    REDIS_RETRY_AFTER = 5.0
     
-    def __init__(self, app, config: Dict[str, Any]):
+    def __init__(self, app: ASGIApp, config: Dict[str, Any]):
         super().__init__(app)
         rate_limit_config = config.get('gateway', {}).get('rate_limit', {})
-        self.requests_per_minute = rate_limit_config.get('requests_per_minute', 100)
+        self.requests_per_minute: int = rate_limit_config.get('requests_per_minute', 100)
         self.burst = rate_limit_config.get('burst', 20)
+        self.capacity = float(self.burst)
+        self.refill_rate = self.requests_per_minute / 60.0  # 每秒补充的令牌数
+        self._rate_limit_tail = error_tail(
+            "RATE_LIMIT_EXCEEDED",
+            f"Rate limit exceeded: bursts of up to {self.burst} requests, "
+            f"refilled at {round(self.refill_rate, 2):g} requests per second"
+        )
+        
+        # 进程内令牌桶：client_id -> [剩余令牌, 上次补充时间]（未配置Redis或Redis不可用时使用）
+        self.clients: Dict[str, List[float]] = {}
+        self._last_sweep = time.monotonic()
         
-        # 使用内存存储（生产环境应使用Redis）
-        self.clients = defaultdict(lambda: deque())
+        # cache.type 为 redis 时按分钟窗口在Redis中计数，多个worker共享限额
+        self._redis_incr: Any = None
+        self._redis_retry_at = 0.0
+        cache_config = config.get('cache', {})
+        if cache_config.get('type') == 'redis' and redis_asyncio is not None:
+            redis_config = cache_config.get('redis', {})
+            client = redis_asyncio.Redis(
+                host=redis_config.get('host', 'localhost'),
+                port=redis_config.get('port', 6379),
+                db=redis_config.get('db', 0),
+                password=os.getenv('REDIS_PASSWORD'),
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5,
+                # 不重试，失败时直接退回进程内限流
+                retry=Retry(NoBackoff(), 0)
+            )
+            self._redis_incr = client.register_script(_RATE_LIMIT_LUA)
     
-    async def dispatch(self, request: Request, call_next):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        # 健康检查不限流，避免探针被业务流量挤占
+        if request.url.path.startswith("/health"):
+            return await call_next(request)
+        
         # 获取客户端标识
         client_id = self._get_client_id(request)
         
         # 检查限流
-        if not self._is_allowed(client_id):
+        if self._redis_incr is not None and time.monotonic() >= self._redis_retry_at:
+            allowed = await self._is_allowed_shared(client_id)
+        else:
+            allowed = self._is_allowed(client_id)
+        if not allowed:
             return self._create_rate_limit_error()
         
         return await call_next(request)
@@ -218,51 +314,48 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         return f"ip:{client_ip}"
     
     def _is_allowed(self, client_id: str) -> bool:
-        """检查是否允许请求"""
-        now = datetime.now()
-        minute_ago = now - timedelta(minutes=1)
-        
-        # 获取客户端请求记录
-        requests = self.clients[client_id]
+        """检查是否允许请求（补充令牌后消耗一个）"""
+        now = time.monotonic()
+        if now - self._last_sweep > self.SWEEP_INTERVAL:
+            self._sweep(now)
         
-        # 清理过期记录
-        while requests and requests[0] < minute_ago:
-            requests.popleft()
+        state = self.clients.get(client_id)
+        if state is None:
+            self.clients[client_id] = [self.capacity - 1.0, now]
+            return True
         
-        # 检查是否超过限制
-        if len(requests) >= self.requests_per_minute:
+        tokens = min(self.capacity, state[0] + (now - state[1]) * self.refill_rate)
+        state[1] = now
+        if tokens < 1.0:
+            state[0] = tokens
             return False
-        
-        # 记录当前请求
-        requests.append(now)
-        
+        state[0] = tokens - 1.0
         return True
     
-    def _create_rate_limit_error(self) -> JSONResponse:
-        """创建限流错误响应"""
-        error_response = ErrorResponse(
-            error=ErrorDetail(
-                code="RATE_LIMIT_EXCEEDED",
-                message=f"Rate limit exceeded: {self.requests_per_minute} requests per minute"
+    async def _is_allowed_shared(self, client_id: str) -> bool:
+        """Redis固定窗口计数；Redis不可用时退回进程内令牌桶，一段时间后再重试Redis"""
+        window = int(time.time()) // _RATE_LIMIT_WINDOW
+        try:
+            count = await self._redis_incr(
+                keys=[f"rl:{client_id}:{window}"], args=[_RATE_LIMIT_WINDOW]
             )
-        )
-        return JSONResponse(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            content=error_response.dict(),
+        except redis_asyncio.RedisError as e:
+            logger.warning("Rate limit store unavailable", error=str(e))
+            self._redis_retry_at = time.monotonic() + self.REDIS_RETRY_AFTER
+            return self._is_allowed(client_id)
+        return int(count) <= self.requests_per_minute
+    
+    def _sweep(self, now: float) -> None:
+        """清理长时间空闲的客户端，限制内存占用"""
+        self._last_sweep = now
+        stale = [cid for cid, state in self.clients.items() if now - state[1] > self.IDLE_TTL]
+        for cid in stale:
+            del self.clients[cid]
+    
+    def _create_rate_limit_error(self) -> Response:
+        """创建限流错误响应"""
+        return prebuilt_error_response(
+            status.HTTP_429_TOO_MANY_REQUESTS,
+            self._rate_limit_tail,
             headers={"Retry-After": "60"}
         )
-
-# 依赖注入函数
-def get_current_user(request: Request) -> Dict[str, Any]:
-    """获取当前用户信息"""
-    user = getattr(request.state, 'user', None)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authentication required"
-        )
-    return user
-
-def get_request_id(request: Request) -> str:
-    """获取请求ID"""
-    return getattr(request.state, 'request_id', 'unknown')
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+HealthLink Gateway API 游标分页
+按 (created_at, id) 倒序做键集分页，游标为上一页最后一行的排序键
+"""
+import base64
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import String, bindparam, tuple_, type_coerce
+from sqlalchemy.orm import Query
+
+from .exceptions import ValidationException
+
+def encode_cursor(created_at: Any, row_id: int) -> str:
+    """排序键编码为不透明游标"""
+    if not isinstance(created_at, str):
+        created_at = created_at.isoformat(sep=" ")
+    return base64.urlsafe_b64encode(f"{created_at}|{row_id}".encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """解析游标（时间戳须为ISO格式），格式错误时抛出验证异常"""
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        datetime.fromisoformat(created_at)
+        return created_at, int(row_id)
+    except ValueError:
+        raise ValidationException("invalid cursor", "cursor") from None
+
+def _cursor_bound(query: Query, model: Any, created_at: str):
+    """游标时间戳的绑定参数
+
+    按列类型绑定 datetime；SQLite 以文本存储时间且旧数据与新数据的小数秒格式不同，
+    类型化绑定会统一格式导致同一时刻的行比较错位，因此按原始文本比较
+    """
+    if query.session.get_bind().dialect.name == "sqlite":
+        return bindparam(None, created_at, type_=String)
+    return bindparam(None, datetime.fromisoformat(created_at), type_=model.created_at.type)
+
+def keyset_page(query: Query, model: Any, cursor: Optional[str], size: int) -> Tuple[List[Any], Optional[str]]:
+    """按游标取一页（空游标表示第一页），多取一行判断是否有下一页；返回本页记录与下一页游标"""
+    raw_created_at = type_coerce(model.created_at, String)
+    query = query.add_columns(raw_created_at).order_by(None).order_by(
+        model.created_at.desc(), model.id.desc()
+    )
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(model.created_at, model.id) < tuple_(_cursor_bound(query, model, created_at), row_id)
+        )
+
+    rows = query.limit(size + 1).all()
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(rows[-1][1], rows[-1][0].id)
+    return [row[0] for row in rows], next_cursor
@@ -0,0 +1,66 @@
+"""
+HealthLink Gateway API 列表响应缓存
+进程内LRU缓存已序列化的列表数据（不含请求ID/时间戳头部），写接口按路由整体失效
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Optional, Tuple
+
+# 列表数据短时缓存，多进程部署时各进程独立缓存，过期时间即最大陈旧时间
+LIST_CACHE_TTL = 5.0  # 秒
+LIST_CACHE_MAXSIZE = 1024
+
+def make_key(route: str, **params: Any) -> bytes:
+    """按路由与查询参数生成缓存键"""
+    raw = route + "|" + "|".join(f"{name}={value}" for name, value in params.items())
+    return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+class ResponseCache:
+    """进程内LRU响应缓存（流式输出在线程池中写入，写接口在事件循环中失效，操作均加锁）"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, bytes], Tuple[float, bytes]]" = OrderedDict()
+        # 每次失效递增，写入时代数不一致说明期间发生过写操作，丢弃结果
+        self._generations: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def generation(self, route: str) -> int:
+        """当前路由的缓存代数"""
+        with self._lock:
+            return self._generations[route]
+
+    def get(self, route: str, key: bytes) -> Optional[bytes]:
+        """读取未过期的缓存"""
+        with self._lock:
+            entry = self._entries.get((route, key))
+            if entry is None:
+                return None
+            expires_at, body = entry
+            if expires_at < time.monotonic():
+                del self._entries[(route, key)]
+                return None
+            self._entries.move_to_end((route, key))
+            return body
+
+    def set(self, route: str, key: bytes, body: bytes, generation: int) -> None:
+        """写入缓存（生成期间路由已失效则跳过）"""
+        with self._lock:
+            if generation != self._generations[route]:
+                return
+            self._entries[(route, key)] = (time.monotonic() + self.ttl, body)
+            self._entries.move_to_end((route, key))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, route: str) -> None:
+        """使路由下所有缓存失效"""
+        with self._lock:
+            self._generations[route] += 1
+            for entry_key in [k for k in self._entries if k[0] == route]:
+                del self._entries[entry_key]
+
+list_cache = ResponseCache(LIST_CACHE_MAXSIZE, LIST_CACHE_TTL)
@@ -1,28 +1,59 @@
 """
 HealthLink Gateway API 健康检查路由
 """
-from datetime import datetime
+import time
 from typing import Dict
 
+import orjson
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi.responses import Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from config.database_switch import get_database
-from packages.schemas.responses import HealthCheckResponse
+from config.database_switch import get_health_database
+from packages.schemas.responses import HealthCheckResponse, current_time
 
 router = APIRouter()
 
+# 数据库连通性检查结果在此时间内复用，避免探针频繁占用连接
+_DB_CHECK_TTL = 2.0  # 秒
+_PING = text("SELECT 1")
+_last_db_ok = 0.0
+
+# 固定结构的探针响应预先序列化，请求时只替换时间戳
+_TS_PLACEHOLDER = b'"__TS__"'
+_LIVE_TMPL = orjson.dumps({"status": "alive", "timestamp": "__TS__"})
+_METRICS_TMPL = orjson.dumps({
+    "healthlink_requests_total": 0,
+    "healthlink_request_duration_seconds": 0.0,
+    "healthlink_active_connections": 0,
+    "timestamp": "__TS__"
+})
+
+def _render(template: bytes) -> Response:
+    """填入当前请求时间戳"""
+    return Response(
+        content=template.replace(_TS_PLACEHOLDER, orjson.dumps(current_time())),
+        media_type="application/json"
+    )
+
 @router.get("/", response_model=HealthCheckResponse)
 @router.get("/ready", response_model=HealthCheckResponse)
-async def health_check(db: Session = Depends(get_database)):
+async def health_check(db: AsyncSession = Depends(get_health_database)):
     """健康检查端点"""
+    global _last_db_ok
     
-    # 检查数据库连接
-    try:
-        db.execute("SELECT 1")
+    # 检查数据库连接（最近成功过则直接复用结果）
+    now = time.monotonic()
+    if now - _last_db_ok < _DB_CHECK_TTL:
         database_status = "healthy"
-    except Exception as e:
-        database_status = f"unhealthy: {str(e)}"
+    else:
+        try:
+            await db.execute(_PING)
+            database_status = "healthy"
+            _last_db_ok = now
+        except Exception as e:
+            database_status = f"unhealthy: {str(e)}"
     
     # 检查外部服务状态（占位）
     external_services = {
@@ -35,7 +66,6 @@ async def health_check(db: Session = Depends(get_database)):
     
     return HealthCheckResponse(
         status=overall_status,
-        timestamp=datetime.now(),
         version="1.0.0-mvp",
         database=database_status,
         external_services=external_services
@@ -44,16 +74,11 @@ async def health_check(db: Session = Depends(get_database)):
 @router.get("/live")
 async def liveness_check():
     """存活检查端点（简单版本）"""
-    return {"status": "alive", "timestamp": datetime.now()}
+    return _render(_LIVE_TMPL)
 
 @router.get("/metrics")
 async def metrics():
     """Prometheus指标端点（占位）"""
     # 这里应该返回Prometheus格式的指标
     # 暂时返回简单的JSON格式
-    return {
-        "healthlink_requests_total": 0,
-        "healthlink_request_duration_seconds": 0.0,
-        "healthlink_active_connections": 0,
-        "timestamp": datetime.now()
-    }
\ No newline at end of file
+    return _render(_METRICS_TMPL)
\ No newline at end of file
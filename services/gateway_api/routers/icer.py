@@ -1,37 +1,83 @@
 """
 HealthLink Gateway API ICER评估路由
 """
+import time
 import uuid
-from typing import List, Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, Query, Path
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 
 from config.database_switch import get_database
 from packages.schemas.models import ICERPolicy, ICEREvaluation
-from packages.schemas.requests import ICERPolicyCreateRequest, ICEREvaluationRequest
+from packages.schemas.requests import (
+    ICERPolicyCreateRequest,
+    ICEREvaluationRequest,
+    ICERBatchEvaluationRequest
+)
 from packages.schemas.responses import (
     ICERPolicyResponse, 
     ICERPolicyCreateResponse, 
     ICERPolicyListResponse,
     ICEREvaluationResponse,
     ICEREvaluationCreateResponse,
-    PaginationMeta
+    ICERBatchEvaluationResult,
+    ICERBatchEvaluationResponse
 )
-from ..middleware import get_current_user, get_request_id
+from packages.schemas import _fast
+from packages.schemas._fast import MsgspecJSONResponse
+from ..dependencies import request_id_var
+from ..pagination import keyset_page
 from ..exceptions import NotFoundException, ConflictException
 
 router = APIRouter()
 
+# 评估所用策略的进程内缓存（策略极少变更），本进程创建策略时清空；
+# 多进程部署时其他进程最多延迟一个TTL生效
+POLICY_CACHE_TTL = 60.0  # 秒
+
+class PolicyRef(NamedTuple):
+    """评估计算所需的策略字段"""
+    id: int
+    threshold_per_daly: float
+
+# 策略版本（默认策略为None）-> (过期时间, 策略)
+_policy_cache: Dict[Optional[str], Tuple[float, PolicyRef]] = {}
+
+def _get_active_policy(db: Session, policy_version: Optional[str]) -> PolicyRef:
+    """获取指定版本的活跃策略，未指定版本时使用默认策略"""
+    now = time.monotonic()
+    cached = _policy_cache.get(policy_version)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    
+    if policy_version:
+        policy = db.query(ICERPolicy).filter(
+            ICERPolicy.version == policy_version,
+            ICERPolicy.is_active == True
+        ).first()
+    else:
+        # 使用默认策略
+        policy = db.query(ICERPolicy).filter(
+            ICERPolicy.is_default == True,
+            ICERPolicy.is_active == True
+        ).first()
+    
+    if not policy:
+        raise NotFoundException("ICER Policy", policy_version or "default")
+    
+    ref = PolicyRef(policy.id, policy.threshold_per_daly)
+    _policy_cache[policy_version] = (now + POLICY_CACHE_TTL, ref)
+    return ref
+
 @router.post("/policies", response_model=ICERPolicyCreateResponse)
-async def create_icer_policy(
+def create_icer_policy(
     request: ICERPolicyCreateRequest,
-    db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
+    db: Session = Depends(get_database)
 ):
     """创建ICER策略"""
+    request_id = request_id_var.get()
     
     # 检查策略ID是否已存在
     existing_policy = db.query(ICERPolicy).filter(
@@ -45,12 +91,12 @@ async def create_icer_policy(
             resource="icer_policy"
         )
     
-    # 如果设置为默认策略，先取消其他默认策略
+    # 如果设置为默认策略，先取消其他默认策略（与插入在同一事务内）
     if request.is_default:
         db.query(ICERPolicy).filter(
             ICERPolicy.version == request.version,
             ICERPolicy.is_default == True
-        ).update({"is_default": False})
+        ).update({"is_default": False}, synchronize_session=False)
     
     # 创建策略记录
     policy = ICERPolicy(
@@ -66,28 +112,33 @@ async def create_icer_policy(
     )
     
     db.add(policy)
+    # flush后主键与时间戳已在对象上，提交前构建响应，避免提交后过期属性被重新查询
+    db.flush()
+    data = ICERPolicyResponse.from_row(policy)
     db.commit()
-    db.refresh(policy)
+    # 默认策略可能已变更
+    _policy_cache.clear()
     
     return ICERPolicyCreateResponse(
         request_id=request_id,
-        data=ICERPolicyResponse.from_orm(policy)
+        data=data
     )
 
 @router.get("/policies", response_model=ICERPolicyListResponse)
-async def list_icer_policies(
+def list_icer_policies(
     page: int = Query(1, ge=1, description="页码"),
     size: int = Query(20, ge=1, le=100, description="每页大小"),
     version: Optional[str] = Query(None, description="版本筛选"),
     is_active: Optional[bool] = Query(None, description="是否活跃"),
     is_default: Optional[bool] = Query(None, description="是否默认"),
-    db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
+    cursor: Optional[str] = Query(None, description="分页游标（按创建时间倒序键集分页，首页传空字符串）"),
+    db: Session = Depends(get_database)
 ):
     """查询ICER策略列表"""
+    request_id = request_id_var.get()
     
-    query = db.query(ICERPolicy)
+    # 列表不返回完整策略JSON，不加载该列
+    query = db.query(ICERPolicy).options(defer(ICERPolicy.policy_data, raiseload=True))
     
     if version:
         query = query.filter(ICERPolicy.version == version)
@@ -98,6 +149,22 @@ async def list_icer_policies(
     if is_default is not None:
         query = query.filter(ICERPolicy.is_default == is_default)
     
+    # 游标分页：不统计总数，不使用OFFSET
+    if cursor is not None:
+        policies, next_cursor = keyset_page(query, ICERPolicy, cursor, size)
+        return MsgspecJSONResponse(_fast.ListResponse(
+            request_id=request_id,
+            data=[_fast.ICERPolicySummaryResponse.from_orm(policy) for policy in policies],
+            meta=_fast.PaginationMeta(
+                size=size,
+                total=None,
+                pages=None,
+                has_next=next_cursor is not None,
+                has_prev=bool(cursor),
+                next_cursor=next_cursor
+            )
+        ))
+    
     # 按创建时间倒序排列
     query = query.order_by(ICERPolicy.created_at.desc())
     
@@ -110,10 +177,10 @@ async def list_icer_policies(
     has_next = page < pages
     has_prev = page > 1
     
-    return ICERPolicyListResponse(
+    return MsgspecJSONResponse(_fast.ListResponse(
         request_id=request_id,
-        data=[ICERPolicyResponse.from_orm(policy) for policy in policies],
-        meta=PaginationMeta(
+        data=[_fast.ICERPolicySummaryResponse.from_orm(policy) for policy in policies],
+        meta=_fast.PaginationMeta(
             page=page,
             size=size,
             total=total,
@@ -121,32 +188,17 @@ async def list_icer_policies(
             has_next=has_next,
             has_prev=has_prev
         )
-    )
+    ))
 
 @router.post("/evaluate", response_model=ICEREvaluationCreateResponse)
-async def evaluate_icer(
+def evaluate_icer(
     request: ICEREvaluationRequest,
-    db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
+    db: Session = Depends(get_database)
 ):
     """执行ICER评估"""
+    request_id = request_id_var.get()
     
-    # 获取策略
-    if request.policy_version:
-        policy = db.query(ICERPolicy).filter(
-            ICERPolicy.version == request.policy_version,
-            ICERPolicy.is_active == True
-        ).first()
-    else:
-        # 使用默认策略
-        policy = db.query(ICERPolicy).filter(
-            ICERPolicy.is_default == True,
-            ICERPolicy.is_active == True
-        ).first()
-    
-    if not policy:
-        raise NotFoundException("ICER Policy", request.policy_version or "default")
+    policy = _get_active_policy(db, request.policy_version)
     
     # 计算ICER值
     icer_value = request.intervention_cost / request.intervention_effectiveness
@@ -176,18 +228,48 @@ async def evaluate_icer(
     
     return ICEREvaluationCreateResponse(
         request_id=request_id,
-        data=ICEREvaluationResponse.from_orm(evaluation)
+        data=ICEREvaluationResponse.from_row(evaluation)
+    )
+
+@router.post("/evaluate:batch", response_model=ICERBatchEvaluationResponse)
+def evaluate_icer_batch(
+    request: ICERBatchEvaluationRequest,
+    db: Session = Depends(get_database)
+):
+    """批量ICER评估（只计算不保存评估记录，用于候选方案筛选）"""
+    request_id = request_id_var.get()
+    
+    policy = _get_active_policy(db, request.policy_version)
+    threshold_used = policy.threshold_per_daly
+    
+    # 整批只查一次策略，逐项计算ICER值与决策
+    icer_values = [
+        cost / effectiveness
+        for cost, effectiveness in zip(request.intervention_costs, request.intervention_effectiveness)
+    ]
+    decisions = [
+        "cost_effective" if icer_value <= threshold_used else "not_cost_effective"
+        for icer_value in icer_values
+    ]
+    
+    return ICERBatchEvaluationResponse(
+        request_id=request_id,
+        data=ICERBatchEvaluationResult.model_construct(
+            policy_id=policy.id,
+            threshold_used=threshold_used,
+            icer_values=icer_values,
+            decisions=decisions
+        )
     )
 
 @router.get("/policies/{policy_id}", response_model=ICERPolicyCreateResponse)
-async def get_icer_policy(
+def get_icer_policy(
     policy_id: str = Path(..., description="策略ID"),
     version: Optional[str] = Query(None, description="版本"),
-    db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
+    db: Session = Depends(get_database)
 ):
     """获取ICER策略详情"""
+    request_id = request_id_var.get()
     
     query = db.query(ICERPolicy).filter(ICERPolicy.policy_id == policy_id)
     
@@ -205,5 +287,5 @@ async def get_icer_policy(
     
     return ICERPolicyCreateResponse(
         request_id=request_id,
-        data=ICERPolicyResponse.from_orm(policy)
-    )
\ No newline at end of file
+        data=ICERPolicyResponse.from_row(policy)
+    )
@@ -3,10 +3,9 @@ HealthLink Gateway API 干预管理路由
 """
 import uuid
 from typing import List, Optional
-from datetime import datetime
 
 from fastapi import APIRouter, Depends, Query, Path
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 
 from config.database_switch import get_database
 from packages.schemas.models import Intervention, Patient, Screening
@@ -20,21 +19,25 @@ from packages.schemas.responses import (
     InterventionCreateResponse, 
     InterventionListResponse,
     InterventionApprovalResponse,
-    PaginationMeta
+    current_time
 )
-from ..middleware import get_current_user, get_request_id
+from packages.schemas import _fast
+from packages.schemas._fast import MsgspecJSONResponse
+from ..dependencies import get_current_user, request_id_var
+from ..pagination import keyset_page
 from ..exceptions import NotFoundException
+from ..ids import require_uuid
 
 router = APIRouter()
 
 @router.post("/", response_model=InterventionCreateResponse)
-async def create_intervention(
+def create_intervention(
     request: InterventionCreateRequest,
     db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
+    current_user: dict = Depends(get_current_user)
 ):
     """创建干预记录"""
+    request_id = request_id_var.get()
     
     # 验证患者存在
     patient = db.query(Patient).filter(
@@ -69,7 +72,7 @@ async def create_intervention(
     
     if request.auto_approve:
         intervention.approved_by = current_user.get("user_id", "system")
-        intervention.approved_at = datetime.now()
+        intervention.approved_at = current_time()
     
     db.add(intervention)
     db.commit()
@@ -77,35 +80,35 @@ async def create_intervention(
     
     return InterventionCreateResponse(
         request_id=request_id,
-        data=InterventionResponse.from_orm(intervention)
+        data=InterventionResponse.from_row(intervention)
     )
 
 @router.get("/", response_model=InterventionListResponse)
-async def list_interventions(
+def list_interventions(
     page: int = Query(1, ge=1, description="页码"),
     size: int = Query(20, ge=1, le=100, description="每页大小"),
     patient_id: Optional[str] = Query(None, description="患者ID筛选"),
     intervention_type: Optional[str] = Query(None, description="干预类型筛选"),
     approval_status: Optional[str] = Query(None, description="审批状态筛选"),
     execution_status: Optional[str] = Query(None, description="执行状态筛选"),
-    db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
+    cursor: Optional[str] = Query(None, description="分页游标（按创建时间倒序键集分页，首页传空字符串）"),
+    db: Session = Depends(get_database)
 ):
     """查询干预列表"""
+    request_id = request_id_var.get()
     
-    query = db.query(Intervention)
+    # 列表不返回干预计划等大字段，不加载对应列
+    query = db.query(Intervention).options(
+        defer(Intervention.intervention_plan, raiseload=True),
+        defer(Intervention.assigned_resources, raiseload=True),
+        defer(Intervention.expected_outcome, raiseload=True)
+    )
     
     if patient_id:
-        patient = db.query(Patient).filter(Patient.patient_id == patient_id).first()
-        if patient:
-            query = query.filter(Intervention.patient_id == patient.id)
-        else:
-            return InterventionListResponse(
-                request_id=request_id,
-                data=[],
-                meta=PaginationMeta(page=page, size=size, total=0, pages=0, has_next=False, has_prev=False)
-            )
+        # 关联患者表按业务ID筛选，患者不存在时结果为空
+        query = query.join(Patient, Intervention.patient_id == Patient.id).filter(
+            Patient.patient_id == patient_id
+        )
     
     if intervention_type:
         query = query.filter(Intervention.intervention_type == intervention_type)
@@ -116,6 +119,22 @@ async def list_interventions(
     if execution_status:
         query = query.filter(Intervention.execution_status == execution_status)
     
+    # 游标分页：不统计总数，不使用OFFSET
+    if cursor is not None:
+        rows, next_cursor = keyset_page(query, Intervention, cursor, size)
+        return MsgspecJSONResponse(_fast.ListResponse(
+            request_id=request_id,
+            data=[_fast.InterventionSummaryResponse.from_orm(row) for row in rows],
+            meta=_fast.PaginationMeta(
+                size=size,
+                total=None,
+                pages=None,
+                has_next=next_cursor is not None,
+                has_prev=bool(cursor),
+                next_cursor=next_cursor
+            )
+        ))
+    
     # 按创建时间倒序排列
     query = query.order_by(Intervention.created_at.desc())
     
@@ -128,10 +147,10 @@ async def list_interventions(
     has_next = page < pages
     has_prev = page > 1
     
-    return InterventionListResponse(
+    return MsgspecJSONResponse(_fast.ListResponse(
         request_id=request_id,
-        data=[InterventionResponse.from_orm(intervention) for intervention in interventions],
-        meta=PaginationMeta(
+        data=[_fast.InterventionSummaryResponse.from_orm(intervention) for intervention in interventions],
+        meta=_fast.PaginationMeta(
             page=page,
             size=size,
             total=total,
@@ -139,18 +158,18 @@ async def list_interventions(
             has_next=has_next,
             has_prev=has_prev
         )
-    )
+    ))
 
 @router.post("/{intervention_id}:approve", response_model=InterventionApprovalResponse)
-async def approve_intervention(
+def approve_intervention(
     intervention_id: str = Path(..., description="干预ID"),
     request: InterventionApprovalRequest = ...,
-    db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
+    db: Session = Depends(get_database)
 ):
     """审批干预"""
+    request_id = request_id_var.get()
     
+    require_uuid(intervention_id, "intervention_id")
     intervention = db.query(Intervention).filter(
         Intervention.intervention_id == intervention_id
     ).first()
@@ -161,7 +180,7 @@ async def approve_intervention(
     # 更新审批信息
     intervention.approval_status = request.approval_status
     intervention.approved_by = request.approved_by
-    intervention.approved_at = datetime.now()
+    intervention.approved_at = current_time()
     intervention.approval_notes = request.approval_notes
     
     # 如果有修改的计划，更新计划
@@ -173,5 +192,5 @@ async def approve_intervention(
     
     return InterventionApprovalResponse(
         request_id=request_id,
-        data=InterventionResponse.from_orm(intervention)
+        data=InterventionResponse.from_row(intervention)
     )
\ No newline at end of file
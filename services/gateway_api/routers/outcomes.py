@@ -6,52 +6,50 @@ from typing import List, Optional
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, Query, Path
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from config.database_switch import get_database
-from packages.schemas.models import Outcome, Patient, Intervention
+from config.database_switch import get_database, outcome_write_behind_enabled, enqueue_outcome
+from packages.schemas.models import Outcome, Patient, Intervention, utc_now
 from packages.schemas.requests import OutcomeCreateRequest
 from packages.schemas.responses import (
     OutcomeResponse, 
     OutcomeCreateResponse, 
-    OutcomeListResponse,
-    PaginationMeta
+    OutcomeListResponse
 )
-from ..middleware import get_current_user, get_request_id
+from packages.schemas import _fast
+from ..dependencies import get_current_user, request_id_var
 from ..exceptions import NotFoundException
+from ..ids import require_uuid
+from ..streaming import stream_page, cached_page
+from ..response_cache import list_cache, make_key
 
 router = APIRouter()
 
-@router.post("/", response_model=OutcomeCreateResponse)
-async def create_outcome(
-    request: OutcomeCreateRequest,
-    db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
-):
-    """创建效果记录"""
+def _outcome_values(db: Session, request: OutcomeCreateRequest) -> dict:
+    """校验关联记录并生成效果记录字段"""
+    # 验证患者存在（只取内部ID）
+    patient_pk = db.execute(
+        select(Patient.id).where(Patient.patient_id == request.patient_id)
+    ).scalar_one_or_none()
     
-    # 验证患者存在
-    patient = db.query(Patient).filter(
-        Patient.patient_id == request.patient_id
-    ).first()
-    
-    if not patient:
+    if patient_pk is None:
         raise NotFoundException("Patient", request.patient_id)
     
     # 验证干预记录（如果提供）
     intervention_id = None
     if request.intervention_id:
-        intervention = db.query(Intervention).filter(
-            Intervention.intervention_id == request.intervention_id
-        ).first()
-        if intervention:
-            intervention_id = intervention.id
-    
-    # 创建效果记录
-    outcome = Outcome(
+        require_uuid(request.intervention_id, "intervention_id")
+        intervention_id = db.execute(
+            select(Intervention.id).where(Intervention.intervention_id == request.intervention_id)
+        ).scalar_one_or_none()
+        if intervention_id is None:
+            raise NotFoundException("Intervention", request.intervention_id)
+    
+    return dict(
         outcome_id=str(uuid.uuid4()),
-        patient_id=patient.id,
+        patient_id=patient_pk,
         intervention_id=intervention_id,
         followup_day=request.followup_day,
         measurement_date=request.measurement_date,
@@ -68,14 +66,46 @@ async def create_outcome(
         data_source=request.data_source,
         measurement_metadata=request.measurement_metadata
     )
+
+def _insert_outcome(db: Session, values: dict) -> OutcomeResponse:
+    """同步写入效果记录"""
+    outcome = Outcome(**values)
     
     db.add(outcome)
+    # flush后主键与时间戳已在对象上，提交前构建响应，避免提交后过期属性被重新查询
+    db.flush()
+    data = OutcomeResponse.from_row(outcome)
     db.commit()
-    db.refresh(outcome)
+    list_cache.invalidate("outcomes")
+    return data
+
+@router.post("/", response_model=OutcomeCreateResponse)
+async def create_outcome(
+    request: OutcomeCreateRequest,
+    db: Session = Depends(get_database)
+):
+    """创建效果记录"""
+    request_id = request_id_var.get()
+    
+    # 数据库操作放到线程池，事件循环内只做延迟写入入队（写入队列属于事件循环）
+    values = await run_in_threadpool(_outcome_values, db, request)
+    
+    # 延迟写入：入队后直接返回，由后台任务批量落库（队列已满时退回同步写入）
+    if outcome_write_behind_enabled():
+        # 与模型默认值一致使用UTC时间
+        now = utc_now()
+        record = dict(values, created_at=now, updated_at=now)
+        if enqueue_outcome(record):
+            return OutcomeCreateResponse(
+                request_id=request_id,
+                data=OutcomeResponse.model_construct(id=None, **record)
+            )
+    
+    data = await run_in_threadpool(_insert_outcome, db, values)
     
     return OutcomeCreateResponse(
         request_id=request_id,
-        data=OutcomeResponse.from_orm(outcome)
+        data=data
     )
 
 @router.get("/", response_model=OutcomeListResponse)
@@ -87,58 +117,53 @@ async def list_outcomes(
     followup_day_min: Optional[int] = Query(None, ge=0, description="随访天数最小值"),
     followup_day_max: Optional[int] = Query(None, ge=0, description="随访天数最大值"),
     db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
+    current_user: dict = Depends(get_current_user)
 ):
     """查询效果列表"""
+    request_id = request_id_var.get()
+    
+    cache_key = make_key(
+        "outcomes", page=page, size=size, patient_id=patient_id,
+        intervention_id=intervention_id, followup_day_min=followup_day_min,
+        followup_day_max=followup_day_max, scope=current_user.get('organization_id')
+    )
+    cached = cached_page("outcomes", cache_key, request_id)
+    if cached is not None:
+        return cached
     
-    query = db.query(Outcome)
+    # lambda_stmt 按筛选组合缓存语句构建与SQL编译结果，筛选值作为绑定参数
+    stmt = lambda_stmt(lambda: select(Outcome))
     
     if patient_id:
-        patient = db.query(Patient).filter(Patient.patient_id == patient_id).first()
-        if patient:
-            query = query.filter(Outcome.patient_id == patient.id)
-        else:
-            return OutcomeListResponse(
-                request_id=request_id,
-                data=[],
-                meta=PaginationMeta(page=page, size=size, total=0, pages=0, has_next=False, has_prev=False)
-            )
+        # 关联患者表按业务ID筛选，患者不存在时结果为空
+        stmt += lambda s: s.join(Patient, Outcome.patient_id == Patient.id).where(
+            Patient.patient_id == patient_id
+        )
     
     if intervention_id:
-        intervention = db.query(Intervention).filter(
-            Intervention.intervention_id == intervention_id
-        ).first()
-        if intervention:
-            query = query.filter(Outcome.intervention_id == intervention.id)
+        intervention_pk = db.execute(
+            select(Intervention.id).where(Intervention.intervention_id == intervention_id)
+        ).scalar_one_or_none()
+        if intervention_pk is not None:
+            stmt += lambda s: s.where(Outcome.intervention_id == intervention_pk)
     
     if followup_day_min is not None:
-        query = query.filter(Outcome.followup_day >= followup_day_min)
+        stmt += lambda s: s.where(Outcome.followup_day >= followup_day_min)
     
     if followup_day_max is not None:
-        query = query.filter(Outcome.followup_day <= followup_day_max)
+        stmt += lambda s: s.where(Outcome.followup_day <= followup_day_max)
     
     # 按测量日期倒序排列
-    query = query.order_by(Outcome.measurement_date.desc())
-    
-    # 分页
-    total = query.count()
-    offset = (page - 1) * size
-    outcomes = query.offset(offset).limit(size).all()
+    stmt += lambda s: s.order_by(Outcome.measurement_date.desc())
     
-    pages = (total + size - 1) // size
-    has_next = page < pages
-    has_prev = page > 1
-    
-    return OutcomeListResponse(
+    # 分页（窗口函数随结果一并返回总数），逐批流式输出
+    return await stream_page(
+        db,
+        stmt,
+        _fast.OutcomeResponse,
+        page=page,
+        size=size,
         request_id=request_id,
-        data=[OutcomeResponse.from_orm(outcome) for outcome in outcomes],
-        meta=PaginationMeta(
-            page=page,
-            size=size,
-            total=total,
-            pages=pages,
-            has_next=has_next,
-            has_prev=has_prev
-        )
-    )
\ No newline at end of file
+        cache_route="outcomes",
+        cache_key=cache_key
+    )
@@ -6,35 +6,39 @@ from typing import List, Optional
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, defer
+from sqlalchemy import and_, or_, insert, select
 
 from config.database_switch import get_database
 from packages.schemas.models import Patient
 from packages.schemas.requests import (
     PatientCreateRequest, 
+    PatientBatchCreateRequest,
     PatientUpdateRequest, 
     PatientQueryRequest
 )
 from packages.schemas.responses import (
     PatientResponse, 
     PatientCreateResponse, 
-    PatientListResponse,
-    PaginationMeta
+    PatientCreatedItem,
+    PatientBatchCreateResponse,
+    PatientListResponse
 )
-from ..middleware import get_current_user, get_request_id
-from ..exceptions import NotFoundException, ConflictException
+from packages.schemas import _fast
+from packages.schemas._fast import MsgspecJSONResponse
+from ..dependencies import request_id_var
+from ..pagination import keyset_page
+from ..exceptions import NotFoundException, ConflictException, ValidationException
 
 router = APIRouter()
 
 @router.post("/", response_model=PatientCreateResponse)
-async def create_patient(
+def create_patient(
     request: PatientCreateRequest,
-    db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
+    db: Session = Depends(get_database)
 ):
     """创建患者"""
+    request_id = request_id_var.get()
     
     # 检查患者ID是否已存在
     existing_patient = db.query(Patient).filter(
@@ -66,11 +70,63 @@ async def create_patient(
     
     return PatientCreateResponse(
         request_id=request_id,
-        data=PatientResponse.from_orm(patient)
+        data=PatientResponse.from_row(patient)
+    )
+
+@router.post("/batch", response_model=PatientBatchCreateResponse)
+def create_patients_batch(
+    request: PatientBatchCreateRequest,
+    db: Session = Depends(get_database)
+):
+    """批量创建患者（单条INSERT语句写入，只返回ID）"""
+    request_id = request_id_var.get()
+    
+    # 一次查询检查已存在的患者ID
+    patient_ids = [p.patient_id for p in request.patients]
+    existing = db.scalars(
+        select(Patient.patient_id).where(Patient.patient_id.in_(patient_ids))
+    ).all()
+    if existing:
+        raise ConflictException(
+            message=f"Patients already exist: {', '.join(sorted(existing))}",
+            resource="patient"
+        )
+    
+    rows = [
+        {
+            "patient_id": p.patient_id,
+            "name": p.name,
+            "gender": p.gender,
+            "birth_date": p.birth_date,
+            "phone": p.phone,
+            "email": p.email,
+            "medical_record_number": p.medical_record_number,
+            "primary_doctor_id": p.primary_doctor_id,
+            "metadata_json": p.metadata
+        }
+        for p in request.patients
+    ]
+    if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        created = db.execute(
+            insert(Patient).returning(Patient.id, Patient.patient_id, sort_by_parameter_order=True),
+            rows
+        ).all()
+        ids = {row.patient_id: row.id for row in created}
+    else:
+        # MySQL 不支持 INSERT ... RETURNING：批量插入后按唯一的业务ID一次查回自增主键
+        db.execute(insert(Patient), rows)
+        ids = dict(db.execute(
+            select(Patient.patient_id, Patient.id).where(Patient.patient_id.in_(patient_ids))
+        ).all())
+    db.commit()
+    
+    return PatientBatchCreateResponse(
+        request_id=request_id,
+        data=[PatientCreatedItem.model_construct(id=ids[pid], patient_id=pid) for pid in patient_ids]
     )
 
 @router.get("/", response_model=PatientListResponse)
-async def list_patients(
+def list_patients(
     page: int = Query(1, ge=1, description="页码"),
     size: int = Query(20, ge=1, le=100, description="每页大小"),
     patient_id: Optional[str] = Query(None, description="患者ID筛选"),
@@ -81,14 +137,15 @@ async def list_patients(
     created_before: Optional[datetime] = Query(None, description="创建时间结束"),
     sort_by: Optional[str] = Query("created_at", description="排序字段"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$", description="排序方向"),
-    db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
+    cursor: Optional[str] = Query(None, description="分页游标（按创建时间倒序键集分页，首页传空字符串）"),
+    db: Session = Depends(get_database)
 ):
     """查询患者列表"""
+    request_id = request_id_var.get()
     
     # 构建查询条件
-    query = db.query(Patient)
+    # 列表不返回扩展元数据，不加载该JSON列
+    query = db.query(Patient).options(defer(Patient.metadata_json, raiseload=True))
     
     if patient_id:
         query = query.filter(Patient.patient_id.ilike(f"%{patient_id}%"))
@@ -108,6 +165,24 @@ async def list_patients(
     if created_before:
         query = query.filter(Patient.created_at <= created_before)
     
+    # 游标分页：不统计总数，不使用OFFSET，仅支持创建时间倒序
+    if cursor is not None:
+        if sort_by != "created_at" or sort_order != "desc":
+            raise ValidationException("cursor pagination requires created_at desc ordering", "cursor")
+        rows, next_cursor = keyset_page(query, Patient, cursor, size)
+        return MsgspecJSONResponse(_fast.ListResponse(
+            request_id=request_id,
+            data=[_fast.PatientSummaryResponse.from_orm(row) for row in rows],
+            meta=_fast.PaginationMeta(
+                size=size,
+                total=None,
+                pages=None,
+                has_next=next_cursor is not None,
+                has_prev=bool(cursor),
+                next_cursor=next_cursor
+            )
+        ))
+    
     # 排序
     if hasattr(Patient, sort_by):
         order_column = getattr(Patient, sort_by)
@@ -126,10 +201,10 @@ async def list_patients(
     has_next = page < pages
     has_prev = page > 1
     
-    return PatientListResponse(
+    return MsgspecJSONResponse(_fast.ListResponse(
         request_id=request_id,
-        data=[PatientResponse.from_orm(patient) for patient in patients],
-        meta=PaginationMeta(
+        data=[_fast.PatientSummaryResponse.from_orm(patient) for patient in patients],
+        meta=_fast.PaginationMeta(
             page=page,
             size=size,
             total=total,
@@ -137,16 +212,15 @@ async def list_patients(
             has_next=has_next,
             has_prev=has_prev
         )
-    )
+    ))
 
 @router.get("/{patient_id}", response_model=PatientCreateResponse)
-async def get_patient(
+def get_patient(
     patient_id: str = Path(..., description="患者ID"),
-    db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
+    db: Session = Depends(get_database)
 ):
     """获取患者详情"""
+    request_id = request_id_var.get()
     
     patient = db.query(Patient).filter(
         Patient.patient_id == patient_id
@@ -157,18 +231,17 @@ async def get_patient(
     
     return PatientCreateResponse(
         request_id=request_id,
-        data=PatientResponse.from_orm(patient)
+        data=PatientResponse.from_row(patient)
     )
 
 @router.put("/{patient_id}", response_model=PatientCreateResponse)
-async def update_patient(
+def update_patient(
     patient_id: str = Path(..., description="患者ID"),
     request: PatientUpdateRequest = ...,
-    db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
+    db: Session = Depends(get_database)
 ):
     """更新患者信息"""
+    request_id = request_id_var.get()
     
     patient = db.query(Patient).filter(
         Patient.patient_id == patient_id
@@ -190,17 +263,16 @@ async def update_patient(
     
     return PatientCreateResponse(
         request_id=request_id,
-        data=PatientResponse.from_orm(patient)
+        data=PatientResponse.from_row(patient)
     )
 
 @router.delete("/{patient_id}")
-async def delete_patient(
+def delete_patient(
     patient_id: str = Path(..., description="患者ID"),
-    db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
+    db: Session = Depends(get_database)
 ):
     """删除患者（软删除）"""
+    request_id = request_id_var.get()
     
     patient = db.query(Patient).filter(
         Patient.patient_id == patient_id
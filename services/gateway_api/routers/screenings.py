@@ -3,12 +3,13 @@ HealthLink Gateway API 筛查管理路由
 """
 import uuid
 from typing import List, Optional
-from datetime import datetime
 
 from fastapi import APIRouter, Depends, Query, Path
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from config.database_switch import get_database
+from config.model_switch import build_keyword_automaton
 from packages.schemas.models import Screening, Patient
 from packages.schemas.requests import ScreeningCreateRequest, ScreeningTriageRequest
 from packages.schemas.responses import (
@@ -16,34 +17,44 @@ from packages.schemas.responses import (
     ScreeningCreateResponse, 
     ScreeningListResponse,
     ScreeningTriageResponse,
-    PaginationMeta
+    current_time
 )
-from ..middleware import get_current_user, get_request_id
+from packages.schemas import _fast
+from ..dependencies import get_current_user, request_id_var
 from ..exceptions import NotFoundException
+from ..ids import require_uuid
+from ..streaming import stream_page, cached_page
+from ..response_cache import list_cache, make_key
 
 router = APIRouter()
 
+# 分诊关键词自动机（MVP阶段的简化分诊逻辑，模块加载时构建一次）
+_TRIAGE_AC = build_keyword_automaton(
+    [(keyword, "high") for keyword in ("胸痛", "呼吸困难", "心悸", "昏厥")]
+    + [(keyword, "medium") for keyword in ("头晕", "乏力", "水肿")]
+)
+_TRIAGE_SCORES = {"high": 0.8, "medium": 0.6, "low": 0.3}
+
 @router.post("/", response_model=ScreeningCreateResponse)
-async def create_screening(
+def create_screening(
     request: ScreeningCreateRequest,
-    db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
+    db: Session = Depends(get_database)
 ):
     """创建筛查记录"""
+    request_id = request_id_var.get()
     
-    # 验证患者存在
-    patient = db.query(Patient).filter(
-        Patient.patient_id == request.patient_id
-    ).first()
+    # 验证患者存在（只取内部ID）
+    patient_pk = db.execute(
+        select(Patient.id).where(Patient.patient_id == request.patient_id)
+    ).scalar_one_or_none()
     
-    if not patient:
+    if patient_pk is None:
         raise NotFoundException("Patient", request.patient_id)
     
     # 创建筛查记录
     screening = Screening(
         screening_id=str(uuid.uuid4()),
-        patient_id=patient.id,
+        patient_id=patient_pk,
         input_text=request.input_text,
         input_metadata=request.input_metadata,
         status="pending"
@@ -56,12 +67,15 @@ async def create_screening(
         screening.input_audio_path = f"audio/{screening.screening_id}.wav"
     
     db.add(screening)
+    # flush后主键与时间戳已在对象上，提交前构建响应，避免提交后过期属性被重新查询
+    db.flush()
+    data = ScreeningResponse.from_row(screening)
     db.commit()
-    db.refresh(screening)
+    list_cache.invalidate("screenings")
     
     return ScreeningCreateResponse(
         request_id=request_id,
-        data=ScreeningResponse.from_orm(screening)
+        data=data
     )
 
 @router.get("/", response_model=ScreeningListResponse)
@@ -72,67 +86,59 @@ async def list_screenings(
     status: Optional[str] = Query(None, description="状态筛选"),
     triage_level: Optional[str] = Query(None, description="分诊级别筛选"),
     db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
+    current_user: dict = Depends(get_current_user)
 ):
     """查询筛查列表"""
+    request_id = request_id_var.get()
+    
+    cache_key = make_key(
+        "screenings", page=page, size=size, patient_id=patient_id, status=status,
+        triage_level=triage_level, scope=current_user.get('organization_id')
+    )
+    cached = cached_page("screenings", cache_key, request_id)
+    if cached is not None:
+        return cached
     
-    query = db.query(Screening)
+    # lambda_stmt 按筛选组合缓存语句构建与SQL编译结果，筛选值作为绑定参数
+    stmt = lambda_stmt(lambda: select(Screening))
     
     if patient_id:
-        # 通过患者ID查找
-        patient = db.query(Patient).filter(Patient.patient_id == patient_id).first()
-        if patient:
-            query = query.filter(Screening.patient_id == patient.id)
-        else:
-            # 患者不存在，返回空结果
-            return ScreeningListResponse(
-                request_id=request_id,
-                data=[],
-                meta=PaginationMeta(page=page, size=size, total=0, pages=0, has_next=False, has_prev=False)
-            )
+        # 关联患者表按业务ID筛选，患者不存在时结果为空
+        stmt += lambda s: s.join(Patient, Screening.patient_id == Patient.id).where(
+            Patient.patient_id == patient_id
+        )
     
     if status:
-        query = query.filter(Screening.status == status)
+        stmt += lambda s: s.where(Screening.status == status)
     
     if triage_level:
-        query = query.filter(Screening.triage_level == triage_level)
+        stmt += lambda s: s.where(Screening.triage_level == triage_level)
     
     # 按创建时间倒序排列
-    query = query.order_by(Screening.created_at.desc())
-    
-    # 分页
-    total = query.count()
-    offset = (page - 1) * size
-    screenings = query.offset(offset).limit(size).all()
-    
-    pages = (total + size - 1) // size
-    has_next = page < pages
-    has_prev = page > 1
-    
-    return ScreeningListResponse(
+    stmt += lambda s: s.order_by(Screening.created_at.desc())
+    
+    # 分页（窗口函数随结果一并返回总数），逐批流式输出
+    return await stream_page(
+        db,
+        stmt,
+        _fast.ScreeningResponse,
+        page=page,
+        size=size,
         request_id=request_id,
-        data=[ScreeningResponse.from_orm(screening) for screening in screenings],
-        meta=PaginationMeta(
-            page=page,
-            size=size,
-            total=total,
-            pages=pages,
-            has_next=has_next,
-            has_prev=has_prev
-        )
+        cache_route="screenings",
+        cache_key=cache_key
     )
 
 @router.post("/{screening_id}:triage", response_model=ScreeningTriageResponse)
-async def triage_screening(
+def triage_screening(
     screening_id: str = Path(..., description="筛查ID"),
     request: ScreeningTriageRequest = ...,
-    db: Session = Depends(get_database),
-    current_user: dict = Depends(get_current_user),
-    request_id: str = Depends(get_request_id)
+    db: Session = Depends(get_database)
 ):
     """执行筛查分诊"""
+    request_id = request_id_var.get()
     
+    require_uuid(screening_id, "screening_id")
     screening = db.query(Screening).filter(
         Screening.screening_id == screening_id
     ).first()
@@ -147,32 +153,26 @@ async def triage_screening(
     else:
         # 这里应该调用NLP/ASR服务进行自动分诊
         # MVP阶段使用简化逻辑
+        # 简单的关键词匹配逻辑：单次扫描文本，命中高危关键词即停止
+        level = "low"
         if screening.input_text:
-            # 简单的关键词匹配逻辑
-            high_risk_keywords = ["胸痛", "呼吸困难", "心悸", "昏厥"]
-            medium_risk_keywords = ["头晕", "乏力", "水肿"]
-            
-            text = screening.input_text.lower()
-            if any(keyword in text for keyword in high_risk_keywords):
-                screening.triage_level = "high"
-                screening.triage_score = 0.8
-            elif any(keyword in text for keyword in medium_risk_keywords):
-                screening.triage_level = "medium"
-                screening.triage_score = 0.6
-            else:
-                screening.triage_level = "low"
-                screening.triage_score = 0.3
-        else:
-            screening.triage_level = "low"
-            screening.triage_score = 0.3
+            for _, hit_levels in _TRIAGE_AC.iter(screening.input_text):
+                if "high" in hit_levels:
+                    level = "high"
+                    break
+                level = hit_levels[-1]
+        screening.triage_level = level
+        screening.triage_score = _TRIAGE_SCORES[level]
     
     screening.status = "completed"
-    screening.processed_at = datetime.now()
+    screening.processed_at = current_time()
     
+    db.flush()
+    data = ScreeningResponse.from_row(screening)
     db.commit()
-    db.refresh(screening)
+    list_cache.invalidate("screenings")
     
     return ScreeningTriageResponse(
         request_id=request_id,
-        data=ScreeningResponse.from_orm(screening)
+        data=data
     )
\ No newline at end of file
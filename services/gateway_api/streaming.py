@@ -0,0 +1,107 @@
+"""
+HealthLink Gateway API 分页列表流式输出
+按批从数据库游标读取行并直接编码输出，不在内存中构建完整列表
+"""
+from typing import Optional, Type
+
+
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import StatementLambdaElement
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+
+from packages.schemas import _fast
+from .response_cache import list_cache
+
+# 每批从游标读取并写出的行数
+STREAM_BATCH_SIZE = 64
+
+def _list_head(request_id: Optional[str]) -> bytes:
+    """列表响应头部：请求ID与时间戳在处理函数内确定，去掉结尾的 } 后接 data 数组"""
+    return _fast.encode(_fast.ListHeader(request_id=request_id))[:-1] + b',"data":['
+
+def cached_page(cache_route: str, cache_key: bytes, request_id: Optional[str]) -> Optional[Response]:
+    """命中列表缓存时直接返回，头部按本次请求重新生成"""
+    cached = list_cache.get(cache_route, cache_key)
+    if cached is None:
+        return None
+    return Response(content=_list_head(request_id) + cached, media_type="application/json")
+
+async def stream_page(
+    db: Session,
+    stmt: StatementLambdaElement,
+    struct: Type[_fast.Struct],
+    *,
+    page: int,
+    size: int,
+    request_id: Optional[str],
+    cache_route: Optional[str] = None,
+    cache_key: Optional[bytes] = None
+) -> StreamingResponse:
+    """流式输出分页列表，结构与 _fast.ListResponse 一致（meta 位于 data 之后）
+
+    stmt 为 lambda_stmt 构建的单实体查询（已含筛选与排序），分页条件在此追加；
+    依赖注入的会话在响应发送前即被关闭，流式读取改用同一引擎上的独立会话；
+    首批行在返回响应前于线程池中读取，查询出错时按普通异常返回500，
+    其余批次由同步生成器读取（Starlette 在线程池中迭代），结束时关闭会话；
+    给出 cache_key 时，完整输出后将 data 与 meta 部分写入列表缓存
+    """
+    offset = (page - 1) * size
+    page_stmt = stmt + (
+        lambda s: s.add_columns(func.count().over().label("total")).offset(offset).limit(size)
+    )
+    head = _list_head(request_id)
+    generation = list_cache.generation(cache_route) if cache_key else 0
+    stream_db = Session(bind=db.get_bind())
+
+    def first_batch():
+        result = stream_db.execute(page_stmt, execution_options={"yield_per": STREAM_BATCH_SIZE})
+        return result, result.fetchmany(STREAM_BATCH_SIZE)
+
+    try:
+        result, rows = await run_in_threadpool(first_batch)
+    except BaseException:
+        stream_db.close()
+        raise
+
+    def body():
+        parts = [] if cache_key else None
+        try:
+            yield head
+            total = rows[0].total if rows else None
+            batch = rows
+            prefix = b""
+            while batch:
+                data = prefix + b",".join(_fast.encode(struct.from_orm(row[0])) for row in batch)
+                if parts is not None:
+                    parts.append(data)
+                yield data
+                prefix = b","
+                batch = result.fetchmany(STREAM_BATCH_SIZE)
+
+            if total is None:
+                # 超出末页时窗口函数无行可返回，单独计数
+                total = stream_db.scalar(stmt + (
+                    lambda s: s.with_only_columns(func.count(), maintain_column_froms=True).order_by(None)
+                )) if offset else 0
+            pages = (total + size - 1) // size
+            meta = _fast.PaginationMeta(
+                page=page,
+                size=size,
+                total=total,
+                pages=pages,
+                has_next=page < pages,
+                has_prev=page > 1
+            )
+            tail = b'],"meta":' + _fast.encode(meta) + b"}"
+            if parts is not None:
+                parts.append(tail)
+                list_cache.set(cache_route, cache_key, b"".join(parts), generation)
+            yield tail
+        finally:
+            stream_db.close()
+
+    # 客户端提前断开时生成器可能未执行到 finally，响应结束后再关闭一次会话
+    return StreamingResponse(body(), media_type="application/json", background=BackgroundTask(stream_db.close))
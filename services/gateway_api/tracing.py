@@ -0,0 +1,58 @@
+"""
+HealthLink Gateway API 链路追踪
+OpenTelemetry 为可选依赖（pip install healthlink[tracing]），未安装时各函数均为空操作
+"""
+import os
+from typing import Any, Dict
+
+from fastapi import FastAPI
+
+try:
+    from opentelemetry import trace
+except ImportError:  # 未安装opentelemetry时不记录追踪上下文
+    trace = None
+
+def add_otel_context(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """structlog处理器：写入当前span的trace_id/span_id"""
+    if trace is None:
+        return event_dict
+    ctx = trace.get_current_span().get_span_context()
+    if ctx.is_valid:
+        event_dict["trace_id"] = format(ctx.trace_id, "032x")
+        event_dict["span_id"] = format(ctx.span_id, "016x")
+    return event_dict
+
+def setup_tracing(app: FastAPI) -> bool:
+    """初始化TracerProvider并为FastAPI应用埋点，导出端点通过OTEL_*环境变量配置"""
+    if trace is None:
+        return False
+    try:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": os.getenv("OTEL_SERVICE_NAME", "healthlink-gateway")})
+    )
+
+    # 未配置导出端点时仅生成span，用于日志关联
+    if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT") or os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT"):
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+
+    trace.set_tracer_provider(provider)
+    FastAPIInstrumentor.instrument_app(app)
+    return True
+
+def instrument_engine(engine) -> None:
+    """为SQLAlchemy引擎埋点"""
+    if trace is None:
+        return
+    try:
+        from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+    except ImportError:
+        return
+    SQLAlchemyInstrumentor().instrument(engine=engine)
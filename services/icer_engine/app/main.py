@@ -4,6 +4,7 @@ ICER Engine 主应用
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from .routers import evaluate
 
 APP_VERSION = "1.0.0"
@@ -16,7 +17,8 @@ app = FastAPI(
     version=APP_VERSION,
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 # 添加CORS中间件
@@ -3,33 +3,100 @@ ICER Engine 评估路由
 提供ICER/INB评估和策略查询功能
 """
 import os
+import functools
 import json
 import math
+import threading
 import time
-import random
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, status
+import numpy as np
+import orjson
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
 from ..schemas.icer import EvaluateRequest, EvaluateResult, PolicyResponse
 
 router = APIRouter(tags=["icer"])
 
+# 蒙特卡洛抽样的随机数生成器（Generator 内部加锁，可在线程池中共用）
+_rng = np.random.default_rng()
+
+# 对偶抽样最多生成的噪声行数（请求模型限定抽样次数不超过10000）
+_MAX_SAMPLE_ROWS = 5000
+
+# 抽样缓冲区按线程预分配，线程池中的各工作线程各用一份；
+# 结果只是接受概率，单精度足够，内存与计算量减半
+_buffers = threading.local()
+
+def _sample_buffer() -> np.ndarray:
+    """当前线程的抽样缓冲区"""
+    buffer = getattr(_buffers, "noise", None)
+    if buffer is None:
+        buffer = _buffers.noise = np.empty((_MAX_SAMPLE_ROWS, 4), dtype=np.float32)
+    return buffer
+
+# 策略文件路径
+POLICY_PATH = Path(__file__).parent.parent.parent.parent.parent / "packages" / "policies" / "icer" / "2025-08.json"
+
+@functools.lru_cache(maxsize=4)
+def _read_policy(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """读取并解析策略文件（按修改时间缓存，文件更新后自动重新读取；返回值只读）"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+# 支配性判断的浮点容差
+_DOMINANCE_EPS = 1e-10
+
+# (增量成本符号, 增量效果符号) -> (支配关系, 决策)；决策为 None 时需计算ICER
+_DOMINANCE_TABLE: Dict[Tuple[int, int], Tuple[str, Optional[str]]] = {
+    # 干预组成本更低且效果更好（或相等）
+    (-1, 1): ("simple", "accept"),
+    (-1, 0): ("simple", "accept"),
+    (0, 1): ("simple", "accept"),
+    # 干预组成本更高且效果更差（或相等）
+    (1, -1): ("simple", "reject"),
+    (1, 0): ("simple", "reject"),
+    (0, -1): ("simple", "reject"),
+    # 无简单支配关系
+    (1, 1): ("none", None),
+    (-1, -1): ("none", None),
+    (0, 0): ("none", None),
+}
+
+def _sign(value: float) -> int:
+    """容差内视为0的符号"""
+    if value > _DOMINANCE_EPS:
+        return 1
+    if value < -_DOMINANCE_EPS:
+        return -1
+    return 0
+
+# 评估时间精确到秒，同一秒内复用格式化结果：(秒, 时间文本)
+_timestamp_cache: Tuple[int, str] = (-1, "")
+
+def _utc_timestamp() -> str:
+    """当前UTC时间文本（ISO 8601，精确到秒）"""
+    global _timestamp_cache
+    now = int(time.time())
+    cached = _timestamp_cache
+    if cached[0] != now:
+        cached = (now, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)))
+        _timestamp_cache = cached
+    return cached[1]
+
 def load_policy() -> Dict[str, Any]:
     """加载ICER策略文件"""
-    # 构建策略文件路径
-    current_file = Path(__file__)
-    policy_path = current_file.parent.parent.parent.parent.parent / "packages" / "policies" / "icer" / "2025-08.json"
-    
-    if not policy_path.exists():
+    try:
+        mtime_ns = POLICY_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="ICER policy file not found"
         )
     
     try:
-        with open(policy_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return _read_policy(str(POLICY_PATH), mtime_ns)
     except json.JSONDecodeError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -41,11 +108,19 @@ def load_policy() -> Dict[str, Any]:
             detail=f"Failed to load policy: {str(e)}"
         )
 
+# 已编码的策略响应体：(策略字典, 响应体)；策略文件变化时 load_policy 返回新字典，据此重新编码
+_policy_body_cache: Optional[Tuple[Dict[str, Any], bytes]] = None
+
 @router.get("/icer/policies", response_model=PolicyResponse)
 def get_policies():
     """获取ICER策略信息"""
+    global _policy_body_cache
     policy = load_policy()
-    return PolicyResponse(**policy)
+    cached = _policy_body_cache
+    if cached is None or cached[0] is not policy:
+        cached = (policy, orjson.dumps(PolicyResponse(**policy).model_dump()))
+        _policy_body_cache = cached
+    return Response(content=cached[1], media_type="application/json")
 
 @router.post("/icer/evaluate", response_model=EvaluateResult)
 def evaluate_icer(req: EvaluateRequest):
@@ -72,27 +147,12 @@ def evaluate_icer(req: EvaluateRequest):
     delta_effect = e1 - e0
     
     # 3. 支配性分析
-    dominance = "none"
-    decision = "inconclusive"
+    # 按增量成本/增量效果的符号查表 (使用小的容差处理浮点数比较)
+    dominance, decision = _DOMINANCE_TABLE[(_sign(delta_cost), _sign(delta_effect))]
     icer_value = None
     
-    # 简单支配检查 (使用小的容差处理浮点数比较)
-    eps = 1e-10
-    
-    if (delta_cost <= eps and delta_effect >= -eps) and (delta_cost < -eps or delta_effect > eps):
-        # 干预组成本更低且效果更好（或相等）
-        dominance = "simple"
-        decision = "accept"
-        icer_value = None
-    elif (delta_cost >= -eps and delta_effect <= eps) and (delta_cost > eps or delta_effect < -eps):
-        # 干预组成本更高且效果更差（或相等）
-        dominance = "simple"
-        decision = "reject"
-        icer_value = None
-    else:
+    if decision is None:
         # 无简单支配关系
-        dominance = "none"
-        
         if abs(delta_effect) < 1e-12:
             # 效果差异极小，无法计算ICER
             if delta_cost > 0:
@@ -126,28 +186,48 @@ def evaluate_icer(req: EvaluateRequest):
     uncertainty = req.uncertainty
     
     if uncertainty and uncertainty.samples and uncertainty.samples > 0:
-        accepts = 0
-        samples = min(uncertainty.samples, 5000)  # 限制最大抽样次数
+        se_cost_0 = uncertainty.se_cost_0 or 0.0
+        se_cost_1 = uncertainty.se_cost_1 or 0.0
+        se_eff_0 = uncertainty.se_eff_0 or 0.0
+        se_eff_1 = uncertainty.se_eff_1 or 0.0
+        corr = uncertainty.corr or 0.0
+        # INB = W·(e1 - e0) - (c1 - c0)，两臂独立、臂内成本与效果相关系数为 corr，
+        # INB 的方差含臂内协方差项
+        var = (
+            threshold_value ** 2 * (se_eff_0 ** 2 + se_eff_1 ** 2)
+            + se_cost_0 ** 2 + se_cost_1 ** 2
+            - 2 * threshold_value * corr * (se_cost_0 * se_eff_0 + se_cost_1 * se_eff_1)
+        )
         
-        for _ in range(samples):
-            # 简化的蒙特卡洛抽样
-            # 为成本和效果添加随机噪声
-            noise_c0 = random.gauss(0, uncertainty.se_cost_0 or 0.0)
-            noise_c1 = random.gauss(0, uncertainty.se_cost_1 or 0.0)
-            noise_e0 = random.gauss(0, uncertainty.se_eff_0 or 0.0)
-            noise_e1 = random.gauss(0, uncertainty.se_eff_1 or 0.0)
-            
-            # 计算抽样后的增量值
-            dc_sample = (c1 + noise_c1) - (c0 + noise_c0)
-            de_sample = (e1 + noise_e1) - (e0 + noise_e0)
+        if var <= 0:
+            # 方差为0（标准误全为0或完全相关相互抵消）时 INB 恒等于点估计
+            ceac_prob = 1.0 if net_benefit > 0 else 0.0
+        elif uncertainty.corr is None:
+            # 各项独立时直接按正态分布求 P(INB > 0)，无需抽样
+            ceac_prob = 0.5 * math.erfc(-net_benefit / math.sqrt(2 * var))
+        else:
+            # 给出相关系数时按请求的抽样次数执行蒙特卡洛抽样（上限由请求模型限定）
+            samples = uncertainty.samples
             
-            # 计算抽样后的净效益
-            inb_sample = threshold_value * de_sample - dc_sample
+            # 每行标准正态噪声依次对应 c0, c1, e0, e1；臂内效果噪声按 Cholesky 分解与成本噪声相关：
+            # n_e = se_e·(corr·z_c + √(1-corr²)·z_e)，抽样后的 INB = 点估计 + (n_c0 - n_c1) + W·(n_e1 - n_e0)，
+            # 即噪声在 weights 上的投影
+            resid = math.sqrt(1 - corr ** 2)
+            weights = np.array([
+                se_cost_0 - threshold_value * corr * se_eff_0,
+                threshold_value * corr * se_eff_1 - se_cost_1,
+                -threshold_value * resid * se_eff_0,
+                threshold_value * resid * se_eff_1,
+            ], dtype=np.float32)
+            # 对偶抽样：只生成一半样本，与其相反数配对使用（INB 对噪声线性，配对样本负相关，方差更小）
+            half = (samples + 1) // 2
+            z = _sample_buffer()[:half]
+            _rng.standard_normal(dtype=np.float32, out=z)
+            shift = z @ weights
             
-            if inb_sample > 0:
-                accepts += 1
-        
-        ceac_prob = accepts / float(samples)
+            accepts = np.count_nonzero(shift > -net_benefit)
+            accepts += np.count_nonzero(shift[:samples - half] < net_benefit)
+            ceac_prob = accepts / samples
     
     # 6. 构建假设条件
     assumptions = {
@@ -161,16 +241,16 @@ def evaluate_icer(req: EvaluateRequest):
         assumptions["cost_discount_rate"] = str(req.discount.cost_rate)
         assumptions["effect_discount_rate"] = str(req.discount.effect_rate)
     
-    # 7. 返回结果
-    return EvaluateResult(
-        icer_value=icer_value if dominance == "none" else None,
-        icer_unit=threshold_unit if dominance == "none" and icer_value is not None else None,
-        dominance=dominance,
-        decision=decision,
-        net_benefit=net_benefit,
-        ceac_prob_accept=ceac_prob,
-        policy_version=version,
-        threshold_used=threshold_value,
-        assumptions=assumptions,
-        evaluated_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-    )
\ No newline at end of file
+    # 7. 返回结果（内部计算结果直接输出，不再经响应模型校验；response_model 仅用于接口文档）
+    return ORJSONResponse({
+        "icer_value": icer_value if dominance == "none" else None,
+        "icer_unit": threshold_unit if dominance == "none" and icer_value is not None else None,
+        "dominance": dominance,
+        "decision": decision,
+        "net_benefit": net_benefit,
+        "ceac_prob_accept": ceac_prob,
+        "policy_version": version,
+        "threshold_used": float(threshold_value),
+        "assumptions": assumptions,
+        "evaluated_at": _utc_timestamp()
+    })
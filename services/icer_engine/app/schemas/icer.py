@@ -32,7 +32,7 @@ class Uncertainty(BaseModel):
     se_eff_0: Optional[float] = Field(None, ge=0, description="对照组效果标准误")
     se_eff_1: Optional[float] = Field(None, ge=0, description="干预组效果标准误")
     corr: Optional[float] = Field(None, ge=-1, le=1, description="成本效果相关系数")
-    samples: int = Field(default=0, ge=0, le=10000, description="蒙特卡洛抽样次数")
+    samples: int = Field(default=0, ge=0, le=10000, description="蒙特卡洛抽样次数（给出corr时按此抽样；未给出时按正态闭式解计算，大于0即启用）")
 
 class EvaluateRequest(BaseModel):
     """ICER评估请求"""
@@ -2,6 +2,8 @@
 ICER Engine 单元测试
 测试ICER评估的各种场景
 """
+import math
+
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
@@ -181,6 +183,56 @@ def test_uncertainty_analysis():
     assert data["ceac_prob_accept"] is not None
     assert 0 <= data["ceac_prob_accept"] <= 1
 
+def test_uncertainty_closed_form():
+    """测试未给出相关系数时接受概率按正态闭式解计算"""
+    body = {
+        "comparator": {"cost": 10000, "effect": 1.0, "effect_unit": "QALY"},
+        "intervention": {"cost": 12000, "effect": 1.1, "effect_unit": "QALY"},
+        "threshold": {"value": 50000, "unit": "CNY_per_QALY", "source": "literature"},
+        "uncertainty": {
+            "se_cost_0": 1000,
+            "se_cost_1": 1200,
+            "se_eff_0": 0.1,
+            "se_eff_1": 0.12,
+            "samples": 1000
+        }
+    }
+
+    # INB = 50000 * 0.1 - 2000 = 3000
+    var = 50000 ** 2 * (0.1 ** 2 + 0.12 ** 2) + 1000 ** 2 + 1200 ** 2
+    response = client.post("/v1/icer/evaluate", json=body)
+    assert response.status_code == 200
+    expected = 0.5 * math.erfc(-3000 / math.sqrt(2 * var))
+    assert response.json()["ceac_prob_accept"] == pytest.approx(expected)
+
+def test_uncertainty_sampling_with_corr():
+    """测试给出相关系数时抽样结果体现臂内成本效果相关性"""
+    body = {
+        "comparator": {"cost": 10000, "effect": 1.0, "effect_unit": "QALY"},
+        "intervention": {"cost": 14000, "effect": 1.1, "effect_unit": "QALY"},
+        "threshold": {"value": 50000, "unit": "CNY_per_QALY", "source": "literature"},
+        "uncertainty": {
+            "se_cost_0": 3000,
+            "se_cost_1": 3000,
+            "se_eff_0": 0.06,
+            "se_eff_1": 0.06,
+            "corr": 0.9,
+            "samples": 10000
+        }
+    }
+
+    # INB = 50000 * 0.1 - 4000 = 1000；正相关使方差从 3.6e7 降到 3.6e6
+    var_indep = 2 * (50000 * 0.06) ** 2 + 2 * 3000 ** 2
+    var_corr = var_indep - 2 * 50000 * 0.9 * (2 * 3000 * 0.06)
+    expected_indep = 0.5 * math.erfc(-1000 / math.sqrt(2 * var_indep))
+    expected_corr = 0.5 * math.erfc(-1000 / math.sqrt(2 * var_corr))
+
+    response = client.post("/v1/icer/evaluate", json=body)
+    assert response.status_code == 200
+    prob = response.json()["ceac_prob_accept"]
+    assert prob == pytest.approx(expected_corr, abs=0.03)
+    assert prob - expected_indep > 0.1
+
 def test_custom_threshold():
     """测试自定义阈值"""
     body = {
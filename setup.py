@@ -0,0 +1,26 @@
+"""
+HealthLink 构建脚本
+项目元数据见 pyproject.toml；设置 HEALTHLINK_MYPYC=1 时用 mypyc 将网关异常处理与中间件编译为C扩展：
+    HEALTHLINK_MYPYC=1 pip install --no-build-isolation .
+    HEALTHLINK_MYPYC=1 python setup.py build_ext --inplace
+（需已安装 mypy，见 dev 依赖组）
+"""
+import os
+
+from setuptools import setup
+
+# 每个请求都会经过的网关模块
+MYPYC_MODULES = [
+    "services/gateway_api/exceptions.py",
+    "services/gateway_api/middleware.py",
+]
+
+ext_modules = []
+if os.environ.get("HEALTHLINK_MYPYC") == "1":
+    from mypyc.build import mypycify
+    # 只检查被编译的模块，导入的其他模块不要求完整类型注解
+    ext_modules = mypycify([
+        "--follow-imports=silent", "--explicit-package-bases", *MYPYC_MODULES
+    ])
+
+setup(ext_modules=ext_modules)
@@ -9,15 +9,22 @@ import time
 import signal
 import subprocess
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from pathlib import Path
 
 class ServiceManager:
     """服务管理器"""
     
+    # 健康检查轮询间隔（秒）
+    HEALTH_POLL_INTERVAL = 0.2
+    
     def __init__(self):
         self.processes = {}
+        self._pid_to_name = {}
         self.running = True
+        # 健康检查复用连接（连接池线程安全，可供并行检查共用）
+        self._session = requests.Session()
         
     def start_service(self, name, cmd, cwd=None, port=None):
         """启动服务"""
@@ -38,6 +45,7 @@ class ServiceManager:
                 'cmd': cmd,
                 'cwd': cwd
             }
+            self._pid_to_name[process.pid] = name
             
             print(f"✅ {name} started (PID: {process.pid})")
             if port:
@@ -56,14 +64,14 @@ class ServiceManager:
         start_time = time.time()
         while time.time() - start_time < timeout:
             try:
-                response = requests.get(url, timeout=2)
+                response = self._session.get(url, timeout=2)
                 if response.status_code == 200:
                     print(f"✅ {name} is healthy")
                     return True
             except requests.exceptions.RequestException:
                 pass
             
-            time.sleep(1)
+            time.sleep(self.HEALTH_POLL_INTERVAL)
         
         print(f"❌ {name} health check failed")
         return False
@@ -91,17 +99,40 @@ class ServiceManager:
                     print(f"   ✅ {name} stopped")
             except Exception as e:
                 print(f"   ❌ Error stopping {name}: {e}")
+        
+        self._session.close()
     
     def monitor_processes(self):
         """监控进程状态"""
+        if not hasattr(os, "WNOHANG"):  # Windows 不支持 waitpid(-1)，逐个轮询
+            while self.running:
+                for name, service in self.processes.items():
+                    process = service['process']
+                    if process.poll() is not None:  # 进程已结束
+                        print(f"⚠️  {name} has stopped unexpectedly")
+                        # 可以在这里添加重启逻辑
+                
+                time.sleep(5)
+            return
+        
+        # 一次 waitpid 回收任意已结束的子进程，没有子进程结束时才休眠
         while self.running:
-            for name, service in self.processes.items():
-                process = service['process']
-                if process.poll() is not None:  # 进程已结束
-                    print(f"⚠️  {name} has stopped unexpectedly")
-                    # 可以在这里添加重启逻辑
+            try:
+                pid, wait_status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:  # 没有子进程
+                pid = 0
             
-            time.sleep(5)
+            if pid == 0:
+                time.sleep(5)
+                continue
+            
+            name = self._pid_to_name.get(pid)
+            if name is None:
+                continue
+            # 进程已被回收，同步退出码，stop_all 据此判断进程已结束
+            self.processes[name]['process'].returncode = os.waitstatus_to_exitcode(wait_status)
+            print(f"⚠️  {name} has stopped unexpectedly")
+            # 可以在这里添加重启逻辑
 
 def signal_handler(signum, frame):
     """信号处理器"""
@@ -181,22 +212,17 @@ def main():
         
         print()
         
-        # 5. 等待服务启动
+        # 5. 等待服务启动并进行健康检查（各服务并行轮询，等待时间取决于最慢的服务）
         print("⏳ Waiting for services to start...")
-        time.sleep(5)
-        
-        # 6. 健康检查
         health_checks = [
             ("ICER Engine", "http://localhost:8090/health"),
             ("Gateway API", "http://localhost:8000/health"),
         ]
         
-        all_healthy = True
-        for name, url in health_checks:
-            if not manager.check_health(name, url):
-                all_healthy = False
+        with ThreadPoolExecutor(max_workers=len(health_checks)) as executor:
+            results = list(executor.map(lambda check: manager.check_health(*check), health_checks))
         
-        if not all_healthy:
+        if not all(results):
             print("❌ Some services failed health checks")
             manager.stop_all()
             return 1
@@ -215,12 +241,12 @@ def main():
         print()
         print("Press Ctrl+C to stop all services...")
         
-        # 7. 启动进程监控
+        # 6. 启动进程监控
         monitor_thread = threading.Thread(target=manager.monitor_processes)
         monitor_thread.daemon = True
         monitor_thread.start()
         
-        # 8. 保持运行
+        # 7. 保持运行
         while manager.running:
             time.sleep(1)
         
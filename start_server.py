@@ -5,39 +5,33 @@ HealthLink 简化启动脚本
 """
 import os
 import sys
-import asyncio
-from pathlib import Path
 
 # 添加项目根目录到Python路径
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, project_root)
 
 def init_database():
-    """初始化数据库"""
+    """初始化数据库，成功时返回数据库引擎"""
     try:
         from config.database_switch import init_database
         print("🔧 Initializing database...")
-        init_database()
+        engine = init_database()
         print("✅ Database initialized successfully!")
-        return True
+        return engine
     except Exception as e:
         print(f"❌ Failed to initialize database: {e}")
-        return False
+        return None
 
-def create_sample_data():
-    """创建示例数据"""
+def create_sample_data(engine):
+    """创建示例数据（复用初始化时创建的引擎）"""
     try:
+        from sqlalchemy import insert, select
         from sqlalchemy.orm import sessionmaker
-        from config.database_switch import create_database_engine, get_config
         from packages.schemas.models import Patient, ICERPolicy
         from datetime import datetime, date
         
         print("📝 Creating sample data...")
         
-        config = get_config()
-        engine, SessionLocal = create_database_engine(config)
-        db = SessionLocal()
-        
         # 创建示例患者
         sample_patients = [
             {
@@ -62,14 +56,8 @@ def create_sample_data():
             }
         ]
         
-        for patient_data in sample_patients:
-            existing = db.query(Patient).filter(Patient.patient_id == patient_data["patient_id"]).first()
-            if not existing:
-                patient = Patient(**patient_data)
-                db.add(patient)
-        
         # 创建示例ICER策略
-        sample_policy = {
+        sample_policies = [{
             "policy_id": "ICER_2025",
             "version": "2025-08",
             "threshold_per_daly": 37446.0,
@@ -90,19 +78,34 @@ def create_sample_data():
             "source": "国家卫健委",
             "effective_date": datetime(2025, 1, 1),
             "is_default": True
-        }
-        
-        existing_policy = db.query(ICERPolicy).filter(
-            ICERPolicy.policy_id == sample_policy["policy_id"],
-            ICERPolicy.version == sample_policy["version"]
-        ).first()
-        
-        if not existing_policy:
-            policy = ICERPolicy(**sample_policy)
-            db.add(policy)
+        }]
         
-        db.commit()
-        db.close()
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        # 事务结束时提交，出错时回滚，两种情况下会话都会关闭、连接归还连接池
+        with SessionLocal.begin() as db:
+            # 一次查询已存在的患者，其余一并插入
+            existing_ids = set(db.scalars(
+                select(Patient.patient_id).where(
+                    Patient.patient_id.in_([p["patient_id"] for p in sample_patients])
+                )
+            ))
+            new_patients = [p for p in sample_patients if p["patient_id"] not in existing_ids]
+            if new_patients:
+                db.execute(insert(Patient), new_patients)
+            
+            # 策略同样按 (policy_id, version) 一次查询、批量插入；
+            # policy_data 列为JSON类型，直接传dict由列类型序列化
+            existing_policies = set(db.execute(
+                select(ICERPolicy.policy_id, ICERPolicy.version).where(
+                    ICERPolicy.policy_id.in_([p["policy_id"] for p in sample_policies])
+                )
+            ).tuples())
+            new_policies = [
+                p for p in sample_policies
+                if (p["policy_id"], p["version"]) not in existing_policies
+            ]
+            if new_policies:
+                db.execute(insert(ICERPolicy), new_policies)
         
         print("✅ Sample data created successfully!")
         return True
@@ -122,18 +125,33 @@ def start_server():
         
         host = gateway_config.get('host', '0.0.0.0')
         port = gateway_config.get('port', 8000)
+        # HEALTHLINK_DEV=1 时单进程热重载；否则按 gateway.workers 启动工作进程，
+        # 未配置时仅在使用Redis缓存（限流计数跨进程共享）时按CPU核数启动多个进程。
+        # 内存缓存下限流令牌桶、列表缓存、token缓存与延迟写入队列均为进程内状态，多进程会各自独立
+        dev_mode = os.getenv('HEALTHLINK_DEV') == '1'
+        shared_cache = config.get('cache', {}).get('type') == 'redis'
+        if dev_mode:
+            workers = 1
+        elif gateway_config.get('workers'):
+            workers = gateway_config['workers']
+        else:
+            workers = (os.cpu_count() or 2) if shared_cache else 1
+        if workers > 1 and not shared_cache:
+            print(f"⚠️  {workers} workers with cache.type=memory: rate limits and caches are per process")
         
         print("🚀 Starting HealthLink Gateway API...")
         print(f"📡 Server will be available at: http://{host}:{port}")
         print(f"📚 API documentation: http://{host}:{port}/docs")
         print(f"🏥 Health check: http://{host}:{port}/health")
+        print(f"⚙️  Mode: {'development (reload)' if dev_mode else f'{workers} workers'}")
         print()
         
         uvicorn.run(
             "services.gateway_api.main:app",
             host=host,
             port=port,
-            reload=True,
+            reload=dev_mode,
+            workers=workers,
             log_level="info"
         )
         
@@ -149,13 +167,14 @@ def main():
     print()
     
     # 初始化数据库
-    if not init_database():
+    engine = init_database()
+    if engine is None:
         sys.exit(1)
     
     print()
     
     # 创建示例数据
-    if not create_sample_data():
+    if not create_sample_data(engine):
         print("⚠️  Warning: Failed to create sample data, but continuing...")
     
     print()
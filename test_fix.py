@@ -2,12 +2,16 @@
 """
 测试修复后的代码
 """
+import logging
+import os
 import sys
-from pathlib import Path
 
 # 添加项目根目录到Python路径
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, project_root)
+
+# 失败信息经日志输出（按需格式化；并行测试时逐条加锁写出，不会交错）
+log = logging.getLogger("healthlink.test")
 
 def test_imports():
     """测试导入"""
@@ -35,9 +39,7 @@ def test_imports():
         return True
         
     except Exception as e:
-        print(f"❌ Import failed: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ Import failed: %s", e)
         return False
 
 def test_config():
@@ -55,7 +57,7 @@ def test_config():
         return True
         
     except Exception as e:
-        print(f"❌ Config test failed: {e}")
+        log.error("❌ Config test failed: %s", e)
         return False
 
 def test_database():
@@ -70,11 +72,12 @@ def test_database():
         return True
         
     except Exception as e:
-        print(f"❌ Database test failed: {e}")
+        log.error("❌ Database test failed: %s", e)
         return False
 
 def main():
     """主测试函数"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     print("=" * 50)
     print("🧪 HealthLink 修复测试")
     print("=" * 50)
@@ -3,23 +3,42 @@
 ICER Engine 集成测试脚本
 验证ICER Engine的完整功能
 """
+import logging
+import os
 import sys
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 import requests
-from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # 添加项目根目录到Python路径
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, project_root)
+
+# 失败信息经日志输出（按需格式化；并行测试时逐条加锁写出，不会交错）
+log = logging.getLogger("healthlink.test")
 
 ICER_ENGINE_URL = "http://localhost:8090"
 
+# 复用连接的HTTP会话（keep-alive，避免每个请求重新建立连接）
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(total=2, backoff_factor=0.1)
+))
+
+# 请求体用 orjson 编码后以 data= 发送
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 def test_health_check():
     """测试健康检查"""
     try:
         print("🔍 Testing ICER Engine health check...")
-        response = requests.get(f"{ICER_ENGINE_URL}/health", timeout=5)
+        response = SESSION.get(f"{ICER_ENGINE_URL}/health", timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -28,18 +47,18 @@ def test_health_check():
             print(f"🔖 Version: {data['version']}")
             return True
         else:
-            print(f"❌ Health check failed: {response.status_code}")
+            log.error("❌ Health check failed: %s", response.status_code)
             return False
             
     except requests.exceptions.RequestException as e:
-        print(f"❌ Health check failed: {e}")
+        log.error("❌ Health check failed: %s", e)
         return False
 
 def test_get_policies():
     """测试获取策略信息"""
     try:
         print("\n🔍 Testing policy retrieval...")
-        response = requests.get(f"{ICER_ENGINE_URL}/v1/icer/policies", timeout=5)
+        response = SESSION.get(f"{ICER_ENGINE_URL}/v1/icer/policies", timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -48,11 +67,11 @@ def test_get_policies():
             print(f"👥 Cohorts: {list(data['cohorts'].keys())}")
             return True
         else:
-            print(f"❌ Policy retrieval failed: {response.status_code}")
+            log.error("❌ Policy retrieval failed: %s", response.status_code)
             return False
             
     except requests.exceptions.RequestException as e:
-        print(f"❌ Policy retrieval failed: {e}")
+        log.error("❌ Policy retrieval failed: %s", e)
         return False
 
 def test_icer_evaluation():
@@ -77,10 +96,10 @@ def test_icer_evaluation():
             }
         }
         
-        response = requests.post(
+        response = SESSION.post(
             f"{ICER_ENGINE_URL}/v1/icer/evaluate",
-            json=test_data,
-            headers={"Content-Type": "application/json"},
+            data=orjson.dumps(test_data),
+            headers=JSON_HEADERS,
             timeout=10
         )
         
@@ -107,12 +126,12 @@ def test_icer_evaluation():
             
             return True
         else:
-            print(f"❌ ICER evaluation failed: {response.status_code}")
+            log.error("❌ ICER evaluation failed: %s", response.status_code)
             print(f"Response: {response.text}")
             return False
             
     except requests.exceptions.RequestException as e:
-        print(f"❌ ICER evaluation failed: {e}")
+        log.error("❌ ICER evaluation failed: %s", e)
         return False
 
 def test_dominance_scenarios():
@@ -134,10 +153,10 @@ def test_dominance_scenarios():
             }
         }
         
-        response = requests.post(
+        response = SESSION.post(
             f"{ICER_ENGINE_URL}/v1/icer/evaluate",
-            json=dominance_data,
-            headers={"Content-Type": "application/json"},
+            data=orjson.dumps(dominance_data),
+            headers=JSON_HEADERS,
             timeout=5
         )
         
@@ -147,14 +166,14 @@ def test_dominance_scenarios():
                 print("✅ Simple dominance (accept) scenario: PASSED")
                 return True
             else:
-                print(f"❌ Simple dominance scenario failed: {data}")
+                log.error("❌ Simple dominance scenario failed: %s", data)
                 return False
         else:
-            print(f"❌ Dominance test failed: {response.status_code}")
+            log.error("❌ Dominance test failed: %s", response.status_code)
             return False
             
     except requests.exceptions.RequestException as e:
-        print(f"❌ Dominance test failed: {e}")
+        log.error("❌ Dominance test failed: %s", e)
         return False
 
 def test_custom_threshold():
@@ -180,10 +199,10 @@ def test_custom_threshold():
             }
         }
         
-        response = requests.post(
+        response = SESSION.post(
             f"{ICER_ENGINE_URL}/v1/icer/evaluate",
-            json=threshold_data,
-            headers={"Content-Type": "application/json"},
+            data=orjson.dumps(threshold_data),
+            headers=JSON_HEADERS,
             timeout=5
         )
         
@@ -194,14 +213,14 @@ def test_custom_threshold():
                 print(f"📊 Used threshold: {data.get('threshold_used')}")
                 return True
             else:
-                print(f"❌ Custom threshold not applied: {data}")
+                log.error("❌ Custom threshold not applied: %s", data)
                 return False
         else:
-            print(f"❌ Custom threshold test failed: {response.status_code}")
+            log.error("❌ Custom threshold test failed: %s", response.status_code)
             return False
             
     except requests.exceptions.RequestException as e:
-        print(f"❌ Custom threshold test failed: {e}")
+        log.error("❌ Custom threshold test failed: %s", e)
         return False
 
 def test_api_documentation():
@@ -210,20 +229,45 @@ def test_api_documentation():
         print("\n🔍 Testing API documentation...")
         
         # 测试OpenAPI文档
-        response = requests.get(f"{ICER_ENGINE_URL}/docs", timeout=5)
+        response = SESSION.get(f"{ICER_ENGINE_URL}/docs", timeout=5)
         if response.status_code == 200:
             print("✅ API documentation accessible")
             return True
         else:
-            print(f"❌ API documentation not accessible: {response.status_code}")
+            log.error("❌ API documentation not accessible: %s", response.status_code)
             return False
             
     except requests.exceptions.RequestException as e:
-        print(f"❌ API documentation test failed: {e}")
+        log.error("❌ API documentation test failed: %s", e)
         return False
 
+def wait_ready(url, timeout=10):
+    """轮询健康检查直到服务就绪（间隔指数增长），超时返回False"""
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while time.monotonic() < deadline:
+        try:
+            if SESSION.get(url, timeout=1).status_code == 200:
+                return True
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+    return False
+
+def _run_test(test_name, test_func):
+    """执行单项测试，通过时返回True"""
+    try:
+        if test_func():
+            return True
+        log.error("❌ %s FAILED", test_name)
+    except Exception as e:
+        log.error("❌ %s ERROR: %s", test_name, e)
+    return False
+
 def main():
     """主测试函数"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     print("=" * 60)
     print("🧪 ICER Engine 集成测试")
     print("=" * 60)
@@ -232,7 +276,8 @@ def main():
     
     # 等待服务启动
     print("⏳ Waiting for service to start...")
-    time.sleep(2)
+    if not wait_ready(f"{ICER_ENGINE_URL}/health"):
+        print("⚠️  Service not ready, running tests anyway")
     
     tests = [
         ("Health Check", test_health_check),
@@ -243,17 +288,12 @@ def main():
         ("API Documentation", test_api_documentation),
     ]
     
-    passed = 0
     total = len(tests)
     
-    for test_name, test_func in tests:
-        try:
-            if test_func():
-                passed += 1
-            else:
-                print(f"❌ {test_name} FAILED")
-        except Exception as e:
-            print(f"❌ {test_name} ERROR: {e}")
+    # 健康检查先行，其余测试互不依赖，并行执行
+    with ThreadPoolExecutor(max_workers=total - 1) as executor:
+        passed = _run_test(*tests[0])
+        passed += sum(executor.map(lambda test: _run_test(*test), tests[1:]))
     
     print("\n" + "=" * 60)
     print(f"📊 测试结果: {passed}/{total} 通过")
@@ -3,12 +3,31 @@
 M2 - ICER Engine 验收测试
 验证M2阶段的所有交付物和验收标准
 """
+import hashlib
+import os
 import sys
 import json
 import time
+import logging
+import orjson
 import requests
-import subprocess
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 失败信息经日志输出（按需格式化；并行测试时逐条加锁写出，不会交错）
+log = logging.getLogger("healthlink.test")
+
+# 复用连接的HTTP会话（keep-alive，避免每个请求重新建立连接）
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(total=2, backoff_factor=0.1)
+))
+
+# 请求体用 orjson 编码后以 data= 发送
+JSON_HEADERS = {"Content-Type": "application/json"}
 
 def test_deliverables():
     """测试交付物完整性"""
@@ -37,13 +56,10 @@ def test_deliverables():
         "services/icer_engine/README.md",
     ]
     
-    missing_files = []
-    for file_path in required_files:
-        if not Path(file_path).exists():
-            missing_files.append(file_path)
+    missing_files = [file_path for file_path in required_files if not os.path.isfile(file_path)]
     
     if missing_files:
-        print(f"❌ Missing deliverables: {missing_files}")
+        log.error("❌ Missing deliverables: %s", missing_files)
         return False
     else:
         print("✅ All deliverables present")
@@ -54,62 +70,66 @@ def test_openapi_compliance():
     print("\n📋 Testing OpenAPI compliance...")
     
     try:
-        # 检查OpenAPI文件是否有效JSON/YAML
-        with open("docs/openapi.yaml", "r") as f:
+        # 检查OpenAPI文件是否有效JSON/YAML（按字节读取，直接在bytes上查找，不解码整个文件）
+        with open("docs/openapi.yaml", "rb") as f:
             content = f.read()
             
         # 检查是否包含ICER相关端点
         required_paths = ["/icer/policies", "/icer/evaluate"]
-        missing_paths = []
-        
-        for path in required_paths:
-            if path not in content:
-                missing_paths.append(path)
+        missing_paths = [path for path in required_paths if path.encode() not in content]
         
         if missing_paths:
-            print(f"❌ Missing OpenAPI paths: {missing_paths}")
+            log.error("❌ Missing OpenAPI paths: %s", missing_paths)
             return False
         
         # 检查是否包含ICER相关组件
         required_components = ["IcerEvaluateRequest", "IcerEvaluateResult"]
-        missing_components = []
-        
-        for component in required_components:
-            if component not in content:
-                missing_components.append(component)
+        missing_components = [
+            component for component in required_components if component.encode() not in content
+        ]
         
         if missing_components:
-            print(f"❌ Missing OpenAPI components: {missing_components}")
+            log.error("❌ Missing OpenAPI components: %s", missing_components)
             return False
         
         print("✅ OpenAPI specification compliant")
         return True
         
     except Exception as e:
-        print(f"❌ OpenAPI compliance check failed: {e}")
+        log.error("❌ OpenAPI compliance check failed: %s", e)
         return False
 
+class _PassedTestCollector:
+    """pytest插件：记录通过的测试函数名"""
+    
+    def __init__(self):
+        self.passed = set()
+    
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call" and report.passed:
+            self.passed.add(report.nodeid.rsplit("::", 1)[-1])
+
 def test_unit_tests():
     """测试单元测试"""
     print("\n🧪 Running unit tests...")
     
     try:
-        # 安装测试依赖
-        subprocess.run([
-            sys.executable, "-m", "pip", "install", "pytest", "requests"
-        ], check=True, capture_output=True)
-        
-        # 运行ICER Engine单元测试
-        result = subprocess.run([
-            sys.executable, "-m", "pytest", 
-            "services/icer_engine/tests/test_icer_engine.py", 
-            "-v"
-        ], capture_output=True, text=True)
+        import pytest
+    except ImportError:
+        log.error("❌ pytest not installed (pip install pytest)")
+        return False
+    
+    try:
+        # 在当前进程内运行ICER Engine单元测试，记录通过的测试
+        collector = _PassedTestCollector()
+        exit_code = pytest.main(
+            ["services/icer_engine/tests/test_icer_engine.py", "-q"],
+            plugins=[collector]
+        )
         
-        if result.returncode == 0:
+        if exit_code == 0:
             print("✅ Unit tests passed")
             # 检查测试覆盖的场景
-            output = result.stdout
             required_tests = [
                 "test_accept_by_dominance",
                 "test_reject_by_threshold", 
@@ -118,7 +138,7 @@ def test_unit_tests():
             
             missing_tests = []
             for test in required_tests:
-                if test not in output:
+                if test not in collector.passed:
                     missing_tests.append(test)
             
             if missing_tests:
@@ -127,11 +147,11 @@ def test_unit_tests():
             
             return True
         else:
-            print(f"❌ Unit tests failed: {result.stderr}")
+            log.error("❌ Unit tests failed (pytest exit code %d)", exit_code)
             return False
             
     except Exception as e:
-        print(f"❌ Unit test execution failed: {e}")
+        log.error("❌ Unit test execution failed: %s", e)
         return False
 
 def test_service_endpoints():
@@ -140,19 +160,19 @@ def test_service_endpoints():
     
     # 检查ICER Engine是否运行
     try:
-        response = requests.get("http://localhost:8090/health", timeout=5)
+        response = SESSION.get("http://localhost:8090/health", timeout=5)
         if response.status_code != 200:
-            print("❌ ICER Engine not running or unhealthy")
+            log.error("❌ ICER Engine not running or unhealthy")
             return False
     except requests.exceptions.RequestException:
-        print("❌ ICER Engine not accessible")
+        log.error("❌ ICER Engine not accessible")
         return False
     
     # 测试策略端点
     try:
-        response = requests.get("http://localhost:8090/v1/icer/policies", timeout=5)
+        response = SESSION.get("http://localhost:8090/v1/icer/policies", timeout=5)
         if response.status_code != 200:
-            print("❌ Policies endpoint failed")
+            log.error("❌ Policies endpoint failed")
             return False
         
         data = response.json()
@@ -160,11 +180,11 @@ def test_service_endpoints():
         missing_fields = [field for field in required_fields if field not in data]
         
         if missing_fields:
-            print(f"❌ Policies response missing fields: {missing_fields}")
+            log.error("❌ Policies response missing fields: %s", missing_fields)
             return False
             
     except Exception as e:
-        print(f"❌ Policies endpoint test failed: {e}")
+        log.error("❌ Policies endpoint test failed: %s", e)
         return False
     
     # 测试评估端点
@@ -182,14 +202,15 @@ def test_service_endpoints():
             }
         }
         
-        response = requests.post(
+        response = SESSION.post(
             "http://localhost:8090/v1/icer/evaluate",
-            json=test_data,
+            data=orjson.dumps(test_data),
+            headers=JSON_HEADERS,
             timeout=10
         )
         
         if response.status_code != 200:
-            print(f"❌ Evaluate endpoint failed: {response.status_code}")
+            log.error("❌ Evaluate endpoint failed: %s", response.status_code)
             return False
         
         data = response.json()
@@ -201,48 +222,118 @@ def test_service_endpoints():
         missing_fields = [field for field in required_fields if field not in data]
         
         if missing_fields:
-            print(f"❌ Evaluate response missing fields: {missing_fields}")
+            log.error("❌ Evaluate response missing fields: %s", missing_fields)
             return False
         
         print("✅ Service endpoints working correctly")
         return True
         
     except Exception as e:
-        print(f"❌ Evaluate endpoint test failed: {e}")
+        log.error("❌ Evaluate endpoint test failed: %s", e)
         return False
 
-def test_docker_build():
-    """测试Docker构建"""
-    print("\n🐳 Testing Docker build...")
+ICER_ENGINE_DIR = "services/icer_engine"
+
+# 记录上次构建成功时镜像输入的摘要，输入未变化时跳过构建
+DOCKER_BUILD_MARKER = ".m2_cache"
+
+def _image_inputs_digest():
+    """ICER Engine镜像输入的内容摘要（Dockerfile、依赖清单及COPY进镜像的应用代码）"""
+    paths = ["Dockerfile", "requirements.txt"]
+    for root, dirs, files in os.walk(os.path.join(ICER_ENGINE_DIR, "app")):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        paths.extend(
+            os.path.relpath(os.path.join(root, name), ICER_ENGINE_DIR)
+            for name in sorted(files) if not name.endswith(".pyc")
+        )
+    
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(os.path.join(ICER_ENGINE_DIR, path), "rb") as f:
+            data = f.read()
+        digest.update(f"{path}\0{len(data)}\0".encode())
+        digest.update(data)
+    return digest.hexdigest()
+
+def _docker_build():
+    """构建ICER Engine镜像，返回 (是否通过, 结果说明)；不直接输出，可在后台线程执行"""
+    # 仅此处用到，按需导入
+    import subprocess
+    
+    digest = _image_inputs_digest()
+    try:
+        with open(DOCKER_BUILD_MARKER) as f:
+            if f.read().strip() == digest:
+                return True, "✅ Docker build cached (image inputs unchanged)"
+    except FileNotFoundError:
+        pass
     
     try:
         # 检查Docker是否可用
         subprocess.run(["docker", "--version"], check=True, capture_output=True)
         
-        # 构建ICER Engine镜像
+        # 构建ICER Engine镜像（BuildKit的层缓存在删除镜像后仍保留，未变化的步骤直接复用）
         result = subprocess.run([
             "docker", "build", "-t", "icer-engine-test", "."
-        ], cwd="services/icer_engine", capture_output=True, text=True, timeout=120)
+        ], cwd=ICER_ENGINE_DIR, env={**os.environ, "DOCKER_BUILDKIT": "1"},
+            capture_output=True, text=True, timeout=120)
         
         if result.returncode == 0:
-            print("✅ Docker build successful")
-            
             # 清理测试镜像
             subprocess.run([
                 "docker", "rmi", "icer-engine-test"
             ], capture_output=True)
             
-            return True
+            with open(DOCKER_BUILD_MARKER, "w") as f:
+                f.write(digest)
+            return True, "✅ Docker build successful"
         else:
-            print(f"❌ Docker build failed: {result.stderr}")
-            return False
+            return False, f"❌ Docker build failed: {result.stderr}"
             
     except subprocess.CalledProcessError:
-        print("⚠️  Docker not available, skipping Docker build test")
-        return True  # 不强制要求Docker
+        return True, "⚠️  Docker not available, skipping Docker build test"  # 不强制要求Docker
     except Exception as e:
-        print(f"❌ Docker build test failed: {e}")
-        return False
+        return False, f"❌ Docker build test failed: {e}"
+
+def test_docker_build(pending_build=None):
+    """测试Docker构建（pending_build 为已在后台开始的构建，未给出时在此构建）"""
+    print("\n🐳 Testing Docker build...")
+    
+    passed, message = pending_build.result() if pending_build is not None else _docker_build()
+    print(message)
+    return passed
+
+def _run_scenario(test_case):
+    """执行单个集成场景，通过时返回True"""
+    try:
+        response = SESSION.post(
+            "http://localhost:8090/v1/icer/evaluate",
+            data=orjson.dumps(test_case["data"]),
+            headers=JSON_HEADERS,
+            timeout=10
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            
+            # 检查预期结果
+            all_match = True
+            for key, expected_value in test_case["expected"].items():
+                if data.get(key) != expected_value:
+                    log.error("  ❌ %s: %s = %s, expected %s", test_case['name'], key, data.get(key), expected_value)
+                    all_match = False
+            
+            if all_match:
+                print(f"  ✅ {test_case['name']}: PASSED")
+                return True
+            else:
+                log.error("  ❌ %s: FAILED", test_case['name'])
+        else:
+            log.error("  ❌ %s: HTTP %s", test_case['name'], response.status_code)
+            
+    except Exception as e:
+        log.error("  ❌ %s: %s", test_case['name'], e)
+    return False
 
 def test_integration_scenarios():
     """测试集成场景"""
@@ -276,70 +367,50 @@ def test_integration_scenarios():
         }
     ]
     
-    passed = 0
-    for test_case in test_cases:
-        try:
-            response = requests.post(
-                "http://localhost:8090/v1/icer/evaluate",
-                json=test_case["data"],
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # 检查预期结果
-                all_match = True
-                for key, expected_value in test_case["expected"].items():
-                    if data.get(key) != expected_value:
-                        print(f"  ❌ {test_case['name']}: {key} = {data.get(key)}, expected {expected_value}")
-                        all_match = False
-                
-                if all_match:
-                    print(f"  ✅ {test_case['name']}: PASSED")
-                    passed += 1
-                else:
-                    print(f"  ❌ {test_case['name']}: FAILED")
-            else:
-                print(f"  ❌ {test_case['name']}: HTTP {response.status_code}")
-                
-        except Exception as e:
-            print(f"  ❌ {test_case['name']}: {e}")
+    # 各场景互不依赖，并行发送请求
+    with ThreadPoolExecutor(max_workers=len(test_cases)) as executor:
+        passed = sum(executor.map(_run_scenario, test_cases))
     
     if passed == len(test_cases):
         print("✅ All integration scenarios passed")
         return True
     else:
-        print(f"❌ {len(test_cases) - passed} integration scenarios failed")
+        log.error("❌ %s integration scenarios failed", len(test_cases) - passed)
         return False
 
 def main():
     """主测试函数"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     print("=" * 60)
     print("🎯 M2 - ICER Engine 验收测试")
     print("=" * 60)
     
-    tests = [
-        ("Deliverables Check", test_deliverables),
-        ("OpenAPI Compliance", test_openapi_compliance),
-        ("Unit Tests", test_unit_tests),
-        ("Service Endpoints", test_service_endpoints),
-        ("Docker Build", test_docker_build),
-        ("Integration Scenarios", test_integration_scenarios),
-    ]
-    
-    passed = 0
-    total = len(tests)
-    
-    for test_name, test_func in tests:
-        try:
-            print(f"\n{'='*20} {test_name} {'='*20}")
-            if test_func():
-                passed += 1
-            else:
-                print(f"❌ {test_name} FAILED")
-        except Exception as e:
-            print(f"❌ {test_name} ERROR: {e}")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Docker镜像构建耗时最长且与其他测试无关，先在后台开始，其余测试照常依次执行；
+        # 单元测试在进程内运行时 pytest 会接管输出，后台构建不直接输出，轮到时再报告结果
+        pending_build = executor.submit(_docker_build)
+        
+        tests = [
+            ("Deliverables Check", test_deliverables),
+            ("OpenAPI Compliance", test_openapi_compliance),
+            ("Unit Tests", test_unit_tests),
+            ("Service Endpoints", test_service_endpoints),
+            ("Docker Build", lambda: test_docker_build(pending_build)),
+            ("Integration Scenarios", test_integration_scenarios),
+        ]
+        
+        passed = 0
+        total = len(tests)
+        
+        for test_name, test_func in tests:
+            try:
+                print(f"\n{'='*20} {test_name} {'='*20}")
+                if test_func():
+                    passed += 1
+                else:
+                    log.error("❌ %s FAILED", test_name)
+            except Exception as e:
+                log.error("❌ %s ERROR: %s", test_name, e)
     
     print("\n" + "=" * 60)
     print(f"📊 M2验收测试结果: {passed}/{total} 通过")
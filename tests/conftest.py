@@ -0,0 +1,49 @@
+"""
+网关测试公共夹具
+每个用例使用独立的临时SQLite数据库与新建的应用实例
+"""
+import copy
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import database_switch
+from services.gateway_api.response_cache import list_cache
+
+# 按需创建的数据库引擎、会话与后台写入队列，用例间不共享
+_DATABASE_STATE = (
+    "_engine", "_session_local", "_scoped_session",
+    "_async_engine", "_async_session_local",
+    "_health_engine", "_health_session_local",
+    "_audit_queue", "_audit_writer", "_outcome_queue",
+)
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """测试配置：临时SQLite数据库，放宽限流"""
+    config = copy.deepcopy(database_switch.load_config())
+    config['database']['type'] = 'sqlite'
+    config['database']['sqlite']['path'] = str(tmp_path / "healthlink.db")
+    config.setdefault('gateway', {})['rate_limit'] = {'requests_per_minute': 6000, 'burst': 1000}
+    monkeypatch.setattr(database_switch, "_config", config)
+    for name in _DATABASE_STATE:
+        monkeypatch.setattr(database_switch, name, None)
+    for route in ("patients", "screenings", "interventions", "outcomes"):
+        list_cache.invalidate(route)
+    yield config
+    if database_switch._engine is not None:
+        database_switch._engine.dispose()
+
+@pytest.fixture
+def client(config):
+    """按测试配置新建应用并执行启动/关闭流程"""
+    from services.gateway_api.main import create_app
+    with TestClient(create_app()) as client:
+        yield client
+
+@pytest.fixture
+def patient(client):
+    """已创建的患者"""
+    response = client.post("/api/v1/patients/", json={"patient_id": "P_TEST", "name": "测试患者"})
+    assert response.status_code == 200
+    return response.json()["data"]
@@ -0,0 +1,128 @@
+"""
+认证中间件JWT验证缓存测试
+"""
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from jose import JWTError, jwt
+
+from services.gateway_api import middleware
+from services.gateway_api.middleware import AuthMiddleware
+
+SECRET = "test-secret"
+
+def _token(sub="u1", **claims):
+    return jwt.encode({"sub": sub, "role": "doctor", "org": "org1", **claims}, SECRET, algorithm="HS256")
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    """记录 jwt.decode 的调用次数"""
+    calls = []
+    decode = middleware.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(middleware.jwt, "decode", counting_decode)
+    return calls
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可手动推进的系统时钟"""
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(middleware.time, "time", lambda: now[0])
+    return now
+
+@pytest.fixture
+def auth():
+    return AuthMiddleware(FastAPI(), secret_key=SECRET)
+
+def test_verified_token_cached(auth, decode_calls):
+    """同一token只验签一次"""
+    token = _token()
+
+    first = auth._authenticate(token)
+    second = auth._authenticate(token)
+
+    assert first == second == {
+        "user_id": "u1", "role": "doctor", "organization_id": "org1", "permissions": []
+    }
+    assert decode_calls == [token]
+
+def test_cache_entry_expires_with_token(auth, clock, monkeypatch):
+    """缓存不超过token自身的exp，过期后重新验签并拒绝"""
+    decode_calls = []
+    monkeypatch.setattr(middleware.jwt, "decode", _decode_at(clock, decode_calls))
+    token = _token(exp=int(clock[0]) + 60)
+    auth._authenticate(token)
+
+    clock[0] += 30
+    auth._authenticate(token)
+    assert len(decode_calls) == 1
+
+    clock[0] += 31
+    with pytest.raises(JWTError):
+        auth._authenticate(token)
+    assert len(decode_calls) == 2
+
+def test_cache_ttl_caps_long_lived_tokens(auth, clock, monkeypatch):
+    """无exp或exp很远的token最多缓存 TOKEN_CACHE_TTL 秒"""
+    decode_calls = []
+    monkeypatch.setattr(middleware.jwt, "decode", _decode_at(clock, decode_calls))
+    token = _token()
+    auth._authenticate(token)
+
+    clock[0] += AuthMiddleware.TOKEN_CACHE_TTL + 1
+    auth._authenticate(token)
+
+    assert len(decode_calls) == 2
+
+def test_cache_bounded(auth, decode_calls):
+    """超出容量时淘汰最久未使用的token"""
+    auth.TOKEN_CACHE_MAXSIZE = 2
+    tokens = [_token(sub=f"u{i}") for i in range(3)]
+    auth._authenticate(tokens[0])
+    auth._authenticate(tokens[1])
+    auth._authenticate(tokens[0])
+    auth._authenticate(tokens[2])
+
+    auth._authenticate(tokens[0])
+    assert len(decode_calls) == 3
+    auth._authenticate(tokens[1])
+    assert len(decode_calls) == 4
+
+def test_dispatch_uses_cached_user_copy(monkeypatch, decode_calls):
+    """请求拿到缓存用户信息的副本，修改不影响后续请求"""
+    monkeypatch.setattr(AuthMiddleware, "_is_development_mode", lambda self: False)
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(request: Request):
+        user = request.state.user
+        seen = {"user_id": user["user_id"], "role": user["role"]}
+        user["role"] = "tampered"
+        return seen
+
+    app.add_middleware(AuthMiddleware, secret_key=SECRET)
+    headers = {"Authorization": f"Bearer {_token()}"}
+
+    with TestClient(app) as client:
+        assert client.get("/me", headers=headers).json() == {"user_id": "u1", "role": "doctor"}
+        assert client.get("/me", headers=headers).json() == {"user_id": "u1", "role": "doctor"}
+        assert client.get("/me", headers={"Authorization": "Bearer not-a-jwt"}).status_code == 401
+
+    assert len(decode_calls) == 2
+
+def _decode_at(clock, calls):
+    """按测试时钟校验exp的 jwt.decode"""
+    decode = jwt.decode
+
+    def decode_at(token, key, algorithms=None, **kwargs):
+        calls.append(token)
+        payload = decode(token, key, algorithms=algorithms, options={"verify_exp": False})
+        if "exp" in payload and payload["exp"] <= clock[0]:
+            raise jwt.ExpiredSignatureError("Signature has expired.")
+        return payload
+
+    return decode_at
@@ -0,0 +1,95 @@
+"""
+批量接口测试：批量创建患者、批量ICER评估
+"""
+import pytest
+
+from services.gateway_api.routers import icer
+
+def _patient(pid, **fields):
+    return {"patient_id": pid, "name": f"患者{pid}", **fields}
+
+def test_create_patients_batch(client):
+    """整批写入，按请求顺序返回内部ID与业务ID"""
+    body = {"patients": [
+        _patient("B03", gender="F", primary_doctor_id="D01"),
+        _patient("B01", metadata={"source": "import"}),
+        _patient("B02", medical_record_number="MRN-B02"),
+    ]}
+
+    response = client.post("/api/v1/patients/batch", json=body)
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert [item["patient_id"] for item in data] == ["B03", "B01", "B02"]
+    assert len({item["id"] for item in data}) == 3
+
+    for item in data:
+        detail = client.get(f"/api/v1/patients/{item['patient_id']}").json()["data"]
+        assert detail["id"] == item["id"]
+    detail = client.get("/api/v1/patients/B03").json()["data"]
+    assert (detail["gender"], detail["primary_doctor_id"], detail["is_active"]) == ("F", "D01", True)
+    assert client.get("/api/v1/patients/B01").json()["data"]["metadata_json"] == {"source": "import"}
+
+def test_create_patients_batch_conflict(client, patient):
+    """批次中含已存在的患者ID时整批拒绝"""
+    body = {"patients": [_patient("B10"), _patient(patient["patient_id"])]}
+
+    response = client.post("/api/v1/patients/batch", json=body)
+
+    assert response.status_code == 409
+    assert patient["patient_id"] in response.json()["error"]["message"]
+    assert client.get("/api/v1/patients/B10").status_code == 404
+
+def test_create_patients_batch_duplicate_ids(client):
+    """同一批次内患者ID重复时请求校验失败"""
+    response = client.post("/api/v1/patients/batch", json={"patients": [_patient("B20"), _patient("B20")]})
+
+    assert response.status_code == 422
+    assert client.get("/api/v1/patients/B20").status_code == 404
+
+@pytest.fixture
+def default_policy(client, monkeypatch):
+    """默认ICER策略（清空进程内策略缓存，避免引用其他用例的数据库）"""
+    monkeypatch.setattr(icer, "_policy_cache", {})
+    response = client.post("/api/v1/icer/policies", json={
+        "policy_id": "POL_TEST",
+        "version": "2025-08",
+        "threshold_per_daly": 30000,
+        "policy_data": {},
+        "is_default": True
+    })
+    assert response.status_code == 200
+    return response.json()["data"]
+
+def test_evaluate_icer_batch(client, default_policy):
+    """逐项计算ICER值并按默认策略阈值决策"""
+    response = client.post("/api/v1/icer/evaluate:batch", json={
+        "intervention_costs": [20000, 90000, 0],
+        "intervention_effectiveness": [1, 2, 0.5]
+    })
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["policy_id"] == default_policy["id"]
+    assert data["threshold_used"] == 30000
+    assert data["icer_values"] == [20000, 45000, 0]
+    assert data["decisions"] == ["cost_effective", "not_cost_effective", "cost_effective"]
+
+def test_evaluate_icer_batch_length_mismatch(client, default_policy):
+    """成本与效果列表长度不一致时请求校验失败"""
+    response = client.post("/api/v1/icer/evaluate:batch", json={
+        "intervention_costs": [1000, 2000],
+        "intervention_effectiveness": [1]
+    })
+
+    assert response.status_code == 422
+
+def test_evaluate_icer_batch_unknown_version(client, default_policy):
+    """指定的策略版本不存在时返回404"""
+    response = client.post("/api/v1/icer/evaluate:batch", json={
+        "intervention_costs": [1000],
+        "intervention_effectiveness": [1],
+        "policy_version": "1999-01"
+    })
+
+    assert response.status_code == 404
@@ -0,0 +1,95 @@
+"""
+患者列表游标分页测试
+"""
+import base64
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from config import database_switch
+from packages.schemas.models import Patient
+from services.gateway_api.pagination import decode_cursor, encode_cursor
+
+@pytest.fixture
+def patients(client):
+    """创建时间有并列的患者，含旧数据格式（无小数秒）的文本时间戳；返回期望的倒序业务ID"""
+    same = datetime(2025, 8, 16, 11, 47, 8, 250000)
+    created = [
+        ("P01", datetime(2025, 8, 15, 9, 0, 0)),
+        ("P02", same),
+        ("P03", same),
+        ("P04", same),
+        ("P05", datetime(2025, 8, 17, 8, 0, 0, 1)),
+        ("P06", datetime(2025, 8, 17, 8, 0, 0, 1)),
+    ]
+    engine = database_switch.get_engine()
+    with engine.begin() as conn:
+        conn.execute(Patient.__table__.insert(), [
+            dict(patient_id=pid, name=pid, is_active=True, created_at=at, updated_at=at)
+            for pid, at in created
+        ])
+        conn.execute(text(
+            "INSERT INTO patients (patient_id, name, is_active, created_at, updated_at) "
+            "VALUES ('P07', 'P07', 1, '2025-08-16 10:00:00', '2025-08-16 10:00:00')"
+        ))
+    return ["P06", "P05", "P04", "P03", "P02", "P07", "P01"]
+
+def _walk(client, size):
+    """沿游标翻完全部页，返回各页的业务ID与分页元数据"""
+    pages = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get("/api/v1/patients/", params={"cursor": cursor, "size": size})
+        assert response.status_code == 200
+        body = response.json()
+        pages.append(([item["patient_id"] for item in body["data"]], body["meta"]))
+        cursor = body["meta"]["next_cursor"]
+        assert len(pages) <= 10, "游标未向前推进"
+    return pages
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 20])
+def test_walk_all_pages(client, patients, size):
+    """逐页遍历不重复、不遗漏，顺序为 (created_at, id) 倒序"""
+    pages = _walk(client, size)
+
+    assert [pid for ids, _ in pages for pid in ids] == patients
+    assert all(len(ids) == size for ids, _ in pages[:-1])
+    for index, (_, meta) in enumerate(pages):
+        assert "page" not in meta
+        assert meta["total"] is None and meta["pages"] is None
+        assert meta["has_prev"] is (index > 0)
+        assert meta["has_next"] is (index < len(pages) - 1)
+
+def test_offset_mode_keeps_page(client, patients):
+    """偏移分页仍返回页码与总数"""
+    meta = client.get("/api/v1/patients/", params={"size": 3, "page": 2}).json()["meta"]
+
+    assert meta["page"] == 2
+    assert meta["total"] == len(patients)
+
+@pytest.mark.parametrize("cursor", [
+    "not-base64!",
+    base64.urlsafe_b64encode(b"no-separator").decode(),
+    base64.urlsafe_b64encode(b"2025-08-16 11:47:08|abc").decode(),
+    base64.urlsafe_b64encode(b"yesterday|3").decode(),
+])
+def test_malformed_cursor_rejected(client, cursor):
+    """格式错误的游标返回400"""
+    response = client.get("/api/v1/patients/", params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["error"]["field"] == "cursor"
+
+def test_cursor_requires_default_ordering(client):
+    """游标分页只支持创建时间倒序"""
+    response = client.get("/api/v1/patients/", params={"cursor": "", "sort_order": "asc"})
+
+    assert response.status_code == 400
+
+def test_cursor_round_trip():
+    """游标编码后可还原排序键"""
+    at = datetime(2025, 8, 16, 11, 47, 8, 123456)
+
+    assert decode_cursor(encode_cursor(at, 42)) == ("2025-08-16 11:47:08.123456", 42)
+    assert decode_cursor(encode_cursor("2025-08-16 11:47:08", 7)) == ("2025-08-16 11:47:08", 7)
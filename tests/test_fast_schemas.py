@@ -0,0 +1,99 @@
+"""
+msgspec 响应结构与 pydantic 响应模型的一致性测试
+同一ORM行分别经两者编码，输出的JSON须完全一致（字段、顺序与格式）
+"""
+from datetime import datetime
+
+import pytest
+
+from packages.schemas import _fast, responses
+from packages.schemas.models import ICEREvaluation, ICERPolicy, Intervention, Outcome, Patient, Screening
+
+CREATED = datetime(2025, 8, 16, 11, 47, 8)
+UPDATED = datetime(2025, 8, 17, 9, 30, 15, 123456)
+
+ROWS = [
+    (
+        "PatientSummaryResponse",
+        Patient(
+            id=1, patient_id="P001", name="张三", gender="M", birth_date=datetime(1980, 5, 1),
+            phone="13800000000", email="p001@example.com", medical_record_number="MRN001",
+            primary_doctor_id="D01", is_active=True, created_at=CREATED, updated_at=UPDATED
+        ),
+    ),
+    (
+        "PatientSummaryResponse",
+        Patient(id=2, patient_id="P002", name="李四", is_active=False, created_at=CREATED, updated_at=CREATED),
+    ),
+    (
+        "ICERPolicySummaryResponse",
+        ICERPolicy(
+            id=1, policy_id="POL001", version="2025-08", threshold_per_daly=37446.0,
+            policy_data={"threshold": 37446}, description="默认策略", source="WHO",
+            effective_date=CREATED, expiry_date=None, is_active=True, is_default=True,
+            created_at=CREATED, updated_at=UPDATED
+        ),
+    ),
+    (
+        "ScreeningResponse",
+        Screening(
+            id=3, screening_id="S001", patient_id=1, input_text="患者胸痛",
+            input_metadata={"source": "app", "lang": "zh"},
+            nlp_entities=[{"text": "胸痛", "label": "SYMPTOM", "start": 2, "end": 4}],
+            nlp_confidence=0.85, nlp_model_version="v1", asr_keywords=["胸痛"],
+            triage_level="high", triage_score=0.9, risk_factors=["胸痛"], status="completed",
+            processed_at=UPDATED, created_at=CREATED, updated_at=UPDATED
+        ),
+    ),
+    (
+        "ICEREvaluationResponse",
+        ICEREvaluation(
+            id=4, evaluation_id="E001", policy_id=1, intervention_cost=12000.5,
+            intervention_effectiveness=0.1, population_size=1000, time_horizon=5,
+            icer_value=20000.0, threshold_used=37446.0, decision="cost_effective",
+            calculation_metadata={"method": "simple"}, cohort_id="C01",
+            created_at=CREATED, updated_at=UPDATED
+        ),
+    ),
+    (
+        "InterventionSummaryResponse",
+        Intervention(
+            id=5, intervention_id="I001", patient_id=1, screening_id=3, icer_evaluation_id=4,
+            intervention_type="medication", intervention_plan={"drug": "aspirin"},
+            priority_level="high", estimated_cost=500.0, approval_status="approved",
+            approved_by="D01", approved_at=UPDATED, approval_notes="同意",
+            execution_status="in_progress", started_at=UPDATED, completed_at=None,
+            created_at=CREATED, updated_at=UPDATED
+        ),
+    ),
+    (
+        "OutcomeResponse",
+        Outcome(
+            id=6, outcome_id="O001", patient_id=1, intervention_id=5, followup_day=30,
+            measurement_date=CREATED, adherence_score=0.8, adherence_details={"missed": 2},
+            clinical_metrics={"bp": [120, 80], "glucose": 5.6}, emergency_visits=0,
+            hospitalizations=1, direct_cost=1234.56, indirect_cost=0.0, qaly_score=0.05,
+            patient_satisfaction=4.5, quality_of_life=0.7, data_source="manual",
+            measurement_metadata={}, created_at=CREATED, updated_at=UPDATED
+        ),
+    ),
+    (
+        "OutcomeResponse",
+        Outcome(
+            id=7, outcome_id="O002", patient_id=1, followup_day=0, measurement_date=UPDATED,
+            created_at=CREATED, updated_at=CREATED
+        ),
+    ),
+]
+
+@pytest.mark.parametrize("name,row", ROWS, ids=[f"{name}-{row.id}" for name, row in ROWS])
+def test_struct_matches_pydantic_model(name, row):
+    """同一行经 pydantic 模型与 msgspec 结构编码后JSON一致"""
+    expected = getattr(responses, name).model_validate(row).model_dump_json().encode()
+    actual = _fast.encode(getattr(_fast, name).from_orm(row))
+    assert actual == expected
+
+@pytest.mark.parametrize("name", sorted({name for name, _ in ROWS}))
+def test_struct_fields_match_pydantic_model(name):
+    """结构字段与模型字段一一对应且顺序一致"""
+    assert list(getattr(_fast, name).__struct_fields__) == list(getattr(responses, name).model_fields)
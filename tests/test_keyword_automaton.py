@@ -0,0 +1,69 @@
+"""
+关键词多模式匹配自动机测试
+分别覆盖 pyahocorasick 与纯Python字典树两种实现
+"""
+import pytest
+
+from config import model_switch
+from config.model_switch import build_keyword_automaton
+
+@pytest.fixture(params=["ahocorasick", "trie"])
+def backend(request, monkeypatch):
+    """自动机实现：未安装pyahocorasick时跳过对应用例"""
+    if request.param == "ahocorasick":
+        if model_switch.ahocorasick is None:
+            pytest.skip("pyahocorasick未安装")
+    else:
+        monkeypatch.setattr(model_switch, "ahocorasick", None)
+    return request.param
+
+def test_keyword_in_multiple_categories(backend):
+    """同一关键词出现在多个类别中时返回全部类别"""
+    automaton = build_keyword_automaton([
+        ("胸痛", ("symptom", "胸痛")),
+        ("胸痛", ("cardiac", "胸痛")),
+        ("头晕", ("symptom", "头晕")),
+    ])
+
+    hits = list(automaton.iter("患者胸痛伴头晕"))
+
+    assert hits == [
+        (3, (("symptom", "胸痛"), ("cardiac", "胸痛"))),
+        (6, (("symptom", "头晕"),)),
+    ]
+
+def test_trie_matches_overlapping_keywords(backend):
+    """前缀相同或相互重叠的关键词均按结束位置产出"""
+    automaton = build_keyword_automaton(
+        (word, word) for word in ("心", "心悸", "心房颤动", "房颤")
+    )
+
+    hits = list(automaton.iter("心房颤动伴心悸"))
+
+    assert sorted(hits) == [
+        (0, ("心",)),
+        (2, ("房颤",)),
+        (3, ("心房颤动",)),
+        (5, ("心",)),
+        (6, ("心悸",)),
+    ]
+
+def test_fallback_nlp_result_without_ahocorasick(monkeypatch):
+    """未安装pyahocorasick时NLP回退结果与逐词子串扫描一致"""
+    monkeypatch.setattr(model_switch, "ahocorasick", None)
+    monkeypatch.setattr(model_switch, "_keywords_cache", {})
+    provider = model_switch.APIModelProvider(model_switch.load_model_config())
+    text = "患者高血压多年，近日胸痛伴头晕、心悸，高血压控制不佳"
+
+    entities = provider._fallback_nlp_result(text)["entities"]
+
+    expected = []
+    for label, terms in provider._load_keywords().items():
+        for term in terms:
+            start = text.find(term)
+            while start != -1:
+                expected.append((start, start + len(term), term, label))
+                start = text.find(term, start + 1)
+    assert expected
+    assert sorted((e["start"], e["end"], e["text"], e["label"]) for e in entities) == sorted(expected)
+    assert isinstance(provider._load_keyword_automaton(), model_switch._KeywordTrie)
@@ -0,0 +1,40 @@
+"""
+ORM模型默认值测试
+"""
+import os
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from config import database_switch
+from packages.schemas.models import Patient
+
+@pytest.fixture
+def shanghai_tz():
+    """本地时区设为UTC+8，使本地时间与UTC明显不同"""
+    if not hasattr(time, "tzset"):
+        pytest.skip("当前平台不支持切换时区")
+    previous = os.environ.get("TZ")
+    os.environ["TZ"] = "Asia/Shanghai"
+    time.tzset()
+    yield
+    if previous is None:
+        del os.environ["TZ"]
+    else:
+        os.environ["TZ"] = previous
+    time.tzset()
+
+def test_orm_timestamps_match_database_default(config, shanghai_tz):
+    """ORM写入的时间戳与数据库默认值（UTC）一致，不随本地时区偏移"""
+    engine = database_switch.init_database()
+    with Session(engine) as db:
+        db.add(Patient(patient_id="P_ORM", name="ORM"))
+        db.commit()
+        db.execute(text("INSERT INTO patients (patient_id, name) VALUES ('P_SQL', 'SQL')"))
+        db.commit()
+        stamps = dict(db.execute(select(Patient.patient_id, Patient.created_at)).all())
+
+    assert abs(stamps["P_ORM"] - stamps["P_SQL"]) < timedelta(seconds=5)
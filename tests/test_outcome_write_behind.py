@@ -0,0 +1,85 @@
+"""
+效果记录延迟写入测试
+"""
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from config import database_switch
+from packages.schemas.models import Outcome, Patient, utc_now
+
+@pytest.fixture
+def write_behind(config):
+    """开启效果记录延迟写入"""
+    config.setdefault('business', {})['outcomes'] = {'write_behind': True}
+    return config
+
+def _outcome_count(engine) -> int:
+    with engine.connect() as conn:
+        return conn.scalar(select(func.count()).select_from(Outcome))
+
+def test_create_outcome_is_written_in_background(write_behind, client, patient):
+    """入队后立即返回，后台任务落库后列表可见"""
+    response = client.post("/api/v1/outcomes/", json={
+        "patient_id": patient["patient_id"],
+        "followup_day": 7,
+        "measurement_date": "2025-08-01T00:00:00"
+    })
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["id"] is None
+    # 入队记录的时间戳与模型默认值一样使用UTC
+    created_at = datetime.fromisoformat(data["created_at"])
+    assert abs(created_at - utc_now()) < timedelta(seconds=5)
+
+    deadline = time.monotonic() + 5
+    while _outcome_count(database_switch.get_engine()) == 0:
+        assert time.monotonic() < deadline, "效果记录未写入数据库"
+        time.sleep(0.01)
+
+    listed = client.get("/api/v1/outcomes/").json()
+    assert [item["outcome_id"] for item in listed["data"]] == [data["outcome_id"]]
+
+def test_queued_outcomes_flushed_on_shutdown(write_behind):
+    """关闭时写出队列中尚未落库的记录"""
+    from fastapi.testclient import TestClient
+    from services.gateway_api.main import create_app
+
+    patient_id = "P_SHUTDOWN"
+    with TestClient(create_app()) as client:
+        client.post("/api/v1/patients/", json={"patient_id": patient_id, "name": "测试患者"})
+        for day in range(5):
+            response = client.post("/api/v1/outcomes/", json={
+                "patient_id": patient_id,
+                "followup_day": day,
+                "measurement_date": "2025-08-01T00:00:00"
+            })
+            assert response.status_code == 200
+
+    assert _outcome_count(database_switch.get_engine()) == 5
+
+def test_failed_batch_retried_per_record(config):
+    """整批写入失败时逐条重试，只丢弃出错的记录"""
+    engine = database_switch.init_database()
+    with engine.begin() as conn:
+        patient_pk = conn.execute(
+            Patient.__table__.insert().values(patient_id="P_BATCH", name="测试患者")
+        ).inserted_primary_key[0]
+
+    def record(outcome_id):
+        now = datetime.now()
+        return dict(
+            outcome_id=outcome_id, patient_id=patient_pk, followup_day=1,
+            measurement_date=now, created_at=now, updated_at=now
+        )
+
+    duplicate = str(uuid.uuid4())
+    database_switch._flush_outcome_batch(engine, [record(duplicate)])
+    database_switch._flush_outcome_batch(
+        engine, [record(str(uuid.uuid4())), record(duplicate), record(str(uuid.uuid4()))]
+    )
+
+    assert _outcome_count(engine) == 3
@@ -0,0 +1,137 @@
+"""
+限流中间件测试
+"""
+import asyncio
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from services.gateway_api import middleware
+from services.gateway_api.middleware import RateLimitMiddleware
+
+def _config(requests_per_minute=60, burst=3, cache_type="memory"):
+    return {
+        'gateway': {'rate_limit': {'requests_per_minute': requests_per_minute, 'burst': burst}},
+        'cache': {'type': cache_type, 'redis': {'host': 'localhost', 'port': 6379, 'db': 0}},
+    }
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可手动推进的单调时钟"""
+    now = [1000.0]
+    monkeypatch.setattr(middleware.time, "monotonic", lambda: now[0])
+    return now
+
+def test_token_bucket_burst_and_refill(clock):
+    """突发容量用完后拒绝，按每分钟请求数匀速补充"""
+    limiter = RateLimitMiddleware(FastAPI(), _config(requests_per_minute=60, burst=3))
+
+    assert [limiter._is_allowed("ip:a") for _ in range(4)] == [True, True, True, False]
+    assert limiter._is_allowed("ip:b")
+
+    clock[0] += 0.5
+    assert not limiter._is_allowed("ip:a")
+    clock[0] += 0.5
+    assert limiter._is_allowed("ip:a")
+    assert not limiter._is_allowed("ip:a")
+
+    # 长时间空闲后最多补满到突发容量
+    clock[0] += 600
+    assert [limiter._is_allowed("ip:a") for _ in range(4)] == [True, True, True, False]
+
+def test_idle_clients_swept(clock):
+    """长时间空闲的客户端桶被清理"""
+    limiter = RateLimitMiddleware(FastAPI(), _config())
+    limiter._is_allowed("ip:a")
+
+    clock[0] += RateLimitMiddleware.IDLE_TTL + 1
+    limiter._is_allowed("ip:b")
+
+    assert list(limiter.clients) == ["ip:b"]
+
+def test_rate_limited_response_and_health_exempt():
+    """超限返回429并说明突发容量与补充速率，健康检查不限流"""
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        return {"ok": True}
+
+    @app.get("/health/live")
+    async def live():
+        return {"status": "ok"}
+
+    app.add_middleware(RateLimitMiddleware, config=_config(requests_per_minute=30, burst=2))
+
+    with TestClient(app) as client:
+        assert [client.get("/items").status_code for _ in range(3)] == [200, 200, 429]
+        response = client.get("/items")
+        assert response.status_code == 429
+        assert response.json()["error"]["message"] == (
+            "Rate limit exceeded: bursts of up to 2 requests, refilled at 0.5 requests per second"
+        )
+        assert all(client.get("/health/live").status_code == 200 for _ in range(5))
+
+@pytest.fixture
+def shared_limiter():
+    """配置Redis共享计数的限流器（不连接Redis，由用例替换计数脚本）"""
+    pytest.importorskip("redis")
+    limiter = RateLimitMiddleware(FastAPI(), _config(requests_per_minute=2, burst=5, cache_type="redis"))
+    assert limiter._redis_incr is not None
+    return limiter
+
+def test_redis_window_count(shared_limiter):
+    """Redis按分钟窗口计数，超过每分钟请求数即拒绝"""
+    counts = {}
+    calls = []
+
+    async def incr(keys=None, args=None):
+        calls.append((keys, args))
+        counts[keys[0]] = counts.get(keys[0], 0) + 1
+        return counts[keys[0]]
+
+    shared_limiter._redis_incr = incr
+
+    async def run():
+        return [await shared_limiter._is_allowed_shared("user:u1") for _ in range(3)]
+
+    assert asyncio.run(run()) == [True, True, False]
+    keys, args = calls[0]
+    assert keys[0].startswith("rl:user:u1:")
+    assert args == [middleware._RATE_LIMIT_WINDOW]
+
+def test_redis_error_falls_back_to_local_bucket(shared_limiter, clock):
+    """Redis出错时改用进程内令牌桶，一段时间后再重试Redis"""
+    from redis import asyncio as redis_asyncio
+
+    calls = []
+
+    async def failing_incr(keys=None, args=None):
+        calls.append(keys)
+        raise redis_asyncio.ConnectionError("down")
+
+    shared_limiter._redis_incr = failing_incr
+
+    async def call_next(request):
+        return "passed"
+
+    def request():
+        return Request({
+            "type": "http", "method": "GET", "path": "/items", "query_string": b"",
+            "headers": [], "client": ("10.0.0.1", 50000),
+        })
+
+    async def dispatch_many(n):
+        return [await shared_limiter.dispatch(request(), call_next) for _ in range(n)]
+
+    results = asyncio.run(dispatch_many(6))
+
+    # 首次调用Redis失败后，重试间隔内不再访问Redis，按突发容量5在进程内限流
+    assert len(calls) == 1
+    assert results[:5] == ["passed"] * 5
+    assert results[5].status_code == 429
+
+    clock[0] += RateLimitMiddleware.REDIS_RETRY_AFTER
+    asyncio.run(dispatch_many(1))
+    assert len(calls) == 2
@@ -0,0 +1,17 @@
+"""
+请求ID传递测试
+"""
+import pytest
+
+@pytest.mark.parametrize("method,path", [
+    ("get", "/api/v1/patients/P_TEST"),
+    ("get", "/api/v1/screenings/"),
+    ("get", "/api/v1/outcomes/"),
+])
+def test_response_carries_request_id(client, patient, method, path):
+    """同步与异步路由的响应体都带中间件设置的请求ID"""
+    response = getattr(client, method)(path, headers={"X-Request-ID": "req-42"})
+
+    assert response.status_code == 200
+    assert response.headers["X-Request-ID"] == "req-42"
+    assert response.json()["request_id"] == "req-42"
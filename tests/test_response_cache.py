@@ -0,0 +1,109 @@
+"""
+列表响应缓存测试
+"""
+import threading
+
+from services.gateway_api import response_cache
+from services.gateway_api.response_cache import ResponseCache, list_cache, make_key
+
+def test_set_skipped_after_invalidation():
+    """生成期间路由被失效时不写入缓存"""
+    cache = ResponseCache(maxsize=8, ttl=60)
+    key = make_key("outcomes", page=1)
+    generation = cache.generation("outcomes")
+
+    cache.invalidate("outcomes")
+    cache.set("outcomes", key, b"stale", generation)
+
+    assert cache.get("outcomes", key) is None
+
+def test_invalidate_only_affects_route():
+    """失效只清除对应路由的缓存"""
+    cache = ResponseCache(maxsize=8, ttl=60)
+    key = make_key("page", page=1)
+    cache.set("outcomes", key, b"outcomes", cache.generation("outcomes"))
+    cache.set("screenings", key, b"screenings", cache.generation("screenings"))
+
+    cache.invalidate("outcomes")
+
+    assert cache.get("outcomes", key) is None
+    assert cache.get("screenings", key) == b"screenings"
+
+def test_expired_and_evicted_entries(monkeypatch):
+    """过期条目读取时删除，超出容量时淘汰最久未使用的条目"""
+    now = [100.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(maxsize=2, ttl=5)
+    keys = [make_key("outcomes", page=page) for page in range(3)]
+    cache.set("outcomes", keys[0], b"0", 0)
+    cache.set("outcomes", keys[1], b"1", 0)
+    assert cache.get("outcomes", keys[0]) == b"0"
+
+    cache.set("outcomes", keys[2], b"2", 0)
+    assert cache.get("outcomes", keys[1]) is None
+    assert cache.get("outcomes", keys[0]) == b"0"
+
+    now[0] += 6
+    assert cache.get("outcomes", keys[2]) is None
+
+def test_create_outcome_invalidates_list(client, patient):
+    """创建效果记录后列表不再返回缓存的旧数据"""
+    first = client.get("/api/v1/outcomes/")
+    assert first.json()["meta"]["total"] == 0
+    assert list_cache.get("outcomes", make_key(
+        "outcomes", page=1, size=20, patient_id=None, intervention_id=None,
+        followup_day_min=None, followup_day_max=None, scope="dev_org"
+    )) is not None
+
+    response = client.post("/api/v1/outcomes/", json={
+        "patient_id": patient["patient_id"],
+        "followup_day": 30,
+        "measurement_date": "2025-08-01T00:00:00"
+    })
+    assert response.status_code == 200
+
+    second = client.get("/api/v1/outcomes/").json()
+    assert second["meta"]["total"] == 1
+    assert second["data"][0]["outcome_id"] == response.json()["data"]["outcome_id"]
+
+def test_create_screening_invalidates_list(client, patient):
+    """创建筛查记录后列表不再返回缓存的旧数据"""
+    assert client.get("/api/v1/screenings/").json()["meta"]["total"] == 0
+
+    response = client.post("/api/v1/screenings/", json={
+        "patient_id": patient["patient_id"],
+        "input_text": "患者胸痛"
+    })
+    assert response.status_code == 200
+
+    assert client.get("/api/v1/screenings/").json()["meta"]["total"] == 1
+
+def test_concurrent_set_and_invalidate():
+    """线程池写入与事件循环失效并发进行时不出错"""
+    cache = ResponseCache(maxsize=64, ttl=60)
+    errors = []
+    stop = threading.Event()
+
+    def writer():
+        try:
+            i = 0
+            while not stop.is_set():
+                cache.set("screenings", make_key("screenings", page=i % 128), b"x", cache.generation("screenings"))
+                i += 1
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(5000):
+            cache.invalidate("outcomes")
+    except Exception as e:
+        errors.append(e)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []